@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Async Data Access
+
+asyncio versions of the read operations. Each runs the same main_app ReadOp
+as its synchronous fetch_* twin (validation, statements, fallbacks) and
+shares QUERY_CACHE with it. With aiomysql installed they
+run on an aiomysql pool; without it each query runs on the regular pymysql
+pool in a worker thread, which still lets independent reports overlap.
+
+Usage:
+    python3 async_db.py dashboard [--compare]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import pymysql
+
+try:
+    import aiomysql
+except ImportError:  # optional: fall back to threads over the sync pool
+    aiomysql = None
+
+import queries
+from cache import MISSING
+from main_app import (
+    POOL_SETTINGS, QUERY_CACHE, SUMMARY_CACHE, Style, authenticate_user, borrowed_connection, businesses_after_op,
+    close_pool, connection_settings, dao_proposals_op, event_search_op, fetch_land_sales, fetch_summary_stats,
+    fetch_upcoming_events, fetch_voter_influence, format_value, land_sales_op, plain_value, print_box,
+    upcoming_events_op, voter_influence_op
+)
+
+
+class AsyncDatabase:
+    """Async query runner over an aiomysql pool, or over the sync pool via threads."""
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or POOL_SETTINGS['max_size']
+        self._pool = None
+
+    @property
+    def backend(self):
+        return 'aiomysql' if aiomysql is not None else 'threads'
+
+    async def open(self):
+        if aiomysql is not None and self._pool is None:
+            settings = connection_settings()
+            self._pool = await aiomysql.create_pool(
+                host=settings['host'], user=settings['user'], password=settings['password'],
+                db=settings['database'], charset=settings['charset'],
+                cursorclass=aiomysql.DictCursor, autocommit=True,
+                minsize=1, maxsize=self.maxsize
+            )
+        return self
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def fetch(self, sql, params=None, one=False):
+        """Run a SELECT; returns all rows, or the first row when `one` is set."""
+        if self._pool is None:
+            return await asyncio.to_thread(_fetch_sync, sql, params, one)
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params or ())
+                return await (cursor.fetchone() if one else cursor.fetchall())
+
+
+def _fetch_sync(sql, params, one):
+    with borrowed_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(sql, params or ())
+        return cursor.fetchone() if one else cursor.fetchall()
+
+
+# ============================================================================
+# READ OPERATIONS
+# ============================================================================
+
+async def run_read(db, op):
+    """Run a main_app ReadOp on `db`, through the QUERY_CACHE the sync fetch_* functions use."""
+    if op.query_id is not None:
+        value, versions = QUERY_CACHE.lookup(op.query_id, op.cache_params, queries.READ_TABLES[op.query_id])
+        if value is not MISSING:
+            return value
+    for index, (label, sql, params, _) in enumerate(op.attempts):
+        try:
+            result = await db.fetch(sql, params, one=op.one)
+        except pymysql.Error as e:
+            if op.falls_back(e, index):
+                continue
+            raise
+        value = op.finish(result, label)
+        break
+    if op.query_id is not None:
+        QUERY_CACHE.store(op.query_id, op.cache_params, versions, value)
+    return value
+
+
+async def dao_proposals(db, wallet):
+    return await run_read(db, dao_proposals_op(wallet))
+
+
+async def businesses_after(db, date_str):
+    return await run_read(db, businesses_after_op(date_str))
+
+
+async def land_sales(db, days=90):
+    """Land-sale totals from the daily rollup, or the raw rows before it is migrated."""
+    return await run_read(db, land_sales_op(days))
+
+
+async def search_events(db, keyword):
+    """Return (rows, mode), preferring the full-text index like the sync search."""
+    return await run_read(db, event_search_op(keyword))
+
+
+async def voter_influence(db):
+    return await run_read(db, voter_influence_op())
+
+
+async def upcoming_events(db):
+    return await run_read(db, upcoming_events_op())
+
+
+async def summary_stats(db):
+    """Return (counts, from_cache), sharing SUMMARY_CACHE with the sync dashboard."""
+    counts = SUMMARY_CACHE.get('summary')
+    if counts is not None:
+        return counts, True
+    counts = await db.fetch(queries.SUMMARY_STATS, one=True)
+    SUMMARY_CACHE.put('summary', counts)
+    return counts, False
+
+
+async def dashboard(db):
+    """Summary counts, land sales, influence leaders and upcoming events, fetched concurrently."""
+    (counts, cached), sales, influence, events = await asyncio.gather(
+        summary_stats(db), land_sales(db), voter_influence(db), upcoming_events(db)
+    )
+    return {
+        'summary': dict(counts or {}, cached=cached),
+        'land_sales': sales,
+        'influence': influence,
+        'upcoming_events': events,
+    }
+
+
+def dashboard_rows(data):
+    """Flatten dashboard() output into section-tagged dict rows (for the CLI)."""
+    yield {'section': 'summary', **data['summary']}
+    yield {'section': 'land_sales', **data['land_sales']}
+    for rank, row in enumerate(data['influence'], 1):
+        yield {'section': 'influence', 'rank': rank, **row}
+    for row in data['upcoming_events']:
+        yield {'section': 'upcoming_events', **row}
+
+
+async def run_dashboard():
+    async with AsyncDatabase() as db:
+        return await dashboard(db)
+
+
+def serial_dashboard():
+    """The same four reports through the sync functions, one after another."""
+    counts, cached = fetch_summary_stats()
+    return {
+        'summary': dict(counts or {}, cached=cached),
+        'land_sales': fetch_land_sales(),
+        'influence': fetch_voter_influence(),
+        'upcoming_events': fetch_upcoming_events(),
+    }
+
+
+def print_dashboard(data):
+    print_box("MINI-WORLD DASHBOARD")
+    summary = data['summary']
+    print(f"{Style.GREEN}Users:{Style.RESET} {summary.get('total_users')}   "
+          f"{Style.CYAN}Assets:{Style.RESET} {summary.get('total_assets')}   "
+          f"{Style.MAGENTA}Businesses:{Style.RESET} {summary.get('total_businesses')}   "
+          f"{Style.YELLOW}Events:{Style.RESET} {summary.get('total_events')}")
+    sales = data['land_sales']
+    print(f"\n{Style.BOLD}Land sales (last 90 days):{Style.RESET} {sales['total_sales']} sale(s), "
+          f"{format_value(sales['total_mana'])} MANA")
+    print(f"\n{Style.BOLD}Top voters:{Style.RESET}")
+    for rank, row in enumerate(data['influence'][:5], 1):
+        print(f"  {rank}. {Style.MAGENTA}{row['Username'] or 'Unknown'}{Style.RESET} "
+              f"score {Style.GREEN}{row['influence_score']}{Style.RESET}")
+    print(f"\n{Style.BOLD}Upcoming events:{Style.RESET}")
+    for event in data['upcoming_events'][:5]:
+        print(f"  {Style.YELLOW}{plain_value(event['Start_Timestamp'])}{Style.RESET} {event['Event_Name']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Async reports over the Mini World database.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    dash = sub.add_parser('dashboard', help="fetch the dashboard reports concurrently")
+    dash.add_argument('--compare', action='store_true', help="also time the serial sync version")
+    args = parser.parse_args(argv)
+
+    authenticate_user()
+    try:
+        start = time.perf_counter()
+        data = asyncio.run(run_dashboard())
+        concurrent = time.perf_counter() - start
+        print_dashboard(data)
+        backend = AsyncDatabase().backend
+        print(f"\n{Style.INFO} Concurrent ({backend}): {concurrent * 1000:.1f} ms")
+        if args.compare:
+            # Both timed again with warm connections and cold caches; the sync and
+            # async reports share QUERY_CACHE, so the first run would serve the rest
+            SUMMARY_CACHE.invalidate()
+            QUERY_CACHE.clear()
+            start = time.perf_counter()
+            serial_dashboard()
+            print(f"{Style.INFO} Serial (sync): {(time.perf_counter() - start) * 1000:.1f} ms")
+            SUMMARY_CACHE.invalidate()
+            QUERY_CACHE.clear()
+            start = time.perf_counter()
+            asyncio.run(run_dashboard())
+            print(f"{Style.INFO} Concurrent again: {(time.perf_counter() - start) * 1000:.1f} ms")
+        return 0
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Database error: {e}")
+        return 1
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
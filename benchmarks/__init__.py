@@ -0,0 +1,6 @@
+"""
+MINI WORLD - GENESIS CITY
+Benchmarks
+
+Run from the repository root, e.g. `python3 -m benchmarks.influence`.
+"""
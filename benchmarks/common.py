@@ -0,0 +1,106 @@
+"""
+Shared helpers for the benchmark scripts: timing, percentiles and a scratch
+database cloned from the decentraland_db table definitions.
+"""
+
+import math
+import time
+
+import pymysql
+from pymysql.cursors import DictCursor
+
+from main_app import DB_CREDENTIALS, Style, authenticate_user
+
+
+SOURCE_DB = 'decentraland_db'
+BENCH_DB = 'decentraland_bench'
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples):
+    """Latency summary (milliseconds) for a list of durations in seconds."""
+    ms = [s * 1000.0 for s in samples]
+    return {
+        'runs': len(ms),
+        'min_ms': min(ms) if ms else 0.0,
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95),
+        'p99_ms': percentile(ms, 99),
+        'max_ms': max(ms) if ms else 0.0,
+        'mean_ms': sum(ms) / len(ms) if ms else 0.0,
+    }
+
+
+def time_calls(fn, repeat=20, warmup=2):
+    """Call fn() warmup+repeat times and return the timed durations."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def print_summary(label, stats):
+    """One-line latency report."""
+    print(
+        f"{Style.GREEN}{label:<28}{Style.RESET} "
+        f"p50 {stats['p50_ms']:9.2f} ms  p95 {stats['p95_ms']:9.2f} ms  "
+        f"p99 {stats['p99_ms']:9.2f} ms  (n={stats['runs']})"
+    )
+
+
+def connect(database=SOURCE_DB):
+    """Open a plain (unpooled) connection, prompting for credentials if needed."""
+    if DB_CREDENTIALS['user'] is None:
+        authenticate_user()
+    return pymysql.connect(
+        host='localhost',
+        user=DB_CREDENTIALS['user'],
+        password=DB_CREDENTIALS['password'],
+        database=database,
+        charset='utf8mb4',
+        cursorclass=DictCursor,
+        autocommit=False,
+        local_infile=True
+    )
+
+
+def create_bench_database(tables, name=BENCH_DB):
+    """(Re)create `name` with empty copies of `tables` and return a connection to it.
+
+    CREATE TABLE ... LIKE copies columns, keys and indexes but not foreign keys,
+    which keeps synthetic bulk loads fast.
+    """
+    conn = connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {name}")
+            for table in tables:
+                cursor.execute(f"DROP TABLE IF EXISTS {name}.`{table}`")
+                cursor.execute(f"CREATE TABLE {name}.`{table}` LIKE {SOURCE_DB}.`{table}`")
+        conn.commit()
+    finally:
+        conn.close()
+    return connect(name)
+
+
+def bulk_insert(conn, table, columns, rows, batch=5000):
+    """Multi-row INSERT of `rows` in batches; commits once at the end."""
+    placeholders = ", ".join(["%s"] * len(columns))
+    sql = f"INSERT INTO `{table}` ({', '.join(columns)}) VALUES ({placeholders})"
+    with conn.cursor() as cursor:
+        for start in range(0, len(rows), batch):
+            # pymysql rewrites executemany(INSERT ... VALUES) into multi-row statements
+            cursor.executemany(sql, rows[start:start + batch])
+    conn.commit()
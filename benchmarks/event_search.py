@@ -0,0 +1,110 @@
+"""
+Event search: LIKE '%keyword%' scan vs. FULLTEXT relevance search.
+
+    python3 -m benchmarks.event_search --events 200000
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+
+import queries
+from main_app import SEARCH_RESULT_LIMIT, Style, fulltext_query
+from migrations import ensure_index
+from benchmarks.common import (
+    BENCH_DB, bulk_insert, connect, create_bench_database, print_summary, summarize, time_calls
+)
+
+
+TABLES = ['User_Profile', 'Digital_Asset', 'LAND_Parcel', 'Scene_Content', 'Event', 'Event_Tags']
+
+NAME_WORDS = [
+    'Genesis', 'Plaza', 'Meetup', 'Rave', 'Fashion', 'Week', 'Poker', 'Night', 'Gallery',
+    'Opening', 'DAO', 'Town', 'Hall', 'Concert', 'Launch', 'Party', 'Art', 'Auction',
+    'Builders', 'Workshop', 'Crypto', 'Summit', 'Casino', 'Festival', 'Dragon', 'City',
+]
+TAGS = ['music', 'art', 'gaming', 'fashion', 'governance', 'education', 'social', 'crypto', 'nft']
+KEYWORDS = ['meetup', 'fashion week', 'poker', 'dao town hall', 'festival', 'auction', 'music', 'launch party']
+
+
+def wallet(n):
+    return '0x' + format(n, '040x')
+
+
+def load_dataset(conn, events, seed):
+    """Insert organizers, venue parcels/scenes, events and tags."""
+    rng = random.Random(seed)
+    organizers = max(100, events // 100)
+    parcels = max(100, events // 50)
+    bulk_insert(conn, 'User_Profile', ['Wallet_Address', 'Username', 'Join_Date'],
+                [(wallet(i), f"org_{i}", datetime(2020, 1, 1).date()) for i in range(organizers)])
+    bulk_insert(conn, 'Digital_Asset', ['Asset_ID', 'Token_URI', 'Owner_Address'],
+                [(f"LAND-{i}", f"https://api.decentraland.org/v2/parcels/{i}", wallet(i % organizers))
+                 for i in range(parcels)])
+    bulk_insert(conn, 'LAND_Parcel', ['Asset_ID', 'X_Coordinate', 'Y_Coordinate', 'District_Name'],
+                [(f"LAND-{i}", i % 300 - 150, i // 300 - 150, rng.choice(['Vegas City', 'Fashion Street', None]))
+                 for i in range(parcels)])
+    bulk_insert(conn, 'Scene_Content', ['Parcel_ID', 'Scene_Version', 'Deployment_Date'],
+                [(f"LAND-{i}", 'v1', datetime(2024, 1, 1).date()) for i in range(parcels)])
+
+    start = datetime(2024, 1, 1)
+    event_rows = []
+    tag_rows = []
+    for event_id in range(1, events + 1):
+        name = ' '.join(rng.sample(NAME_WORDS, rng.randint(2, 4)))
+        begin = start + timedelta(hours=rng.randrange(24 * 900))
+        parcel = rng.randrange(parcels)
+        event_rows.append((event_id, name, begin, begin + timedelta(hours=2),
+                           wallet(rng.randrange(organizers)), f"LAND-{parcel}", 'v1'))
+        for tag in rng.sample(TAGS, rng.randint(1, 3)):
+            tag_rows.append((event_id, tag))
+    bulk_insert(conn, 'Event', ['Event_ID', 'Event_Name', 'Start_Timestamp', 'End_Timestamp',
+                                'Organizer_Address', 'Scene_Parcel_ID', 'Scene_Version'], event_rows)
+    bulk_insert(conn, 'Event_Tags', ['Event_ID', 'Tag'], tag_rows)
+
+    with conn.cursor() as cursor:
+        for step in (ensure_index('Event', 'ft_event_name', 'Event_Name', kind='FULLTEXT'),
+                     ensure_index('Event_Tags', 'ft_event_tag', 'Tag', kind='FULLTEXT')):
+            step(cursor)
+        for table in TABLES:
+            cursor.execute(f"ANALYZE TABLE `{table}`")
+            cursor.fetchall()
+    print(f"{Style.SUCCESS} Loaded {events} events and {len(tag_rows)} tags.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--skip-load', action='store_true', help="reuse the existing scratch data")
+    args = parser.parse_args(argv)
+
+    if args.skip_load:
+        conn = connect(BENCH_DB)
+    else:
+        conn = create_bench_database(TABLES)
+        load_dataset(conn, args.events, args.seed)
+
+    def like_search(keyword):
+        with conn.cursor() as cursor:
+            cursor.execute(queries.SEARCH_EVENTS_LIKE, (f"%{keyword}%",))
+            return cursor.fetchall()
+
+    def fulltext_search(keyword):
+        with conn.cursor() as cursor:
+            cursor.execute(queries.SEARCH_EVENTS_FULLTEXT, (fulltext_query(keyword),) * 4 + (SEARCH_RESULT_LIMIT,))
+            return cursor.fetchall()
+
+    try:
+        for label, search in (('LIKE scan', like_search), ('FULLTEXT', fulltext_search)):
+            samples = []
+            for keyword in KEYWORDS:
+                samples.extend(time_calls(lambda: search(keyword), repeat=args.repeat, warmup=1))
+            print_summary(label, summarize(samples))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Voter influence report: fan-out join vs. pre-aggregated subqueries.
+
+Loads a synthetic population (whales owning most assets and casting most
+votes) into the scratch database and times both plans.
+
+    python3 -m benchmarks.influence --users 100000
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import queries
+from main_app import Style
+from benchmarks.common import (
+    BENCH_DB, bulk_insert, connect, create_bench_database, print_summary, summarize, time_calls
+)
+
+
+# The original report: joins every asset row against every vote row per user.
+LEGACY_VOTER_INFLUENCE = """
+    SELECT
+        u.Wallet_Address,
+        u.Username,
+        COUNT(DISTINCT da.Asset_ID) as land_parcels_owned,
+        COUNT(DISTINCT v.Proposal_ID) as votes_cast,
+        SUM(DISTINCT v.Voting_Weight) as total_voting_weight,
+        (COUNT(DISTINCT da.Asset_ID) * 10 + COUNT(DISTINCT v.Proposal_ID)) as influence_score
+    FROM User_Profile u
+    LEFT JOIN Digital_Asset da ON u.Wallet_Address = da.Owner_Address
+    LEFT JOIN LAND_Parcel lp ON da.Asset_ID = lp.Asset_ID
+    LEFT JOIN Vote v ON u.Wallet_Address = v.Voter_Address
+    GROUP BY u.Wallet_Address, u.Username
+    HAVING land_parcels_owned > 0 OR votes_cast > 0
+    ORDER BY influence_score DESC
+    LIMIT 20
+"""
+
+TABLES = ['User_Profile', 'Digital_Asset', 'LAND_Parcel', 'DAO_Proposal', 'Vote']
+
+
+def wallet(n):
+    return '0x' + format(n, '040x')
+
+
+def skewed_owners(rng, users, count, exponent=1.1):
+    """Pick `count` user indexes with a Zipf-like skew towards low indexes."""
+    weights = [1.0 / (rank + 1) ** exponent for rank in range(users)]
+    return rng.choices(range(users), weights=weights, k=count)
+
+
+def load_dataset(conn, users, assets_per_user, votes_per_user, proposals, seed):
+    """Insert users, assets (half of them land), proposals and votes."""
+    rng = random.Random(seed)
+    base_day = datetime(2018, 1, 1)
+
+    print(f"{Style.INFO} Generating {users} users...")
+    user_rows = [
+        (wallet(i), f"user_{i}", (base_day + timedelta(days=i % 2500)).date())
+        for i in range(users)
+    ]
+    bulk_insert(conn, 'User_Profile', ['Wallet_Address', 'Username', 'Join_Date'], user_rows)
+
+    asset_count = int(users * assets_per_user)
+    owners = skewed_owners(rng, users, asset_count)
+    asset_rows = [
+        (f"LAND-{i}", f"https://api.decentraland.org/v2/parcels/{i}", wallet(owner))
+        for i, owner in enumerate(owners)
+    ]
+    bulk_insert(conn, 'Digital_Asset', ['Asset_ID', 'Token_URI', 'Owner_Address'], asset_rows)
+    side = int(asset_count ** 0.5) + 1
+    parcel_rows = [(f"LAND-{i}", i % side, i // side, None) for i in range(asset_count) if i % 2 == 0]
+    bulk_insert(conn, 'LAND_Parcel', ['Asset_ID', 'X_Coordinate', 'Y_Coordinate', 'District_Name'], parcel_rows)
+
+    proposal_rows = [
+        (f"DCL-PROP-{i}", f"Proposal {i}", 'Active', wallet(rng.randrange(users)))
+        for i in range(proposals)
+    ]
+    bulk_insert(conn, 'DAO_Proposal', ['Proposal_ID', 'Title', 'Status', 'Creator_Address'], proposal_rows)
+
+    print(f"{Style.INFO} Generating votes...")
+    vote_total = int(users * votes_per_user)
+    per_voter = {}
+    for voter in skewed_owners(rng, users, vote_total, exponent=0.9):
+        per_voter[voter] = per_voter.get(voter, 0) + 1
+    vote_rows = []
+    stamp = datetime(2025, 1, 1)
+    for voter, count in per_voter.items():
+        for proposal in rng.sample(range(proposals), min(count, proposals)):
+            # Few distinct weights so duplicates expose SUM(DISTINCT)
+            weight = Decimal(rng.choice([1, 10, 100, 1000]))
+            vote_rows.append((f"DCL-PROP-{proposal}", wallet(voter), rng.choice(['For', 'Against']), weight, stamp))
+    bulk_insert(conn, 'Vote', ['Proposal_ID', 'Voter_Address', 'Vote_Choice', 'Voting_Weight', 'Timestamp'], vote_rows)
+
+    with conn.cursor() as cursor:
+        for table in TABLES:
+            cursor.execute(f"ANALYZE TABLE `{table}`")
+            cursor.fetchall()
+    print(f"{Style.SUCCESS} Loaded {users} users, {asset_count} assets, {len(vote_rows)} votes.")
+
+
+def explain_rows(conn, sql):
+    """Sum of the optimizer's row estimates across the plan."""
+    with conn.cursor() as cursor:
+        cursor.execute("EXPLAIN " + sql)
+        return sum(int(row.get('rows') or 0) for row in cursor.fetchall())
+
+
+def run_query(conn, sql):
+    with conn.cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--assets-per-user', type=float, default=2.0)
+    parser.add_argument('--votes-per-user', type=float, default=5.0)
+    parser.add_argument('--proposals', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-load', action='store_true', help="reuse the existing scratch data")
+    args = parser.parse_args(argv)
+
+    if args.skip_load:
+        conn = connect(BENCH_DB)
+    else:
+        conn = create_bench_database(TABLES)
+        load_dataset(conn, args.users, args.assets_per_user, args.votes_per_user, args.proposals, args.seed)
+
+    try:
+        plans = [('legacy fan-out join', LEGACY_VOTER_INFLUENCE), ('pre-aggregated', queries.VOTER_INFLUENCE)]
+        results = {}
+        for label, sql in plans:
+            print(f"{Style.INFO} {label}: optimizer row estimate {explain_rows(conn, sql)}")
+            stats = summarize(time_calls(lambda: run_query(conn, sql), repeat=args.repeat, warmup=1))
+            print_summary(label, stats)
+            results[label] = run_query(conn, sql)
+
+        legacy, rewritten = results['legacy fan-out join'], results['pre-aggregated']
+        legacy_scores = sorted(row['influence_score'] for row in legacy)
+        new_scores = sorted(row['influence_score'] for row in rewritten)
+        if legacy_scores == new_scores:
+            print(f"{Style.SUCCESS} Both plans return the same top-20 influence scores.")
+        else:
+            print(f"{Style.ERROR} Top-20 scores differ between plans.")
+        weights = {row['Wallet_Address']: row['total_voting_weight'] for row in legacy}
+        drift = sum(1 for row in rewritten
+                    if row['Wallet_Address'] in weights and weights[row['Wallet_Address']] != row['total_voting_weight'])
+        print(f"{Style.INFO} {drift} of the top voters had total weight under-counted by SUM(DISTINCT).")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
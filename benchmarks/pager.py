@@ -0,0 +1,88 @@
+"""
+Interactive paging: time spent waiting for the next page, with and without prefetch.
+
+Pages through a table of the scratch database as a reader would, pausing
+--think-ms on every page. Without prefetch each flip waits for a full query;
+with it, the next pages are fetched during the pause. Load a dataset first
+(python3 -m benchmarks.suite, or datagen.py --database decentraland_bench).
+
+    python3 -m benchmarks.pager --table assets --pages 30 --think-ms 200
+"""
+
+import argparse
+import time
+
+import pymysql
+from pymysql.cursors import DictCursor
+
+import queries
+from db_pool import ConnectionPool
+from main_app import DB_CREDENTIALS, POOL_SETTINGS, KeysetPager, Style, authenticate_user, connection_settings
+from prefetch import PagePrefetcher
+from benchmarks.common import BENCH_DB, print_summary, summarize
+
+
+TABLES = {
+    'users': (queries.ALL_USERS_SELECT, queries.ALL_USERS_KEYS),
+    'assets': (queries.ALL_ASSETS_SELECT, queries.ALL_ASSETS_KEYS),
+}
+
+
+def page_through(pager, pages, think, depth):
+    """Flip through `pages` pages; returns the wait before each flip (seconds)."""
+    waits = []
+    if not pager.first_page():
+        return waits
+    ahead = PagePrefetcher(pager.pages_from(pager.last_key), depth=depth) if depth else None
+    try:
+        for _ in range(pages - 1):
+            time.sleep(think)
+            start = time.perf_counter()
+            if ahead is None:
+                rows = pager.next_page()
+            else:
+                rows = ahead.next_page()
+                if rows:
+                    pager.advance(rows)
+            waits.append(time.perf_counter() - start)
+            if not rows:
+                break
+    finally:
+        if ahead is not None:
+            ahead.cancel()
+    return waits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--table', choices=sorted(TABLES), default='assets')
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--think-ms', type=float, default=150.0, help="time spent reading each page")
+    parser.add_argument('--depth', type=int, default=2, help="pages to prefetch")
+    parser.add_argument('--database', default=BENCH_DB)
+    args = parser.parse_args(argv)
+
+    if DB_CREDENTIALS['user'] is None:
+        authenticate_user()
+    config = dict(connection_settings(), database=args.database, cursorclass=DictCursor, autocommit=False)
+    pool = ConnectionPool(config, connect=pymysql.connect, **POOL_SETTINGS)
+    select_sql, keys = TABLES[args.table]
+    think = args.think_ms / 1000.0
+    try:
+        print(f"{Style.INFO} {args.pages} pages of {args.page_size} from {args.database} ({args.table}), "
+              f"{args.think_ms:g} ms reading each")
+        for label, depth in (("next page on demand", 0), (f"prefetch depth {args.depth}", args.depth)):
+            pager = KeysetPager(select_sql, keys, page_size=args.page_size, connect=pool.acquire)
+            waits = page_through(pager, args.pages, think, depth)
+            if waits:
+                print_summary(label, summarize(waits))
+            else:
+                print(f"{Style.WARNING} {args.table} has fewer than two pages in {args.database}.")
+                break
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
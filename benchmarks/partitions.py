@@ -0,0 +1,124 @@
+"""
+Transaction time windows and monthly purges, before and after partitioning.
+
+Loads --rows synthetic sales spread over --months months into the scratch
+database twice. The first copy stays a plain table. The second is split into
+monthly partitions by partitions.partition_by_month, the same step that
+migration 6 runs. Each copy answers two quarter-window queries: one bounded
+only by Timestamp, and the MANA variant that idx_txn_currency_time covers.
+Each copy then purges its oldest --purge months one at a time, with DELETE on
+the plain table and DROP PARTITION on the partitioned one. The scratch copy
+has no triggers, so the DELETE figures leave out the per-row rollup trigger
+that the real Transaction table also pays.
+
+    python3 -m benchmarks.partitions --rows 1000000 --months 36 --purge 6
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import partitions
+from main_app import Style
+from benchmarks.common import BENCH_DB, bulk_insert, create_bench_database, print_summary, summarize, time_calls
+
+
+COLUMNS = ('Transaction_ID', 'Timestamp', 'Price', 'Currency', 'Asset_ID', 'Seller_Address', 'Buyer_Address')
+
+QUARTER = """
+    SELECT COUNT(*) AS sales, SUM(Price) AS volume
+    FROM Transaction
+    WHERE Timestamp >= %s AND Timestamp < %s
+"""
+QUARTER_MANA = """
+    SELECT COUNT(*) AS sales, SUM(Price) AS volume
+    FROM Transaction
+    WHERE Currency = 'MANA' AND Timestamp >= %s AND Timestamp < %s
+"""
+
+
+def sales(count, first_month, months, seed):
+    """`count` sales at uniformly random times over `months` months from `first_month`."""
+    rng = random.Random(seed)
+    start = datetime(first_month.year, first_month.month, 1)
+    end = partitions.add_months(first_month, months)
+    span = (datetime(end.year, end.month, 1) - start).total_seconds()
+    return [
+        (f"0x{i:064x}", start + timedelta(seconds=int(rng.random() * span)), f"{rng.uniform(1, 50000):.4f}",
+         'MANA' if rng.random() < 0.8 else 'ETH', None, None, None)
+        for i in range(count)
+    ]
+
+
+def partitions_read(cursor, sql, params):
+    cursor.execute("EXPLAIN " + sql, params)
+    row = cursor.fetchone()
+    return len(row['partitions'].split(',')) if row.get('partitions') else None
+
+
+def run_copy(label, rows, window, purge_months, args, partitioned):
+    conn = create_bench_database(['Transaction'], args.database)
+    try:
+        with conn.cursor() as cursor:
+            if partitions.list_partitions(cursor):
+                # CREATE TABLE ... LIKE copied the partitioning of a migrated source
+                cursor.execute("ALTER TABLE Transaction REMOVE PARTITIONING")
+        bulk_insert(conn, 'Transaction', COLUMNS, rows)
+        with conn.cursor() as cursor:
+            if partitioned:
+                start = time.perf_counter()
+                partitions.partition_by_month(cursor, months_ahead=1)
+                print(f"{Style.INFO} Split {len(rows)} rows into "
+                      f"{len(partitions.list_partitions(cursor))} partitions in {time.perf_counter() - start:.1f} s")
+            cursor.execute("ANALYZE TABLE Transaction")
+            cursor.fetchall()
+
+            for name, sql in (("quarter", QUARTER), ("quarter MANA", QUARTER_MANA)):
+                def query():
+                    cursor.execute(sql, window)
+                    cursor.fetchall()
+                read = partitions_read(cursor, sql, window)
+                suffix = f" ({read} partitions)" if read else ""
+                print_summary(f"{name}, {label}{suffix}", summarize(time_calls(query, repeat=args.repeat)))
+
+            samples = []
+            for month in purge_months:
+                start = time.perf_counter()
+                if partitioned:
+                    cursor.execute(f"ALTER TABLE Transaction DROP PARTITION {partitions.partition_name(month)}")
+                else:
+                    cursor.execute("DELETE FROM Transaction WHERE Timestamp < %s", (partitions.add_months(month, 1),))
+                    conn.commit()
+                samples.append(time.perf_counter() - start)
+            print_summary(f"purge a month, {label}", summarize(samples))
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--months', type=int, default=36, help="months of history, ending with the current one")
+    parser.add_argument('--purge', type=int, default=6, help="oldest months to purge, one at a time")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--database', default=BENCH_DB)
+    args = parser.parse_args(argv)
+    if args.months < 4 or not 0 < args.purge < args.months - 3:
+        parser.error("--months must be at least 4, and --purge must leave the last quarter in place")
+
+    current = partitions.month_start(date.today())
+    first_month = partitions.add_months(current, 1 - args.months)
+    window = (partitions.add_months(current, -3), current)       # the last full quarter
+    purge_months = partitions.month_range(first_month, partitions.add_months(first_month, args.purge - 1))
+
+    print(f"{Style.INFO} Generating {args.rows} sales over {args.months} months...")
+    rows = sales(args.rows, first_month, args.months, args.seed)
+    print(f"{Style.INFO} Quarter {window[0]:%Y-%m} to {window[1]:%Y-%m}, purging {args.purge} month(s)")
+    run_copy("plain", rows, window, purge_months, args, partitioned=False)
+    run_copy("partitioned", rows, window, purge_months, args, partitioned=True)
+
+
+if __name__ == "__main__":
+    main()
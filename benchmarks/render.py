@@ -0,0 +1,86 @@
+"""
+Table rendering: legacy per-row print() path vs. the buffered TableLayout.
+
+Needs no database; renders synthetic Transaction-like rows into /dev/null.
+
+    python3 -m benchmarks.render --rows 10000
+"""
+
+import argparse
+import contextlib
+import os
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from main_app import (
+    Style, build_table_row, compute_column_widths, format_value, print_table_footer,
+    print_table_header, render_table
+)
+from benchmarks.common import print_summary, summarize, time_calls
+
+
+def make_rows(count, seed):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            'Transaction_ID': '0x' + format(rng.getrandbits(256), '064x'),
+            'Timestamp': start + timedelta(seconds=rng.randrange(86400 * 365)),
+            'Price': Decimal(rng.randrange(1, 10 ** 8)) / 1000,
+            'Currency': rng.choice(['MANA', 'ETH']),
+            'Asset_ID': f"LAND-{rng.randrange(90000)}",
+            'Seller_Address': '0x' + format(rng.getrandbits(160), '040x'),
+            'Buyer_Address': None if rng.random() < 0.05 else '0x' + format(rng.getrandbits(160), '040x'),
+        }
+        for _ in range(count)
+    ]
+
+
+def legacy_render(rows):
+    """What print_result_page did before: regex per cell, one print() per row."""
+    columns = list(rows[0].keys())
+    widths = compute_column_widths(columns, rows)
+    inner_width = print_table_header(columns, widths)
+    for row in rows:
+        values = [f"{Style.WHITE}{format_value(row[col])}{Style.RESET}" for col in columns]
+        print(build_table_row(values, widths))
+    print_table_footer(inner_width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows, args.seed)
+    columns = list(rows[0].keys())
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        # Line-buffered like a terminal, so each legacy print() is its own write
+        sink.reconfigure(line_buffering=True)
+
+        def run_legacy():
+            with contextlib.redirect_stdout(sink):
+                legacy_render(rows)
+
+        def run_fast(color):
+            sink.write(render_table(columns, rows, color=color))
+            sink.flush()
+
+        results = {}
+        for label, fn in (('legacy print per row', run_legacy),
+                          ('buffered, ANSI', lambda: run_fast(True)),
+                          ('buffered, plain', lambda: run_fast(False))):
+            results[label] = summarize(time_calls(fn, repeat=args.repeat, warmup=1))
+            print_summary(label, results[label])
+
+    base = results['legacy print per row']['p50_ms']
+    for label in ('buffered, ANSI', 'buffered, plain'):
+        speedup = base / results[label]['p50_ms'] if results[label]['p50_ms'] else float('inf')
+        print(f"{Style.INFO} {label}: {speedup:.1f}x faster than legacy at p50 ({args.rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
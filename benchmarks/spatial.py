@@ -0,0 +1,264 @@
+"""
+Parcel neighbourhood queries: SQL on LAND_Parcel vs. the spatial.py tile grid.
+
+Loads the full Genesis City map (301 x 301 = 90,601 parcels) into the scratch
+database, with whales holding rectangular estates and everyone else scattered
+single parcels, then times bounding-box, radius, k-nearest and estate queries
+both ways. --grid-only skips the database and times the grid alone.
+
+    python3 -m benchmarks.spatial
+    python3 -m benchmarks.spatial --grid-only --repeat 200
+"""
+
+import argparse
+import random
+import time
+
+from pymysql.cursors import Cursor
+
+import datagen
+from main_app import Style
+from spatial import TILE_SIZE, Parcel, ParcelGrid, SpatialIndex
+from benchmarks.common import (
+    BENCH_DB, bulk_insert, connect, create_bench_database, print_summary, summarize, time_calls
+)
+
+
+TABLES = ['Digital_Asset', 'LAND_Parcel']
+
+SQL_BOX = """
+    SELECT lp.Asset_ID, lp.X_Coordinate, lp.Y_Coordinate, lp.District_Name, da.Owner_Address
+    FROM LAND_Parcel lp
+    JOIN Digital_Asset da ON da.Asset_ID = lp.Asset_ID
+    WHERE lp.X_Coordinate BETWEEN %s AND %s AND lp.Y_Coordinate BETWEEN %s AND %s
+"""
+
+SQL_RADIUS = """
+    SELECT lp.Asset_ID, lp.X_Coordinate, lp.Y_Coordinate, lp.District_Name, da.Owner_Address
+    FROM LAND_Parcel lp
+    JOIN Digital_Asset da ON da.Asset_ID = lp.Asset_ID
+    WHERE lp.X_Coordinate BETWEEN %s AND %s AND lp.Y_Coordinate BETWEEN %s AND %s
+      AND POW(lp.X_Coordinate - %s, 2) + POW(lp.Y_Coordinate - %s, 2) <= %s
+    ORDER BY POW(lp.X_Coordinate - %s, 2) + POW(lp.Y_Coordinate - %s, 2)
+"""
+
+# No index can serve ORDER BY distance, so this sorts every parcel
+SQL_NEAREST = """
+    SELECT lp.Asset_ID, lp.X_Coordinate, lp.Y_Coordinate, lp.District_Name, da.Owner_Address
+    FROM LAND_Parcel lp
+    JOIN Digital_Asset da ON da.Asset_ID = lp.Asset_ID
+    ORDER BY POW(lp.X_Coordinate - %s, 2) + POW(lp.Y_Coordinate - %s, 2), lp.Y_Coordinate, lp.X_Coordinate
+    LIMIT %s
+"""
+
+SQL_NEAREST_OWNED = """
+    SELECT lp.Asset_ID, lp.X_Coordinate, lp.Y_Coordinate, lp.District_Name, da.Owner_Address
+    FROM LAND_Parcel lp
+    JOIN Digital_Asset da ON da.Asset_ID = lp.Asset_ID
+    WHERE da.Owner_Address = %s
+    ORDER BY POW(lp.X_Coordinate - %s, 2) + POW(lp.Y_Coordinate - %s, 2), lp.Y_Coordinate, lp.X_Coordinate
+    LIMIT %s
+"""
+
+SQL_OWNED = """
+    SELECT lp.Asset_ID, lp.X_Coordinate, lp.Y_Coordinate, lp.District_Name, da.Owner_Address
+    FROM LAND_Parcel lp
+    JOIN Digital_Asset da ON da.Asset_ID = lp.Asset_ID
+    WHERE da.Owner_Address = %s
+"""
+
+SQL_OWNER_AT = """
+    SELECT da.Owner_Address
+    FROM LAND_Parcel lp
+    JOIN Digital_Asset da ON da.Asset_ID = lp.Asset_ID
+    WHERE lp.X_Coordinate = %s AND lp.Y_Coordinate = %s
+"""
+
+# Flood fill one step at a time; UNION DISTINCT stops it revisiting parcels
+SQL_ESTATE = """
+    WITH RECURSIVE estate (Asset_ID, X, Y) AS (
+        SELECT Asset_ID, X_Coordinate, Y_Coordinate
+        FROM LAND_Parcel
+        WHERE X_Coordinate = %s AND Y_Coordinate = %s
+        UNION DISTINCT
+        SELECT n.Asset_ID, n.X_Coordinate, n.Y_Coordinate
+        FROM estate e
+        JOIN LAND_Parcel n
+          ON n.X_Coordinate BETWEEN e.X - 1 AND e.X + 1
+         AND n.Y_Coordinate BETWEEN e.Y - 1 AND e.Y + 1
+         AND ABS(n.X_Coordinate - e.X) + ABS(n.Y_Coordinate - e.Y) = 1
+        JOIN Digital_Asset da ON da.Asset_ID = n.Asset_ID AND da.Owner_Address = %s
+    )
+    SELECT Asset_ID FROM estate
+"""
+
+
+def make_parcels(users, estate_share, seed):
+    """Every grid cell as (asset_id, x, y, district, owner); whales own rectangular estates."""
+    rng = random.Random(seed)
+    side = datagen.GRID_SIDE
+    owners = [None] * datagen.GRID_PARCELS
+    claimed = 0
+    target = int(estate_share * datagen.GRID_PARCELS)
+    while claimed < target:
+        width, height = rng.randint(1, 8), rng.randint(1, 6)
+        left, top = rng.randrange(side - width), rng.randrange(side - height)
+        owner = min(users - 1, int(users ** (rng.random() * 0.5)) - 1)
+        for row in range(top, top + height):
+            for col in range(left, left + width):
+                cell = row * side + col
+                if owners[cell] is None:
+                    owners[cell] = owner
+                    claimed += 1
+    rows = []
+    for cell, owner in enumerate(owners):
+        if owner is None:
+            owner = min(users - 1, int(users ** rng.random()) - 1)
+        x, y = datagen.Layout.xy(cell)
+        rows.append((f"LAND-{cell}", x, y, datagen.district_at(x, y)[0], datagen.wallet(owner)))
+    return rows
+
+
+def load_dataset(conn, parcels):
+    print(f"{Style.INFO} Loading {len(parcels)} parcels into {BENCH_DB}...")
+    bulk_insert(conn, 'Digital_Asset', ['Asset_ID', 'Token_URI', 'Owner_Address'], [
+        (asset_id, f"https://api.decentraland.org/v2/parcels/{x},{y}", owner)
+        for asset_id, x, y, district, owner in parcels
+    ])
+    bulk_insert(conn, 'LAND_Parcel', ['Asset_ID', 'X_Coordinate', 'Y_Coordinate', 'District_Name'], [
+        (asset_id, x, y, district) for asset_id, x, y, district, owner in parcels
+    ])
+    with conn.cursor() as cursor:
+        cursor.execute("ANALYZE TABLE Digital_Asset, LAND_Parcel")
+        cursor.fetchall()
+
+
+def sample_points(rng, count):
+    r = datagen.GRID_RADIUS
+    return [(rng.randint(-r, r), rng.randint(-r, r)) for _ in range(count)]
+
+
+def cycling(items):
+    """A zero-argument function returning the next item each call."""
+    state = {'index': 0}
+
+    def next_item():
+        item = items[state['index'] % len(items)]
+        state['index'] += 1
+        return item
+    return next_item
+
+
+def grid_cases(grid, points, owners, args):
+    point = cycling(points)
+    owner = cycling(owners)
+    half = args.box // 2
+    return [
+        (f"box {args.box}x{args.box}", lambda: grid.in_box(*_box(point(), half))),
+        (f"radius {args.radius:g}", lambda: grid.within(*point(), args.radius)),
+        (f"nearest k={args.k}", lambda: grid.nearest(*point(), args.k)),
+        (f"nearest k={args.k} owner", lambda: grid.nearest(*point(), args.k, owner=owner())),
+        ("estate at point", lambda: grid.estate_at(*point())),
+        ("estates of owner", lambda: grid.estates(owner=owner())),
+    ]
+
+
+def sql_cases(conn, points, owners, args):
+    point = cycling(points)
+    owner = cycling(owners)
+    half = args.box // 2
+    radius = args.radius
+    reach = int(radius)
+
+    def run(sql, params):
+        with conn.cursor(Cursor) as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def box():
+        x0, y0, x1, y1 = _box(point(), half)
+        return run(SQL_BOX, (x0, x1, y0, y1))
+
+    def within():
+        x, y = point()
+        return run(SQL_RADIUS, (x - reach, x + reach, y - reach, y + reach, x, y, radius * radius, x, y))
+
+    def estate():
+        x, y = point()
+        found = run(SQL_OWNER_AT, (x, y))
+        return run(SQL_ESTATE, (x, y, found[0][0])) if found else ()
+
+    def estates_of():
+        # Without the grid: fetch the owner's parcels and flood-fill them in Python
+        rows = run(SQL_OWNED, (owner(),))
+        return ParcelGrid(Parcel(*row) for row in rows).estates()
+
+    return [
+        (f"box {args.box}x{args.box}", box),
+        (f"radius {args.radius:g}", within),
+        (f"nearest k={args.k}", lambda: run(SQL_NEAREST, point() + (args.k,))),
+        (f"nearest k={args.k} owner", lambda: run(SQL_NEAREST_OWNED, (owner(),) + point() + (args.k,))),
+        ("estate at point", estate),
+        ("estates of owner", estates_of),
+    ]
+
+
+def _box(center, half):
+    x, y = center
+    return x - half, y - half, x + half, y + half
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=20000, help="distinct owners to draw from")
+    parser.add_argument('--estate-share', type=float, default=0.3, help="fraction of the map held as estates")
+    parser.add_argument('--box', type=int, default=32, help="bounding-box side in parcels")
+    parser.add_argument('--radius', type=float, default=10.0)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--tile', type=int, default=TILE_SIZE)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=21)
+    parser.add_argument('--grid-only', action='store_true', help="skip the database; time the grid alone")
+    parser.add_argument('--skip-load', action='store_true', help=f"reuse the parcels already in {BENCH_DB}")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    parcels = make_parcels(args.users, args.estate_share, args.seed)
+    points = sample_points(rng, args.repeat)
+    owners = [datagen.wallet(min(args.users - 1, int(args.users ** (rng.random() * 0.5)) - 1))
+              for _ in range(args.repeat)]
+
+    conn = None
+    if args.grid_only:
+        start = time.perf_counter()
+        grid = ParcelGrid((Parcel(*row) for row in parcels), tile=args.tile)
+        print(f"{Style.INFO} Built grid of {len(grid)} parcels in {(time.perf_counter() - start) * 1000:.0f} ms")
+    else:
+        if args.skip_load:
+            conn = connect(BENCH_DB)
+        else:
+            conn = create_bench_database(TABLES)
+            load_dataset(conn, parcels)
+        index = SpatialIndex(tile=args.tile)
+        start = time.perf_counter()
+        with index.locked(conn) as grid:
+            pass
+        print(f"{Style.INFO} Loaded grid of {len(grid)} parcels from MySQL in "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    try:
+        print(f"\n{Style.BOLD}Spatial grid (tile {args.tile}){Style.RESET}")
+        for label, fn in grid_cases(grid, points, owners, args):
+            print_summary(label, summarize(time_calls(fn, repeat=args.repeat)))
+        if conn is not None:
+            print(f"\n{Style.BOLD}SQL on LAND_Parcel{Style.RESET}")
+            for label, fn in sql_cases(conn, points, owners, args):
+                print_summary(label, summarize(time_calls(fn, repeat=args.repeat)))
+                conn.rollback()
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Benchmark suite: every menu operation against a seeded dataset.
+
+Loads a datagen.py dataset of the chosen size into the scratch database,
+applies the migrations there, then drives each operation through the same
+data functions the menu uses. For every operation it reports p50/p95/p99
+latency, rows/s and round trips (commands sent to the server). Results can be
+saved as JSON and compared with a stored baseline; the run fails when an
+operation gets slower than the tolerance or needs more round trips.
+
+    python3 -m benchmarks.suite --users 100k --save baseline.json
+    python3 -m benchmarks.suite --skip-load --baseline baseline.json --save current.json
+
+Operations 6-9 write: each run registers businesses, sells assets, moves
+upcoming events and deletes users that own no assets. Reload (drop
+--skip-load) to start again from the pristine dataset.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from pymysql.cursors import SSDictCursor
+
+import datagen
+import queries
+from main_app import (
+    QUERY_CACHE, SUMMARY_CACHE, KeysetPager, Style, delete_wallet, fetch_businesses_after, fetch_dao_proposals,
+    fetch_event_search, fetch_land_sales, fetch_upcoming_events, fetch_voter_influence, register_business,
+    transfer_asset, update_event_schedule
+)
+from migrations import migrate
+from benchmarks.common import BENCH_DB, connect, create_bench_database, summarize
+
+
+DEFAULT_TOLERANCE = 0.25          # allowed p95 slowdown before a regression is reported
+NOISE_FLOOR_MS = 0.5              # ...ignoring differences smaller than this
+CUSTOM_SQL = "SELECT * FROM Transaction ORDER BY Timestamp DESC LIMIT 5000"
+
+
+def count_round_trips(conn):
+    """Count commands sent on `conn` (queries, commits, rollbacks); returns the counter dict."""
+    counter = {'trips': 0}
+    send = conn._execute_command
+
+    def counting(command, sql):
+        counter['trips'] += 1
+        return send(command, sql)
+    conn._execute_command = counting
+    return counter
+
+
+def load_dataset(users, seed):
+    """Fresh scratch database with a datagen dataset and every migration applied."""
+    conn = create_bench_database(list(datagen.TABLE_COLUMNS))
+    with conn.cursor() as cursor:
+        # Recreated (with their triggers) by the migrations after the load
+        for table in datagen.DERIVED_TABLES + ['Schema_Migration']:
+            cursor.execute(f"DROP TABLE IF EXISTS `{table}`")
+    plan = datagen.Plan(users, seed=seed)
+    print(f"{Style.INFO} Loading {users:,} users (seed {seed})...")
+    datagen.generate(conn, plan, fk_checks=False)
+    migrate(conn, log=lambda line: None)
+    print(f"{Style.SUCCESS} Dataset ready; migrations applied.")
+    return conn
+
+
+# ============================================================================
+# OPERATIONS
+# ============================================================================
+# Each operation is (name, prepare(conn, rng) -> list of arguments,
+# run(conn, argument) -> rows returned). Runs cycle through the arguments.
+
+def column(conn, sql, params=()):
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    conn.commit()
+    return [next(iter(row.values())) for row in rows]
+
+
+def pager_pages(select_sql, keys, pages=5):
+    def run(conn, _):
+        pager = KeysetPager(select_sql, keys)
+        count = 0
+        key = None
+        with conn.cursor() as cursor:
+            for _ in range(pages):
+                sql, params = pager.page_sql(key)
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                count += len(rows)
+                key = pager._key_of(rows[-1])
+        conn.commit()
+        return count
+    return run
+
+
+def no_args(conn, rng):
+    return [None]
+
+
+def run_summary(conn, _):
+    with conn.cursor() as cursor:
+        cursor.execute(queries.SUMMARY_STATS)
+        cursor.fetchone()
+    conn.commit()
+    return 1
+
+
+def prepare_creators(conn, rng):
+    # Busy creators plus a few random ones, so both large and small results are timed
+    busy = column(conn, "SELECT Creator_Address FROM DAO_Proposal GROUP BY Creator_Address "
+                        "ORDER BY COUNT(*) DESC LIMIT 10")
+    return busy + column(conn, "SELECT Creator_Address FROM DAO_Proposal ORDER BY RAND(%s) LIMIT 10",
+                         (rng.randrange(1 << 30),))
+
+
+def prepare_dates(conn, rng):
+    return [(date.today() - timedelta(days=days)).isoformat() for days in (30, 180, 365, 900, 2000)]
+
+
+def prepare_keywords(conn, rng):
+    return [word.lower() for word in rng.sample(datagen.NAME_WORDS, 8)] + ['fashion week', 'dao town hall']
+
+
+def prepare_business_owners(conn, rng):
+    return column(conn, "SELECT DISTINCT da.Owner_Address FROM Digital_Asset da "
+                        "JOIN LAND_Parcel lp ON lp.Asset_ID = da.Asset_ID LIMIT 50")
+
+
+def run_register(conn, owner):
+    register_business(f"Bench Shop {time.perf_counter_ns()}", 'Shop', owner, conn=conn)
+    return 1
+
+
+def prepare_sales(conn, rng):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT Asset_ID, Owner_Address FROM Digital_Asset ORDER BY RAND(%s) LIMIT 50",
+                       (rng.randrange(1 << 30),))
+        owners = {row['Asset_ID']: row['Owner_Address'] for row in cursor.fetchall()}
+    conn.commit()
+    buyers = column(conn, "SELECT Wallet_Address FROM User_Profile ORDER BY RAND(%s) LIMIT 200",
+                    (rng.randrange(1 << 30),))
+    # Each argument closes over the shared owner map, so repeated sales chain correctly
+    return [(owners, asset_id, buyers, rng) for asset_id in owners]
+
+
+def run_sale(conn, argument):
+    owners, asset_id, buyers, rng = argument
+    seller = owners[asset_id]
+    buyer = rng.choice([wallet for wallet in buyers if wallet != seller])
+    transfer_asset(asset_id, seller, buyer, 100, conn=conn)
+    owners[asset_id] = buyer
+    return 1
+
+
+def run_reschedule(conn, rng):
+    # The menu lists upcoming events, then moves one of them
+    events = fetch_upcoming_events(conn=conn)
+    if not events:
+        return len(events)
+    event = rng.choice(events)
+    start = datetime.now().replace(microsecond=0) + timedelta(days=rng.randint(30, 300), minutes=rng.randint(0, 1440))
+    # The overlap check still runs and is timed; a random slot that overlaps is kept
+    # rather than failing the run
+    update_event_schedule(event['Event_ID'], start, start + timedelta(hours=2), conn=conn, allow_conflicts=True)
+    return len(events)
+
+
+def prepare_victims(conn, rng):
+    # Digital_Asset owners cannot be deleted (ON DELETE RESTRICT); every run consumes one
+    victims = column(conn, "SELECT u.Wallet_Address FROM User_Profile u "
+                           "LEFT JOIN Digital_Asset da ON da.Owner_Address = u.Wallet_Address "
+                           "WHERE da.Asset_ID IS NULL ORDER BY RAND(%s) LIMIT 1000",
+                     (rng.randrange(1 << 30),))
+    return [victims] if victims else []
+
+
+def run_delete(conn, victims):
+    if not victims:
+        raise RuntimeError("ran out of deletable users; lower --repeat or reload the dataset")
+    delete_wallet(victims.pop(), conn=conn)
+    return 1
+
+
+def run_custom_sql(conn, _):
+    cursor = conn.cursor(SSDictCursor)
+    cursor.execute(CUSTOM_SQL)
+    count = 0
+    rows = cursor.fetchmany(1000)
+    while rows:
+        count += len(rows)
+        rows = cursor.fetchmany(1000)
+    cursor.close()
+    conn.rollback()
+    return count
+
+
+OPERATIONS = [
+    ('view_all_users', no_args, pager_pages(queries.ALL_USERS_SELECT, queries.ALL_USERS_KEYS)),
+    ('view_all_assets', no_args, pager_pages(queries.ALL_ASSETS_SELECT, queries.ALL_ASSETS_KEYS)),
+    ('view_summary_stats', no_args, run_summary),
+    ('1_dao_proposals', prepare_creators, lambda conn, wallet: len(fetch_dao_proposals(wallet, conn=conn))),
+    ('2_businesses_after', prepare_dates, lambda conn, day: len(fetch_businesses_after(day, conn=conn))),
+    ('3_land_sales', no_args, lambda conn, _: 1 if fetch_land_sales(conn=conn) else 0),
+    ('4_search_events', prepare_keywords, lambda conn, keyword: len(fetch_event_search(keyword, conn=conn)[0])),
+    ('5_voter_influence', no_args, lambda conn, _: len(fetch_voter_influence(conn=conn))),
+    ('6_register_business', prepare_business_owners, run_register),
+    ('7_record_sale', prepare_sales, run_sale),
+    ('8_reschedule_event', lambda conn, rng: [rng], run_reschedule),
+    ('9_delete_user', prepare_victims, run_delete),
+    ('10_custom_sql', no_args, run_custom_sql),
+]
+
+
+def measure(conn, counter, name, prepare, run, repeat, warmup, rng, cached=False):
+    """Time one operation; returns its result dict."""
+    arguments = prepare(conn, rng)
+    if not arguments:
+        return None
+    samples = []
+    trips = []
+    rows = 0
+    for i in range(warmup + repeat):
+        if not cached:
+            QUERY_CACHE.clear()
+            SUMMARY_CACHE.invalidate()
+        before = counter['trips']
+        start = time.perf_counter()
+        returned = run(conn, arguments[i % len(arguments)])
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+            trips.append(counter['trips'] - before)
+            rows += returned
+    stats = summarize(samples)
+    total = sum(samples)
+    stats.update({
+        'rows': rows,
+        'rows_per_s': rows / total if total else 0.0,
+        'round_trips': sorted(trips)[len(trips) // 2],
+        'max_round_trips': max(trips),
+    })
+    return stats
+
+
+def run_suite(conn, repeat=30, warmup=3, seed=7, only=None, cached=False, log=print):
+    counter = count_round_trips(conn)
+    results = {}
+    for name, prepare, run in OPERATIONS:
+        if only and name not in only:
+            continue
+        stats = measure(conn, counter, name, prepare, run, repeat, warmup, random.Random(f"{seed}:{name}"), cached)
+        if stats is None:
+            log(f"{Style.WARNING} {name}: no suitable rows in the dataset, skipped")
+            continue
+        results[name] = stats
+        log(f"{Style.GREEN}{name:<22}{Style.RESET} p50 {stats['p50_ms']:8.2f}  p95 {stats['p95_ms']:8.2f}  "
+            f"p99 {stats['p99_ms']:8.2f} ms  {stats['rows_per_s']:>11,.0f} rows/s  "
+            f"{stats['round_trips']:>3} trips")
+    return results
+
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, floor_ms=NOISE_FLOOR_MS):
+    """Return [(name, base p95, current p95, change, base trips, current trips, regressed)]."""
+    report = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        slower = (current['p95_ms'] > base['p95_ms'] * (1 + tolerance)
+                  and current['p95_ms'] - base['p95_ms'] > floor_ms)
+        more_trips = current['round_trips'] > base['round_trips']
+        change = (current['p95_ms'] / base['p95_ms'] - 1) if base['p95_ms'] else 0.0
+        report.append((name, base['p95_ms'], current['p95_ms'], change,
+                       base['round_trips'], current['round_trips'], slower or more_trips))
+    return report
+
+
+def print_comparison(report):
+    print(f"\n{Style.BOLD}{'operation':<22} {'base p95':>10} {'now p95':>10} {'change':>8}  trips{Style.RESET}")
+    for name, base_p95, p95, change, base_trips, trips, regressed in report:
+        tag = Style.ERROR if regressed else f"{Style.GREEN}[OK]{Style.RESET}"
+        print(f"{name:<22} {base_p95:>10.2f} {p95:>10.2f} {change:>+8.0%}  {base_trips:>2} -> {trips:<2} {tag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=datagen.parse_count, default=10000, help="dataset size, e.g. 10k, 1M")
+    parser.add_argument('--seed', type=int, default=42, help="datagen seed")
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--only', action='append', choices=[name for name, _, _ in OPERATIONS],
+                        help="run just this operation (repeatable)")
+    parser.add_argument('--cached', action='store_true', help="leave the query cache on (measures hits)")
+    parser.add_argument('--skip-load', action='store_true', help="reuse the existing scratch data")
+    parser.add_argument('--save', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against this JSON file; exit 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="allowed p95 slowdown (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    conn = connect(BENCH_DB) if args.skip_load else load_dataset(args.users, args.seed)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT VERSION() AS version, (SELECT COUNT(*) FROM User_Profile) AS users")
+            info = cursor.fetchone()
+        conn.commit()
+        results = run_suite(conn, repeat=args.repeat, warmup=args.warmup, only=args.only, cached=args.cached)
+    finally:
+        conn.close()
+
+    document = {
+        'meta': {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'users': info['users'],
+            'seed': None if args.skip_load else args.seed,
+            'repeat': args.repeat,
+            'cached': args.cached,
+            'mysql': info['version'],
+            'python': platform.python_version(),
+        },
+        'operations': results,
+    }
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as handle:
+            json.dump(document, handle, indent=2)
+        print(f"{Style.SUCCESS} Results written to {args.save}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        if baseline['meta'].get('users') != info['users']:
+            print(f"{Style.WARNING} Baseline was recorded with {baseline['meta'].get('users')} users, "
+                  f"this run has {info['users']}.")
+        report = compare(results, baseline['operations'], tolerance=args.tolerance)
+        print_comparison(report)
+        regressions = [row[0] for row in report if row[-1]]
+        if regressions:
+            print(f"\n{Style.ERROR} {len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        print(f"\n{Style.SUCCESS} No regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
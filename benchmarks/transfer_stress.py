@@ -0,0 +1,151 @@
+"""
+Asset transfer stress test: N threads racing to sell the same few assets.
+
+Each worker reads an asset's owner without locking, picks a buyer and sells
+it, so workers routinely act on owners that another thread has just replaced.
+Afterwards every asset's sale history is checked for double-spends: per
+wallet, initial holding + purchases - sales must be 0 or 1, and 1 only for the
+current owner.
+
+    python3 -m benchmarks.transfer_stress --threads 16 --assets 5 --sales 200
+    python3 -m benchmarks.transfer_stress --unsafe   # legacy check-then-act
+"""
+
+import argparse
+import random
+import secrets
+import threading
+import time
+from collections import Counter
+
+import pymysql
+
+import queries
+from main_app import SaleRejected, Style, transfer_asset
+from benchmarks.common import BENCH_DB, bulk_insert, connect, create_bench_database
+
+
+TABLES = ['User_Profile', 'Digital_Asset', 'Transaction']
+
+
+def wallet(n):
+    return '0x' + format(n, '040x')
+
+
+def load_dataset(conn, users, assets):
+    bulk_insert(conn, 'User_Profile', ['Wallet_Address', 'Username', 'Join_Date'],
+                [(wallet(i), f"trader_{i}", '2024-01-01') for i in range(users)])
+    bulk_insert(conn, 'Digital_Asset', ['Asset_ID', 'Token_URI', 'Owner_Address'],
+                [(f"LAND-{i}", f"https://api.decentraland.org/v2/parcels/{i}", wallet(i % users))
+                 for i in range(assets)])
+
+
+def legacy_transfer(conn, asset_id, seller, buyer, price):
+    """The original check-then-act sale: no row lock, unconditional UPDATE."""
+    with conn.cursor() as cursor:
+        cursor.execute(queries.ASSET_OWNER, (asset_id,))
+        asset = cursor.fetchone()
+        if not asset or asset['Owner_Address'] != seller:
+            raise SaleRejected("Seller does not own this asset.")
+        time.sleep(0.001)   # widen the window between check and write
+        cursor.execute(queries.INSERT_SALE, ('0x' + secrets.token_hex(32), asset_id, seller, buyer, price))
+        cursor.execute("UPDATE Digital_Asset SET Owner_Address = %s WHERE Asset_ID = %s", (buyer, asset_id))
+    conn.commit()
+
+
+def worker(sales, users, assets, unsafe, seed, tally, lock):
+    rng = random.Random(seed)
+    conn = connect(BENCH_DB)
+    counts = Counter()
+    try:
+        for _ in range(sales):
+            asset_id = f"LAND-{rng.randrange(assets)}"
+            with conn.cursor() as cursor:
+                cursor.execute(queries.ASSET_OWNER, (asset_id,))
+                seller = cursor.fetchone()['Owner_Address']
+            conn.commit()
+            buyer = wallet(rng.randrange(users))
+            if buyer == seller:
+                continue
+            try:
+                if unsafe:
+                    legacy_transfer(conn, asset_id, seller, buyer, 1)
+                else:
+                    transfer_asset(asset_id, seller, buyer, 1, conn=conn)
+                counts['sold'] += 1
+            except SaleRejected:
+                conn.rollback()
+                counts['rejected'] += 1
+            except pymysql.Error:
+                conn.rollback()
+                counts['failed'] += 1
+    finally:
+        conn.close()
+    with lock:
+        tally.update(counts)
+
+
+def find_double_spends(conn, users, assets):
+    """Return (asset, wallet, net) triples that violate ownership conservation."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT Asset_ID, Owner_Address FROM Digital_Asset")
+        owners = {row['Asset_ID']: row['Owner_Address'] for row in cursor.fetchall()}
+        cursor.execute("SELECT Asset_ID, Seller_Address, Buyer_Address FROM Transaction")
+        sales = cursor.fetchall()
+    net = Counter({(f"LAND-{i}", wallet(i % users)): 1 for i in range(assets)})
+    for sale in sales:
+        net[(sale['Asset_ID'], sale['Seller_Address'])] -= 1
+        net[(sale['Asset_ID'], sale['Buyer_Address'])] += 1
+    violations = []
+    for (asset_id, holder), held in net.items():
+        expected = 1 if owners.get(asset_id) == holder else 0
+        if held != expected:
+            violations.append((asset_id, holder, held))
+    return violations, len(sales)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--sales', type=int, default=200, help="sale attempts per thread")
+    parser.add_argument('--assets', type=int, default=5, help="few assets means heavy contention")
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=11)
+    parser.add_argument('--unsafe', action='store_true', help="use the legacy unlocked sale path")
+    args = parser.parse_args(argv)
+
+    conn = create_bench_database(TABLES)
+    try:
+        load_dataset(conn, args.users, args.assets)
+        tally = Counter()
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=worker, args=(args.sales, args.users, args.assets, args.unsafe,
+                                                  args.seed + n, tally, lock))
+            for n in range(args.threads)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        mode = 'legacy check-then-act' if args.unsafe else 'locked transfer'
+        print(f"{Style.INFO} {mode}: {tally['sold']} sold, {tally['rejected']} rejected, "
+              f"{tally['failed']} failed in {elapsed:.2f}s")
+        conn.commit()
+        violations, recorded = find_double_spends(conn, args.users, args.assets)
+        if violations:
+            print(f"{Style.ERROR} {len(violations)} double-spend(s) across {recorded} recorded sales:")
+            for asset_id, holder, held in violations[:10]:
+                print(f"   {Style.YELLOW}{asset_id}{Style.RESET} {Style.CYAN}{holder}{Style.RESET} net {held}")
+            return 1
+        print(f"{Style.SUCCESS} No double-spends across {recorded} recorded sales.")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Bulk User Deletion
+
+Purges many wallets at once: each chunk of wallets is loaded into a
+temporary table and every cascade step of delete_user() runs as one
+join-based statement against it, inside one transaction per chunk.
+
+Usage:
+    python3 bulk_delete.py wallets.txt [--chunk-size 500] [--yes]
+
+The input file holds one wallet address per line; blank lines and lines
+starting with '#' are ignored.
+"""
+
+import argparse
+import sys
+from collections import Counter
+
+import pymysql
+
+import queries
+from main_app import Style, authenticate_user, execute_if_table_exists, get_connection, notify_tables_written
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class PurgeReport:
+    """Per-table affected-row counts and skipped wallets for one purge run."""
+
+    def __init__(self):
+        self.affected = Counter()     # step label -> rows
+        self.chunks = 0
+        self.missing = 0              # wallets with no User_Profile row
+        self.blocked = []             # wallets that still own digital assets
+        self.failed = []              # (wallet, error) for rolled-back chunks
+
+
+def read_wallets_file(path):
+    """Yield wallet addresses from a one-per-line text file."""
+    with open(path, encoding='utf-8') as handle:
+        for text in handle:
+            text = text.strip()
+            if text and not text.startswith('#'):
+                yield text
+
+
+def _purge_chunk(conn, wallets, report):
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM Purge_Wallet")
+            cursor.executemany("INSERT IGNORE INTO Purge_Wallet (Wallet_Address) VALUES (%s)",
+                               [(w,) for w in wallets])
+            cursor.execute(queries.PURGE_DROP_UNKNOWN)
+            missing = cursor.rowcount
+            cursor.execute(queries.PURGE_ASSET_OWNERS)
+            blocked = [row['Wallet_Address'] for row in cursor.fetchall()]
+            if blocked:
+                cursor.execute(
+                    f"DELETE FROM Purge_Wallet WHERE Wallet_Address IN ({', '.join(['%s'] * len(blocked))})",
+                    blocked
+                )
+            affected = {}
+            for label, statement in queries.PURGE_WALLET_STEPS:
+                cursor.execute(statement)
+                affected[label] = cursor.rowcount
+            for label, statement in queries.ARCHIVE_PURGE_WALLET_STEPS:
+                affected[label] = execute_if_table_exists(cursor, statement)
+        conn.commit()
+    except pymysql.Error as e:
+        conn.rollback()
+        report.failed.extend((wallet, str(e)) for wallet in wallets)
+        return
+    report.affected.update(affected)
+    report.missing += missing
+    report.blocked.extend(blocked)
+    report.chunks += 1
+
+
+def delete_users(wallets, chunk_size=DEFAULT_CHUNK_SIZE, conn=None):
+    """Delete an iterable of wallet addresses in chunks; returns a PurgeReport.
+
+    Each chunk commits on its own, so transactions stay bounded and a failure
+    only rolls back that chunk. Wallets that own digital assets are skipped.
+    """
+    report = PurgeReport()
+    own_conn = conn is None
+    conn = conn or get_connection()
+    if not conn:
+        return report
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(queries.PURGE_WALLET_TABLE)
+        chunk = []
+        for wallet in wallets:
+            chunk.append(wallet)
+            if len(chunk) >= chunk_size:
+                _purge_chunk(conn, chunk, report)
+                chunk = []
+        if chunk:
+            _purge_chunk(conn, chunk, report)
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS Purge_Wallet")
+    finally:
+        if own_conn:
+            conn.close()
+    if report.chunks:
+        notify_tables_written(*queries.DELETE_USER_TABLES)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delete many users from a file of wallet addresses.")
+    parser.add_argument('path', help="text file with one wallet address per line")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="wallets per transaction")
+    parser.add_argument('--yes', action='store_true', help="skip the confirmation prompt")
+    args = parser.parse_args(argv)
+
+    wallets = list(dict.fromkeys(read_wallets_file(args.path)))
+    if not wallets:
+        print(f"{Style.WARNING} No wallet addresses in {args.path}.")
+        return 0
+    if not args.yes:
+        confirm = input(f"{Style.WARNING} Delete {len(wallets)} user(s)? (yes/no): ").strip().lower()
+        if confirm != 'yes':
+            print(f"{Style.WARNING} Deletion cancelled.")
+            return 1
+
+    authenticate_user()
+    report = delete_users(wallets, chunk_size=args.chunk_size)
+    print(f"{Style.SUCCESS} {report.affected['user_deleted']} user(s) deleted in {report.chunks} chunk(s).")
+    for label, _ in queries.PURGE_WALLET_STEPS + queries.ARCHIVE_PURGE_WALLET_STEPS:
+        print(f"   {Style.GRAY}{label}:{Style.RESET} {Style.WHITE}{report.affected[label]}{Style.RESET}")
+    if report.missing:
+        print(f"{Style.INFO} {report.missing} wallet(s) did not exist.")
+    if report.blocked:
+        print(f"{Style.WARNING} {len(report.blocked)} wallet(s) skipped because they still own digital assets.")
+    if report.failed:
+        print(f"{Style.ERROR} {len(report.failed)} wallet(s) rolled back: {report.failed[0][1]}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
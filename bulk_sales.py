@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Bulk Asset-Sale Ingestion
+
+Replays marketplace feeds (CSV or JSON lines) into Transaction and
+Digital_Asset in chunks: ownership chains are validated in memory against
+the locked current owners, sales are written with multi-row INSERTs, and
+ownership moves with one UPDATE ... JOIN against a staging table.
+
+Usage:
+    python3 bulk_sales.py sales.csv [--chunk-size 1000] [--rejects rejects.jsonl]
+
+Each record needs asset_id, seller, buyer and price; currency (MANA/ETH),
+timestamp (ISO 8601) and transaction_id are optional.
+"""
+
+import argparse
+import csv
+import json
+import secrets
+import sys
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+import pymysql
+
+from main_app import ER_NO_SUCH_TABLE, Style, authenticate_user, get_connection, notify_tables_written
+
+
+DEFAULT_CHUNK_SIZE = 1000
+CURRENCIES = ('MANA', 'ETH')
+MAX_PRICE = Decimal('1e10')           # Transaction.Price is DECIMAL(20, 10)
+
+STAGE_TABLE = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS Sale_Owner_Stage
+    (
+        Asset_ID VARCHAR(50) PRIMARY KEY,
+        New_Owner CHAR(42) NOT NULL
+    )
+"""
+
+INSERT_SALES = """
+    INSERT INTO Transaction (Transaction_ID, Asset_ID, Seller_Address, Buyer_Address, Price, Currency, Timestamp)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+APPLY_OWNERS = """
+    UPDATE Digital_Asset da
+    JOIN Sale_Owner_Stage s ON s.Asset_ID = da.Asset_ID
+    SET da.Owner_Address = s.New_Owner
+"""
+
+
+class IngestReport:
+    """Counts and per-row rejections for one ingestion run."""
+
+    def __init__(self):
+        self.accepted = 0
+        self.chunks = 0
+        self.rejected = []            # (line, reason, record)
+
+    def reject(self, line, reason, record):
+        self.rejected.append((line, reason, record))
+
+
+# ============================================================================
+# INPUT
+# ============================================================================
+
+def read_sales_file(path):
+    """Yield (line_number, record) from a .csv or JSON-lines file.
+
+    JSON lines are yielded as raw text and decoded by parse_sale(), so a
+    malformed line is rejected like any other bad row.
+    """
+    with open(path, newline='', encoding='utf-8') as handle:
+        if path.lower().endswith('.csv'):
+            for line, record in enumerate(csv.DictReader(handle), 2):
+                yield line, record
+        else:
+            for line, text in enumerate(handle, 1):
+                if text.strip():
+                    yield line, text.strip()
+
+
+def parse_sale(record):
+    """Normalise one record (dict or JSON text) into a sale dict; raises ValueError with the reason."""
+    if isinstance(record, str):
+        try:
+            record = json.loads(record)
+        except ValueError:
+            raise ValueError("line is not valid JSON")
+    if not isinstance(record, dict):
+        raise ValueError("record is not a JSON object")
+
+    def field(name):
+        value = record.get(name)
+        return str(value).strip() if value is not None else ''
+
+    sale = {
+        'asset_id': field('asset_id'),
+        'seller': field('seller'),
+        'buyer': field('buyer'),
+        'currency': (field('currency') or 'MANA').upper(),
+        'transaction_id': field('transaction_id') or '0x' + secrets.token_hex(32),
+    }
+    if not all([sale['asset_id'], sale['seller'], sale['buyer'], field('price')]):
+        raise ValueError("asset_id, seller, buyer and price are required")
+    for role in ('seller', 'buyer'):
+        if not sale[role].startswith('0x') or len(sale[role]) != 42:
+            raise ValueError(f"{role} is not a 42-character 0x wallet address")
+    if sale['seller'] == sale['buyer']:
+        raise ValueError("seller and buyer are the same wallet")
+    if sale['currency'] not in CURRENCIES:
+        raise ValueError(f"currency must be one of {', '.join(CURRENCIES)}")
+    if len(sale['transaction_id']) != 66:
+        raise ValueError("transaction_id must be a 66-character hash")
+    try:
+        sale['price'] = Decimal(field('price'))
+    except InvalidOperation:
+        raise ValueError("price is not a number")
+    if not sale['price'].is_finite():
+        raise ValueError("price is not a finite number")
+    if sale['price'] <= 0:
+        raise ValueError("price must be positive")
+    if sale['price'] >= MAX_PRICE:
+        raise ValueError(f"price must be below {int(MAX_PRICE):,}")
+    stamp = field('timestamp')
+    try:
+        sale['timestamp'] = datetime.fromisoformat(stamp) if stamp else datetime.now()
+    except ValueError:
+        raise ValueError("timestamp is not ISO 8601")
+    return sale
+
+
+# ============================================================================
+# CHUNK PROCESSING
+# ============================================================================
+
+def _in_clause(values):
+    return ", ".join(["%s"] * len(values))
+
+
+def _used_transaction_ids(cursor, tx_ids):
+    """The IDs in `tx_ids` already recorded, including sales archived out of Transaction."""
+    # Transaction_ID_Registry (migration 7) covers archived months; before it, only Transaction
+    for table in ('Transaction_ID_Registry', 'Transaction'):
+        try:
+            cursor.execute(f"SELECT Transaction_ID FROM `{table}` WHERE Transaction_ID IN ({_in_clause(tx_ids)})",
+                           tx_ids)
+        except pymysql.err.ProgrammingError as e:
+            if e.args[0] != ER_NO_SUCH_TABLE:
+                raise
+            continue
+        return {row['Transaction_ID'] for row in cursor.fetchall()}
+
+
+def _validate_chunk(cursor, chunk, report):
+    """Lock the chunk's assets and walk each ownership chain in file order."""
+    asset_ids = sorted({sale['asset_id'] for _, sale in chunk})
+    cursor.execute(
+        f"SELECT Asset_ID, Owner_Address FROM Digital_Asset WHERE Asset_ID IN ({_in_clause(asset_ids)}) FOR UPDATE",
+        asset_ids
+    )
+    owners = {row['Asset_ID']: row['Owner_Address'] for row in cursor.fetchall()}
+
+    wallets = sorted({sale['buyer'] for _, sale in chunk})
+    cursor.execute(
+        f"SELECT Wallet_Address FROM User_Profile WHERE Wallet_Address IN ({_in_clause(wallets)})",
+        wallets
+    )
+    known_wallets = {row['Wallet_Address'] for row in cursor.fetchall()}
+
+    seen_ids = _used_transaction_ids(cursor, [sale['transaction_id'] for _, sale in chunk])
+
+    accepted = []
+    for line, sale in chunk:
+        owner = owners.get(sale['asset_id'])
+        if owner is None:
+            report.reject(line, f"asset {sale['asset_id']} does not exist", sale)
+        elif owner != sale['seller']:
+            report.reject(line, f"seller does not own {sale['asset_id']} (owner {owner})", sale)
+        elif sale['buyer'] not in known_wallets:
+            report.reject(line, f"buyer {sale['buyer']} does not exist", sale)
+        elif sale['transaction_id'] in seen_ids:
+            report.reject(line, f"duplicate transaction_id {sale['transaction_id']}", sale)
+        else:
+            owners[sale['asset_id']] = sale['buyer']
+            seen_ids.add(sale['transaction_id'])
+            accepted.append(sale)
+    return accepted
+
+
+def _write_chunk(cursor, accepted):
+    """Insert the sales and move each asset to its final owner in one join."""
+    cursor.executemany(INSERT_SALES, [
+        (s['transaction_id'], s['asset_id'], s['seller'], s['buyer'], s['price'], s['currency'], s['timestamp'])
+        for s in accepted
+    ])
+    final_owner = {}
+    for sale in accepted:
+        final_owner[sale['asset_id']] = sale['buyer']
+    cursor.execute("DELETE FROM Sale_Owner_Stage")
+    cursor.executemany(
+        "INSERT INTO Sale_Owner_Stage (Asset_ID, New_Owner) VALUES (%s, %s)",
+        list(final_owner.items())
+    )
+    cursor.execute(APPLY_OWNERS)
+
+
+def _ingest_chunk(conn, chunk, report):
+    rejected_before = len(report.rejected)
+    try:
+        with conn.cursor() as cursor:
+            accepted = _validate_chunk(cursor, chunk, report)
+            if accepted:
+                _write_chunk(cursor, accepted)
+        conn.commit()
+    except pymysql.Error as e:
+        conn.rollback()
+        # Nothing from this chunk was written; report every row with the cause
+        del report.rejected[rejected_before:]
+        for line, sale in chunk:
+            report.reject(line, f"chunk rolled back: {e}", sale)
+        return
+    report.accepted += len(accepted)
+    report.chunks += 1
+
+
+def ingest_sales(records, chunk_size=DEFAULT_CHUNK_SIZE, conn=None):
+    """Ingest an iterable of sale dicts or (line, dict) pairs; returns an IngestReport.
+
+    Each chunk runs in its own transaction, so a failure only rolls back that
+    chunk. Rows that fail validation are reported and skipped.
+    """
+    report = IngestReport()
+    own_conn = conn is None
+    conn = conn or get_connection()
+    if not conn:
+        return report
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(STAGE_TABLE)
+        chunk = []
+        for position, item in enumerate(records, 1):
+            line, record = item if isinstance(item, tuple) else (position, item)
+            try:
+                chunk.append((line, parse_sale(record)))
+            except ValueError as e:
+                report.reject(line, str(e), record)
+            if len(chunk) >= chunk_size:
+                _ingest_chunk(conn, chunk, report)
+                chunk = []
+        if chunk:
+            _ingest_chunk(conn, chunk, report)
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS Sale_Owner_Stage")
+    finally:
+        if own_conn:
+            conn.close()
+    if report.accepted:
+        notify_tables_written('Transaction', 'Digital_Asset', 'User_Influence')
+    return report
+
+
+def write_rejects(path, report):
+    """Write rejected rows as JSON lines: {line, reason, record}."""
+    with open(path, 'w', encoding='utf-8') as handle:
+        for line, reason, record in report.rejected:
+            handle.write(json.dumps({'line': line, 'reason': reason, 'record': record}, default=str) + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-ingest asset sales from a CSV or JSON-lines file.")
+    parser.add_argument('path', help="sales file (.csv or .jsonl)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="sales per transaction")
+    parser.add_argument('--rejects', help="write rejected rows to this JSON-lines file")
+    args = parser.parse_args(argv)
+
+    authenticate_user()
+    report = ingest_sales(read_sales_file(args.path), chunk_size=args.chunk_size)
+    print(f"{Style.SUCCESS} {report.accepted} sale(s) recorded in {report.chunks} chunk(s).")
+    if report.rejected:
+        print(f"{Style.WARNING} {len(report.rejected)} row(s) rejected.")
+        for line, reason, _ in report.rejected[:10]:
+            print(f"   {Style.GRAY}line {line}:{Style.RESET} {reason}")
+        if args.rejects:
+            write_rejects(args.rejects, report)
+            print(f"{Style.INFO} Rejections written to {args.rejects}")
+    return 0 if not report.rejected else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
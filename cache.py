@@ -0,0 +1,166 @@
+"""
+MINI WORLD - GENESIS CITY
+In-Process Caches
+
+Small thread-safe caches for read results that are expensive to recompute
+but cheap to serve slightly stale.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+MISSING = object()                    # QueryCache.lookup() result on a miss
+
+
+class TTLCache:
+    """Key/value cache whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(self, ttl=30.0, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = {}            # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Store `value` under `key`, restarting its TTL."""
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+
+    def age(self, key):
+        """Seconds since `key` was stored, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else self._clock() - entry[0]
+
+    def get_or_load(self, key, loader):
+        """Return (value, from_cache), calling loader() on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value, True
+        value = loader()
+        self.put(key, value)
+        return value, False
+
+    def invalidate(self, key=None):
+        """Drop one entry, or everything when `key` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class QueryCache:
+    """LRU cache of query results keyed on (query id, params), invalidated per table.
+
+    Each entry remembers the version of every table its query reads. Writers
+    call bump() with the tables they changed, which makes every entry that
+    depends on them stale without scanning the cache. Entries also expire
+    after `ttl` seconds, and the least recently used entry is evicted once
+    more than `max_entries` are stored.
+    """
+
+    def __init__(self, max_entries=256, ttl=60.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (stored_at, versions, value)
+        self._versions = {}            # table -> write counter
+        self._epoch = 0                # bumped by bump() with no tables
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def _snapshot(self, tables):
+        return (self._epoch,) + tuple(self._versions.get(table, 0) for table in tables)
+
+    def lookup(self, query_id, params, tables):
+        """Return (value, versions); value is MISSING on a miss.
+
+        On a miss, load the result and pass it to store() with these
+        `versions`. The snapshot is taken before loading, so a write that
+        lands while the caller loads leaves the stored entry already stale.
+        """
+        key = (query_id, tuple(params))
+        with self._lock:
+            versions = self._snapshot(tables)
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, entry_versions, value = entry
+                if entry_versions == versions and self._clock() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, versions
+                del self._entries[key]
+                self.stale += 1
+            self.misses += 1
+        return MISSING, versions
+
+    def store(self, query_id, params, versions, value):
+        key = (query_id, tuple(params))
+        with self._lock:
+            self._entries[key] = (self._clock(), versions, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, query_id, params, tables, loader):
+        """Return (value, from_cache), calling loader() on a miss."""
+        value, versions = self.lookup(query_id, params, tables)
+        if value is not MISSING:
+            return value, True
+        value = loader()
+        self.store(query_id, params, versions, value)
+        return value, False
+
+    def bump(self, *tables):
+        """Invalidate results that read any of `tables` (everything if none given)."""
+        with self._lock:
+            if not tables:
+                self._epoch += 1
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def versions(self, *tables):
+        """Current version snapshot of `tables`, for callers that keep their own derived state."""
+        with self._lock:
+            return self._snapshot(tables)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters for display: hits, misses, hit rate, stale drops, evictions, size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'stale': self.stale,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+            }
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Headless Command Line
+
+Runs every menu operation without prompts so cron jobs and load tests can
+drive the same code paths. Rows are written as JSON lines (default) or CSV.
+
+Usage:
+    python3 main_app.py proposals --wallet 0x... --format json
+    python3 main_app.py record-sale --asset LAND-001 --seller 0x... --buyer 0x... --price 250
+    python3 main_app.py batch commands.txt        # one command per line, one session
+
+Credentials come from MINIWORLD_DB_USER / MINIWORLD_DB_PASSWORD, or from the
+[client] section of a MySQL option file (--config, default ~/.my.cnf).
+"""
+
+import argparse
+import asyncio
+import configparser
+import csv
+import json
+import os
+import shlex
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+import pymysql
+from pymysql.cursors import SSDictCursor
+
+import async_db
+import instrument
+import queries
+import main_app
+import spatial
+from main_app import (
+    DB_CREDENTIALS, InvalidRequest, KeysetPager, Style, borrowed_connection, close_pool, plain_value
+)
+
+
+ENV_USER = 'MINIWORLD_DB_USER'
+ENV_PASSWORD = 'MINIWORLD_DB_PASSWORD'
+DEFAULT_CONFIG = os.path.expanduser('~/.my.cnf')
+
+
+# ============================================================================
+# CREDENTIALS AND OUTPUT
+# ============================================================================
+
+def load_credentials(config_path=None):
+    """Fill DB_CREDENTIALS from the environment or a [client] option file."""
+    user = os.environ.get(ENV_USER)
+    password = os.environ.get(ENV_PASSWORD)
+    if not (user and password):
+        path = config_path or DEFAULT_CONFIG
+        parser = configparser.ConfigParser(allow_no_value=True, interpolation=None)
+        if parser.read(path) and parser.has_section('client'):
+            user = user or parser.get('client', 'user', fallback=None)
+            password = password or parser.get('client', 'password', fallback=None)
+    if not (user and password):
+        raise InvalidRequest(
+            f"No credentials: set {ENV_USER}/{ENV_PASSWORD} or add user/password "
+            f"to the [client] section of {config_path or DEFAULT_CONFIG}"
+        )
+    DB_CREDENTIALS['user'] = user
+    DB_CREDENTIALS['password'] = password.strip('"\'')
+
+
+class RowWriter:
+    """Write dict rows to a stream as JSON lines or CSV."""
+
+    def __init__(self, fmt, stream=None):
+        self.fmt = fmt
+        self.stream = stream or sys.stdout
+        self._csv_columns = None
+
+    def start(self):
+        """Begin a new result set (CSV writes a fresh header for it)."""
+        if self._csv_columns is not None:
+            self.stream.write('\n')
+        self._csv_columns = None
+
+    def write(self, row, extra=None):
+        row = {key: plain_value(value) for key, value in row.items()}
+        if extra:
+            row = {**extra, **row}
+        if self.fmt == 'json':
+            self.stream.write(json.dumps(row, default=str) + '\n')
+            return
+        if self._csv_columns is None:
+            self._csv_columns = list(row.keys())
+            self._csv = csv.DictWriter(self.stream, fieldnames=self._csv_columns, extrasaction='ignore')
+            self._csv.writeheader()
+        self._csv.writerow(row)
+
+
+# ============================================================================
+# COMMANDS (each returns an iterable of dict rows)
+# ============================================================================
+
+def cmd_proposals(args, conn):
+    return main_app.fetch_dao_proposals(args.wallet, conn=conn)
+
+
+def cmd_businesses(args, conn):
+    return main_app.fetch_businesses_after(args.after, conn=conn)
+
+
+def cmd_land_sales(args, conn):
+    if args.by_district:
+        return main_app.fetch_land_sales_by_district(days=args.days, conn=conn)
+    return [main_app.fetch_land_sales(days=args.days, conn=conn)]
+
+
+def cmd_search_events(args, conn):
+    rows, mode = main_app.fetch_event_search(args.keyword, conn=conn)
+    return [{**row, 'search_mode': mode} for row in rows]
+
+
+def cmd_influence(args, conn):
+    return main_app.fetch_voter_influence(conn=conn)
+
+
+def cmd_register_business(args, conn):
+    return [main_app.register_business(args.name, args.type, args.owner, args.parcel, conn=conn)]
+
+
+def cmd_record_sale(args, conn):
+    transaction_id = main_app.transfer_asset(args.asset, args.seller, args.buyer, args.price, conn=conn)
+    return [{
+        'Transaction_ID': transaction_id,
+        'Asset_ID': args.asset,
+        'Seller_Address': args.seller,
+        'Buyer_Address': args.buyer,
+        'Price': args.price,
+    }]
+
+
+def cmd_upcoming_events(args, conn):
+    return main_app.fetch_upcoming_events(conn=conn)
+
+
+def cmd_reschedule(args, conn):
+    return [main_app.update_event_schedule(
+        args.event_id, args.start, args.end, conn=conn, allow_conflicts=args.allow_conflicts
+    )]
+
+
+def cmd_shift_events(args, conn):
+    delta = timedelta(hours=args.hours, minutes=args.minutes)
+    return [main_app.shift_district_events(
+        args.district, delta, conn=conn, allow_conflicts=args.allow_conflicts, dry_run=args.dry_run
+    )]
+
+
+def cmd_delete_user(args, conn):
+    if not args.yes:
+        raise InvalidRequest("Refusing to delete without --yes.")
+    username, affected = main_app.delete_wallet(args.wallet, conn=conn)
+    return [{'Wallet_Address': args.wallet, 'Username': username, **affected}]
+
+
+def cmd_sql(args, conn):
+    if not args.query.strip().upper().startswith('SELECT'):
+        return [{'rows_affected': main_app.execute_statement(args.query, conn=conn)}]
+    return _stream_select(conn, args.query)
+
+
+def _stream_select(conn, query):
+    # Unbuffered cursor: rows are written as they arrive, not collected first
+    cursor = conn.cursor(SSDictCursor)
+    try:
+        cursor.execute(query)
+        row = cursor.fetchone()
+        while row is not None:
+            yield row
+            row = cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+class SessionConnection:
+    """The session connection lent to KeysetPager, which closes its connection after every page."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        pass                          # the session owns the connection
+
+
+def _session_pages(select_sql, keys, args, conn):
+    pager = KeysetPager(select_sql, keys=keys, page_size=args.page_size, connect=lambda: SessionConnection(conn))
+    for page in pager:
+        yield from page
+
+
+def cmd_users(args, conn):
+    return _session_pages(queries.ALL_USERS_SELECT, queries.ALL_USERS_KEYS, args, conn)
+
+
+def cmd_assets(args, conn):
+    return _session_pages(queries.ALL_ASSETS_SELECT, queries.ALL_ASSETS_KEYS, args, conn)
+
+
+def cmd_summary(args, conn):
+    counts, cached = main_app.fetch_summary_stats()
+    return [{**counts, 'cached': cached}] if counts else []
+
+
+def cmd_cache_stats(args, conn):
+    return [main_app.QUERY_CACHE.stats()]
+
+
+def cmd_stats(args, conn):
+    if args.by == 'statement':
+        return instrument.STATS.statement_rows(limit=args.limit)
+    if args.by == 'pool':
+        pool = main_app.get_pool()
+        return [pool.stats()] if pool else []
+    if args.by == 'spatial':
+        return [spatial.PARCEL_INDEX.stats()]
+    return instrument.STATS.operation_rows()
+
+
+def cmd_parcels_in(args, conn):
+    return spatial.parcels_in_box(*args.box, conn=conn)
+
+
+def cmd_parcels_near(args, conn):
+    return spatial.parcels_near(args.x, args.y, radius=args.radius, k=args.k, owner=args.owner, conn=conn)
+
+
+def cmd_estates(args, conn):
+    if args.at:
+        estate = spatial.estate_at(*args.at, conn=conn)
+        rows = [estate] if estate else []
+    else:
+        rows = spatial.estates(owner=args.owner, min_size=args.min_size, limit=args.limit, conn=conn)
+    return [{**row, 'Asset_IDs': ' '.join(row['Asset_IDs'])} for row in rows]
+
+
+def cmd_dashboard(args, conn):
+    # Runs its queries concurrently on their own connections, not the session one
+    return async_db.dashboard_rows(asyncio.run(async_db.run_dashboard()))
+
+
+def iso_datetime(text):
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected 'YYYY-MM-DD HH:MM'")
+
+
+def positive_price(text):
+    try:
+        price = Decimal(text)
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError("price is not a number")
+    if price <= 0:
+        raise argparse.ArgumentTypeError("price must be positive")
+    return price
+
+
+def add_commands(sub):
+    """Register every operation as a subcommand of `sub`."""
+    cmd = sub.add_parser('proposals', help="1. DAO proposals created by a wallet")
+    cmd.add_argument('--wallet', required=True)
+    cmd.set_defaults(handler=cmd_proposals)
+
+    cmd = sub.add_parser('businesses', help="2. businesses established after a date")
+    cmd.add_argument('--after', required=True, help="YYYY-MM-DD")
+    cmd.set_defaults(handler=cmd_businesses)
+
+    cmd = sub.add_parser('land-sales', help="3. MANA land-sale totals")
+    cmd.add_argument('--days', type=int, default=90)
+    cmd.add_argument('--by-district', action='store_true', help="one row per district")
+    cmd.set_defaults(handler=cmd_land_sales)
+
+    cmd = sub.add_parser('search-events', help="4. search events by keyword")
+    cmd.add_argument('--keyword', required=True)
+    cmd.set_defaults(handler=cmd_search_events)
+
+    cmd = sub.add_parser('influence', help="5. voter influence report")
+    cmd.set_defaults(handler=cmd_influence)
+
+    cmd = sub.add_parser('register-business', help="6. register a new business")
+    cmd.add_argument('--name', required=True)
+    cmd.add_argument('--type', required=True, choices=['Shop', 'Gallery', 'Venue', 'Service'])
+    cmd.add_argument('--owner', required=True, help="owner wallet address")
+    cmd.add_argument('--parcel', help="Asset_ID of an owned parcel (default: the first one)")
+    cmd.set_defaults(handler=cmd_register_business)
+
+    cmd = sub.add_parser('record-sale', help="7. record an asset sale and transfer ownership")
+    cmd.add_argument('--asset', required=True)
+    cmd.add_argument('--seller', required=True)
+    cmd.add_argument('--buyer', required=True)
+    cmd.add_argument('--price', required=True, type=positive_price, help="MANA")
+    cmd.set_defaults(handler=cmd_record_sale)
+
+    cmd = sub.add_parser('upcoming-events', help="events that can be rescheduled")
+    cmd.set_defaults(handler=cmd_upcoming_events)
+
+    cmd = sub.add_parser('reschedule', help="8. move an event to new times")
+    cmd.add_argument('--event-id', required=True, type=int)
+    cmd.add_argument('--start', required=True, type=iso_datetime, help="'YYYY-MM-DD HH:MM'")
+    cmd.add_argument('--end', required=True, type=iso_datetime, help="'YYYY-MM-DD HH:MM'")
+    cmd.add_argument('--allow-conflicts', action='store_true',
+                     help="move it even if it overlaps events on the same parcel or by the same organizer")
+    cmd.set_defaults(handler=cmd_reschedule)
+
+    cmd = sub.add_parser('shift-events', help="move every upcoming event in a district, validated as a whole")
+    cmd.add_argument('--district', required=True)
+    cmd.add_argument('--hours', type=float, default=0.0, help="negative moves events earlier")
+    cmd.add_argument('--minutes', type=float, default=0.0)
+    cmd.add_argument('--allow-conflicts', action='store_true')
+    cmd.add_argument('--dry-run', action='store_true', help="validate and report without writing")
+    cmd.set_defaults(handler=cmd_shift_events)
+
+    cmd = sub.add_parser('delete-user', help="9. delete a user and clear their references")
+    cmd.add_argument('--wallet', required=True)
+    cmd.add_argument('--yes', action='store_true', help="confirm the deletion")
+    cmd.set_defaults(handler=cmd_delete_user)
+
+    cmd = sub.add_parser('sql', help="10. run one SQL statement (SELECTs are streamed)")
+    cmd.add_argument('--query', required=True)
+    cmd.set_defaults(handler=cmd_sql)
+
+    for name, handler, text in (('users', cmd_users, "all user profiles"),
+                                ('assets', cmd_assets, "all digital assets")):
+        cmd = sub.add_parser(name, help=text)
+        cmd.add_argument('--page-size', type=int, default=1000)
+        cmd.set_defaults(handler=handler)
+
+    cmd = sub.add_parser('parcels-in', help="parcels inside a bounding box (map tile)")
+    cmd.add_argument('--box', required=True, type=int, nargs=4, metavar=('X0', 'Y0', 'X1', 'Y1'))
+    cmd.set_defaults(handler=cmd_parcels_in)
+
+    cmd = sub.add_parser('parcels-near', help="parcels within --radius of a point, or the --k nearest")
+    cmd.add_argument('--x', required=True, type=int)
+    cmd.add_argument('--y', required=True, type=int)
+    cmd.add_argument('--radius', type=float)
+    cmd.add_argument('--k', type=int, help="nearest parcels to return (default 10 without --radius)")
+    cmd.add_argument('--owner', help="only parcels owned by this wallet")
+    cmd.set_defaults(handler=cmd_parcels_near)
+
+    cmd = sub.add_parser('estates', help="contiguous parcels owned by the same wallet, largest first")
+    cmd.add_argument('--owner', help="only this wallet's estates")
+    cmd.add_argument('--at', type=int, nargs=2, metavar=('X', 'Y'), help="the estate containing this parcel")
+    cmd.add_argument('--min-size', type=int, default=2)
+    cmd.add_argument('--limit', type=int, default=20)
+    cmd.set_defaults(handler=cmd_estates)
+
+    cmd = sub.add_parser('summary', help="user/asset/business/event counts")
+    cmd.set_defaults(handler=cmd_summary)
+
+    cmd = sub.add_parser('cache-stats', help="query cache hit/miss counters for this session")
+    cmd.set_defaults(handler=cmd_cache_stats)
+
+    cmd = sub.add_parser('stats', help="statement timings recorded this session (most useful in batch mode)")
+    cmd.add_argument('--by', choices=['operation', 'statement', 'pool', 'spatial'], default='operation')
+    cmd.add_argument('--limit', type=int, default=20, help="statements to list with --by statement")
+    cmd.set_defaults(handler=cmd_stats)
+
+    cmd = sub.add_parser('dashboard', help="summary, land sales, influence and upcoming events, fetched concurrently")
+    cmd.set_defaults(handler=cmd_dashboard)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='main_app.py', description="Run Mini World operations without the interactive menu."
+    )
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help="output format")
+    parser.add_argument('--config', help=f"MySQL option file with a [client] section (default {DEFAULT_CONFIG})")
+    sub = parser.add_subparsers(dest='command', required=True)
+    add_commands(sub)
+    batch = sub.add_parser('batch', help="run one command per line of FILE ('-' for stdin) over one session")
+    batch.add_argument('file')
+    batch.add_argument('--stop-on-error', action='store_true')
+    for command in sub.choices.values():
+        # Also accept `--format` after the subcommand name
+        command.add_argument('--format', choices=['json', 'csv'], default=argparse.SUPPRESS)
+    return parser
+
+
+def build_command_parser():
+    """Parser for a single batch line (every command except `batch` itself)."""
+    parser = argparse.ArgumentParser(prog='batch', add_help=False, exit_on_error=False)
+    add_commands(parser.add_subparsers(dest='command', required=True))
+    return parser
+
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+
+def run_command(args, conn, writer, extra=None):
+    """Run one parsed command on `conn`, writing its rows; returns the row count."""
+    writer.start()
+    count = 0
+    try:
+        with instrument.operation(args.command):
+            for row in args.handler(args, conn):
+                writer.write(row, extra)
+                count += 1
+    finally:
+        # Writes have committed; this just ends the read snapshot between commands
+        conn.rollback()
+    return count
+
+
+def failure_message(error, where=''):
+    prefix = f"{where}: " if where else ''
+    return f"{Style.ERROR} {prefix}{error}"
+
+
+def report_failure(error, where=''):
+    print(failure_message(error, where), file=sys.stderr)
+
+
+def read_batch_lines(path):
+    """Yield (line_number, text) for each non-blank, non-comment line."""
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line_number, text in enumerate(handle, 1):
+            text = text.strip()
+            if text and not text.startswith('#'):
+                yield line_number, text
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def run_batch(args, conn, writer):
+    """Run every command in the batch file on one connection; returns the failure count."""
+    parser = build_command_parser()
+    failures = 0
+    for line_number, text in read_batch_lines(args.file):
+        where = f"{args.file}:{line_number}"
+        try:
+            argv = shlex.split(text)
+            command = parser.parse_args(argv)
+        except ValueError as e:
+            # shlex: unbalanced quote or trailing escape
+            report_failure(f"cannot split {text!r}: {e}", where)
+            failures += 1
+        except argparse.ArgumentError as e:
+            report_failure(f"cannot parse {' '.join(argv)!r}: {e}", where)
+            failures += 1
+        except SystemExit:
+            # Subcommand parsers print their own usage error before exiting
+            report_failure(f"cannot parse {' '.join(argv)!r}", where)
+            failures += 1
+        else:
+            try:
+                run_command(command, conn, writer, extra={'_line': line_number})
+            except (InvalidRequest, pymysql.Error) as e:
+                report_failure(e, where)
+                failures += 1
+        if failures and args.stop_on_error:
+            break
+    return failures
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    writer = RowWriter(args.format)
+    try:
+        load_credentials(args.config)
+        with borrowed_connection() as conn:
+            if args.command == 'batch':
+                return 1 if run_batch(args, conn, writer) else 0
+            run_command(args, conn, writer)
+            return 0
+    except (InvalidRequest, pymysql.Error) as e:
+        report_failure(e)
+        return 1
+    finally:
+        sys.stdout.flush()
+        close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Thin Client
+
+Sends a headless command line to a running session daemon (daemon.py) over
+its Unix socket and copies the rows back to stdout. Only the standard
+library is imported, so a call costs interpreter start-up plus one socket
+round trip: no pymysql import, no login. With no daemon listening the
+command runs in-process through cli.py as before.
+
+    python3 client.py proposals --wallet 0x... --format csv
+    python3 client.py batch commands.txt          # every line over one socket
+
+Protocol: one JSON object per line each way. A request is
+{"argv": [...]} (plus "line"/"where" for batch lines) or {"op": "status" |
+"stop"}; the reply is any number of {"out": text} chunks followed by
+{"exit": code, "err": text}.
+"""
+
+import json
+import os
+import shlex
+import socket
+import sys
+
+
+SOCKET_ENV = 'MINIWORLD_SOCKET'
+DEFAULT_SOCKET = os.path.expanduser('~/.miniworld.sock')
+
+# main_app.Style.ERROR, without importing main_app
+ERROR = '\033[91m[ERROR]\033[0m'
+
+
+def socket_path(path=None):
+    return path or os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET
+
+
+def connect(path=None):
+    """Open a socket to the daemon, or return None if none is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def is_running(path=None):
+    sock = connect(path)
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+class Client:
+    """One connection to the daemon; send() can be called repeatedly."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = sock.makefile('r', encoding='utf-8')
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def send(self, request, out=None, err=None):
+        """Send one request, copy its output to `out`/`err`, and return its exit code."""
+        out = out or sys.stdout
+        err = err or sys.stderr
+        self.sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        for line in self.reader:
+            message = json.loads(line)
+            if 'out' in message:
+                out.write(message['out'])
+                continue
+            if message.get('err'):
+                err.write(message['err'] + '\n')
+            return message.get('exit', 1)
+        err.write(f"{ERROR} daemon closed the connection\n")
+        return 1
+
+
+def split_batch(argv):
+    """(global options, file, stop_on_error) if argv is a `batch` command line, else None."""
+    args = list(argv)
+    options = []
+    while args and args[0].startswith('-'):
+        option = args.pop(0)
+        options.append(option)
+        if option in ('--format', '--config') and args:
+            options.append(args.pop(0))
+    if not args or args[0] != 'batch':
+        return None
+    rest = args[1:]
+    stop_on_error = '--stop-on-error' in rest
+    rest = [arg for arg in rest if arg != '--stop-on-error']
+    if '--format' in rest:
+        position = rest.index('--format')
+        options += rest[position:position + 2]
+        del rest[position:position + 2]
+    if len(rest) != 1:
+        return None
+    return options, rest[0], stop_on_error
+
+
+def run_batch(client, options, path, stop_on_error):
+    """Send each line of a batch file as its own request; returns 1 if any failed."""
+    failures = 0
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line_number, text in enumerate(handle, 1):
+            text = text.strip()
+            if not text or text.startswith('#'):
+                continue
+            try:
+                argv = shlex.split(text)
+            except ValueError as e:
+                # Unbalanced quote or trailing escape: the line never reaches the daemon
+                sys.stderr.write(f"{ERROR} {path}:{line_number}: cannot split {text!r}: {e}\n")
+                failed = True
+            else:
+                failed = client.send({'argv': options + argv, 'line': line_number, 'where': path})
+            if failed:
+                failures += 1
+                if stop_on_error:
+                    break
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    return 1 if failures else 0
+
+
+def control(op, path=None):
+    """Send a daemon control request (status, stop); returns the exit code."""
+    sock = connect(path)
+    if sock is None:
+        sys.stderr.write(f"{ERROR} No daemon is listening on {socket_path(path)}\n")
+        return 1
+    client = Client(sock)
+    try:
+        return client.send({'op': op})
+    finally:
+        client.close()
+
+
+def main(argv=None, path=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sock = connect(path)
+    if sock is None:
+        import cli
+        return cli.main(argv)
+    client = Client(sock)
+    try:
+        batch = split_batch(argv)
+        if batch is not None:
+            return run_batch(client, *batch)
+        return client.send({'argv': list(argv)})
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"{ERROR} Daemon request failed: {e}\n")
+        return 1
+    finally:
+        sys.stdout.flush()
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Session Daemon
+
+Every headless run of main_app.py pays for interpreter start-up, the pymysql
+import, reading credentials and a fresh login, and loses the connection pool
+and caches on exit. The daemon keeps one process with the pool, the query
+caches and the parcel index warm. It listens on a Unix socket for command
+lines from client.py and runs them with the same parser and handlers as cli.py.
+
+    python3 daemon.py serve [--config ~/.my.cnf] [--warm]
+    python3 daemon.py status
+    python3 daemon.py stop
+
+The socket (MINIWORLD_SOCKET, default ~/.miniworld.sock) is created mode 0600:
+anyone who can connect runs queries with the daemon's credentials.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+
+import pymysql
+
+import cli
+import client
+import main_app
+import spatial
+from main_app import InvalidRequest, Style, borrowed_connection, close_pool
+
+
+OUTPUT_CHUNK = 64 * 1024              # characters of formatted rows per {"out": ...} message
+KEEPALIVE_INTERVAL = 120.0            # seconds; well inside the pool's idle_timeout
+
+
+def send(wfile, message):
+    wfile.write((json.dumps(message, default=str) + '\n').encode('utf-8'))
+
+
+class FramedStream:
+    """File-like target for RowWriter that forwards its text as {"out": ...} messages."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self._parts = []
+        self._size = 0
+
+    def write(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= OUTPUT_CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            send(self.wfile, {'out': ''.join(self._parts)})
+            self._parts = []
+            self._size = 0
+
+
+class SessionServer(socketserver.ThreadingUnixStreamServer):
+    """Unix-socket server running cli.py command lines against the shared pool."""
+
+    daemon_threads = True
+
+    def __init__(self, path):
+        self.path = path
+        self.started = time.time()
+        self.requests = 0
+        self.failures = 0
+        self.stopping = threading.Event()
+        self._parser = cli.build_parser()
+        self._lock = threading.Lock()
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(path, RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def parse(self, argv):
+        """Return (args, exit code, captured argparse output)."""
+        captured = io.StringIO()
+        # redirect_* swaps the process-wide streams, so only one parse at a time
+        with self._lock, contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+            try:
+                return self._parser.parse_args(argv), None, ''
+            except SystemExit as e:
+                return None, e.code or 0, captured.getvalue()
+            except argparse.ArgumentError as e:
+                return None, 2, str(e)
+
+    def run(self, request, wfile):
+        """Execute one command request; returns (exit code, error text)."""
+        args, code, output = self.parse(request.get('argv') or [])
+        if args is None:
+            if code == 0:             # --help
+                send(wfile, {'out': output})
+                return 0, ''
+            return code, output.rstrip()
+        if args.command == 'batch':
+            return 2, cli.failure_message("batch files are read by the client: python3 client.py batch FILE")
+        line = request.get('line')
+        where = f"{request.get('where', 'batch')}:{line}" if line else ''
+        stream = FramedStream(wfile)
+        writer = cli.RowWriter(args.format, stream=stream)
+        try:
+            with borrowed_connection() as conn:
+                cli.run_command(args, conn, writer, extra={'_line': line} if line else None)
+            return 0, ''
+        except (InvalidRequest, pymysql.Error) as e:
+            return 1, cli.failure_message(e, where)
+        finally:
+            stream.flush()
+
+    def counted(self, code):
+        with self._lock:
+            self.requests += 1
+            self.failures += bool(code)
+
+    def status(self):
+        pool = main_app.get_pool()
+        return {
+            'pid': os.getpid(),
+            'socket': self.path,
+            'uptime_s': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'failures': self.failures,
+            'pool': pool.stats() if pool else None,
+            'query_cache': main_app.QUERY_CACHE.stats(),
+            'parcel_index': spatial.PARCEL_INDEX.stats(),
+        }
+
+    def stop(self):
+        """Stop serve_forever() from any thread (shutdown() blocks until it returns)."""
+        self.stopping.set()
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def keepalive(self):
+        # Borrow a connection now and then so idle eviction never empties the pool
+        while not self.stopping.wait(KEEPALIVE_INTERVAL):
+            try:
+                with borrowed_connection() as conn:
+                    conn.ping(reconnect=False)
+            except pymysql.Error as e:
+                print(f"{Style.WARNING} Keepalive failed: {e}", file=sys.stderr)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: any number of requests, answered in order."""
+
+    def handle(self):
+        server = self.server
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                send(self.wfile, {'exit': 2, 'err': cli.failure_message("malformed request")})
+                return
+            op = request.get('op')
+            code, error = 0, ''
+            if op == 'status':
+                send(self.wfile, {'out': json.dumps(server.status(), default=str) + '\n'})
+            elif op == 'stop':
+                server.stop()
+            else:
+                try:
+                    code, error = server.run(request, self.wfile)
+                except Exception as e:
+                    # One broken command must not take the daemon and its warm state down
+                    code, error = 1, cli.failure_message(f"internal error: {e!r}")
+                server.counted(code)
+            send(self.wfile, {'exit': code, 'err': error})
+            self.wfile.flush()
+
+
+def serve(path=None, config=None, warm=False):
+    """Run the daemon in the foreground until `stop`, SIGINT or SIGTERM."""
+    path = client.socket_path(path)
+    if client.is_running(path):
+        print(f"{Style.ERROR} A daemon is already listening on {path}", file=sys.stderr)
+        return 1
+    if os.path.exists(path):
+        os.unlink(path)               # left behind by a daemon that did not shut down cleanly
+
+    try:
+        cli.load_credentials(config)
+    except InvalidRequest:
+        if not sys.stdin.isatty():
+            raise
+        main_app.authenticate_user()
+
+    with borrowed_connection() as conn:
+        conn.ping(reconnect=False)
+    if warm:
+        main_app.fetch_summary_stats()
+        with spatial.PARCEL_INDEX.locked():
+            pass
+
+    server = SessionServer(path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: server.stop())
+    threading.Thread(target=server.keepalive, daemon=True).start()
+    print(f"{Style.SUCCESS} Listening on {path} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.stopping.set()
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        close_pool()
+        print(f"{Style.INFO} Daemon stopped after {server.requests} request(s)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep a Mini World session warm behind a Unix socket.")
+    parser.add_argument('command', choices=['serve', 'status', 'stop'])
+    parser.add_argument('--socket', help=f"socket path (default ${client.SOCKET_ENV} or {client.DEFAULT_SOCKET})")
+    parser.add_argument('--config', help="MySQL option file with a [client] section (serve)")
+    parser.add_argument('--warm', action='store_true', help="preload the summary counts and parcel index (serve)")
+    args = parser.parse_args(argv)
+    if args.command != 'serve':
+        return client.control(args.command, args.socket)
+    try:
+        return serve(args.socket, args.config, args.warm)
+    except (InvalidRequest, pymysql.Error) as e:
+        print(f"{Style.ERROR} {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Synthetic Data Generator
+
+Fills every schema.sql table with consistent data at any scale, for load
+testing. Ownership and activity are skewed: a few whale wallets own, trade
+and vote far more than everyone else, and a handful of hot districts see
+most land sales. Every CHECK constraint and foreign key holds. Rows are
+generated as streams, so memory stays flat up to millions of users. The
+output depends only on --seed and --anchor (the day all dates count back
+from; default today).
+
+Usage:
+    python3 datagen.py --users 100k [--seed 42] [--database decentraland_bench] [--reset]
+    python3 datagen.py --users 1M --method infile --no-fk-checks
+    python3 datagen.py --users 10M --plan
+
+The target database must already have the schema.sql tables (migrations are
+optional; their triggers keep derived tables in step during the load).
+"""
+
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pymysql
+from pymysql.cursors import DictCursor
+
+from main_app import Style, authenticate_user, connection_settings
+from migrations import table_exists
+
+
+GRID_RADIUS = 150                     # Genesis City spans -150..150 on both axes
+GRID_SIDE = 2 * GRID_RADIUS + 1
+GRID_PARCELS = GRID_SIDE * GRID_SIDE  # 90,601
+
+# Per-user ratios; parcels are capped by the grid
+PARCELS_PER_USER = 0.25
+WEARABLES_PER_USER = 1.0
+BUSINESSES_PER_USER = 0.05
+EVENTS_PER_USER = 0.2
+PROPOSALS_PER_USER = 0.01
+VOTES_PER_USER = 0.5
+
+SCENE_SHARE = 0.6                     # parcels with a deployed scene
+SECOND_VERSION_SHARE = 0.15           # of those, parcels with a v2 as well
+LAND_SALES_PER_PARCEL = 1.5           # mean, multiplied by the district heat
+SALES_PER_WEARABLE = 0.4
+ATTENDEES_PER_EVENT = 5
+SALE_HISTORY_DAYS = 3 * 365
+MANA_PER_ETH = 2000
+
+# (name, x0, y0, x1, y1, heat): heat scales how often parcels there change hands
+DISTRICTS = [
+    ('Genesis Plaza', -15, -15, 15, 15, 8.0),
+    ('Vegas City', -80, -40, -41, 0, 6.0),
+    ('Fashion Street', 60, 50, 99, 89, 5.0),
+    ('Dragon City', 100, 100, 139, 139, 3.0),
+    ('Crypto Valley', -130, 60, -91, 99, 2.0),
+    ('Museum District', 20, -120, 59, -81, 1.5),
+    ('Aetheria', -150, -150, -101, -101, 1.0),
+    ('University', 110, -60, 140, -30, 1.0),
+]
+ROAD_HEAT = 0.5
+
+WEARABLE_CATEGORIES = ['upper_body', 'lower_body', 'feet', 'hat', 'helmet', 'eyewear', 'earring', 'mask', 'skin']
+RARITIES = [('common', 50), ('uncommon', 25), ('rare', 12), ('epic', 7), ('legendary', 4), ('mythic', 1.5),
+            ('unique', 0.5)]
+BUSINESS_TYPES = ['Shop', 'Gallery', 'Venue', 'Service']
+PROPOSAL_STATUSES = [('Active', 15), ('Passed', 35), ('Rejected', 35), ('Enacted', 15)]
+NAME_WORDS = [
+    'Genesis', 'Plaza', 'Meetup', 'Rave', 'Fashion', 'Week', 'Poker', 'Night', 'Gallery',
+    'Opening', 'DAO', 'Town', 'Hall', 'Concert', 'Launch', 'Party', 'Art', 'Auction',
+    'Builders', 'Workshop', 'Crypto', 'Summit', 'Casino', 'Festival', 'Dragon', 'City',
+    'Pixel', 'Voxel', 'Neon', 'Lounge', 'Market', 'Studio', 'Arcade', 'Club', 'Tower',
+]
+TAGS = ['music', 'art', 'gaming', 'fashion', 'governance', 'education', 'social', 'crypto', 'nft']
+USERNAME_PREFIXES = ['whale', 'builder', 'artist', 'trader', 'explorer', 'player', 'collector', 'citizen']
+
+INFILE_CHUNK = 500000                 # rows per LOAD DATA file
+
+TABLE_COLUMNS = {
+    'User_Profile': ('Wallet_Address', 'Username', 'Join_Date', 'Last_Seen'),
+    'Digital_Asset': ('Asset_ID', 'Token_URI', 'Owner_Address'),
+    'LAND_Parcel': ('Asset_ID', 'X_Coordinate', 'Y_Coordinate', 'District_Name'),
+    'Wearable': ('Asset_ID', 'Category', 'Rarity'),
+    'DAO_Proposal': ('Proposal_ID', 'Title', 'Status', 'Creator_Address'),
+    'Business': ('Business_ID', 'Business_Name', 'Business_Type', 'Date_Established', 'Owner_Address',
+                 'Parcel_ID'),
+    'Scene_Content': ('Parcel_ID', 'Scene_Version', 'Description', 'Deployment_Date', 'Creator_Address'),
+    'Transaction': ('Transaction_ID', 'Timestamp', 'Price', 'Currency', 'Asset_ID', 'Seller_Address',
+                    'Buyer_Address'),
+    'Event': ('Event_ID', 'Event_Name', 'Start_Timestamp', 'End_Timestamp', 'Organizer_Address',
+              'Business_ID', 'Scene_Parcel_ID', 'Scene_Version'),
+    'Vote': ('Proposal_ID', 'Voter_Address', 'Vote_Choice', 'Voting_Weight', 'Timestamp'),
+    'ATTENDS': ('Wallet_Address', 'Event_ID'),
+    'Event_Tags': ('Event_ID', 'Tag'),
+}
+
+# Tables maintained by migration triggers or the archive job; emptied together on --reset
+DERIVED_TABLES = ['User_Influence', 'Land_Sales_Daily', 'Transaction_ID_Registry', 'Transaction_Archive',
+                  'Transaction_Archive_Log']
+
+
+def parse_count(text):
+    """'1000', '10k', '2.5M' -> int."""
+    text = text.strip().lower().replace('_', '').replace(',', '')
+    factor = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    if factor > 1:
+        text = text[:-1]
+    return int(float(text) * factor)
+
+
+def wallet(n):
+    """Deterministic, random-looking 0x address for user index n."""
+    # Multiplying by an odd constant is a bijection mod 2**160, so addresses stay unique
+    return '0x' + format((n * 0x9E3779B97F4A7C15F39CC0605CEDC8341082276B + 1) % (1 << 160), '040x')
+
+
+def tx_hash(rng):
+    return '0x' + format(rng.getrandbits(256), '064x')
+
+
+def money(value):
+    """Positive DECIMAL(20, 10)-safe amount with 4 decimal places."""
+    return Decimal(f"{min(max(value, 0.0001), 1e9):.4f}")
+
+
+def words(rng, low=2, high=4):
+    return ' '.join(rng.sample(NAME_WORDS, rng.randint(low, high)))
+
+
+def weighted(rng, pairs):
+    return rng.choices([value for value, _ in pairs], weights=[weight for _, weight in pairs])[0]
+
+
+def district_at(x, y):
+    for name, x0, y0, x1, y1, heat in DISTRICTS:
+        if x0 <= x <= x1 and y0 <= y <= y1:
+            return name, heat
+    return None, ROAD_HEAT
+
+
+# ============================================================================
+# PLAN
+# ============================================================================
+
+class Plan:
+    """Row counts and the parcel/scene layout for one dataset; no I/O."""
+
+    def __init__(self, users, seed=42, anchor=None):
+        if users < 10:
+            raise ValueError("need at least 10 users")
+        self.users = users
+        self.seed = seed
+        self.anchor = datetime.combine(anchor or date.today(), datetime.min.time())
+        self.parcels = min(GRID_PARCELS, max(10, int(users * PARCELS_PER_USER)))
+        self.wearables = max(10, int(users * WEARABLES_PER_USER))
+        self.businesses = max(5, int(users * BUSINESSES_PER_USER))
+        self.events = max(10, int(users * EVENTS_PER_USER))
+        self.proposals = max(5, int(users * PROPOSALS_PER_USER))
+        self._layout = None
+
+    def rng(self, stream):
+        """Independent generator per stream, so tables don't depend on each other's draws."""
+        return random.Random(f"{self.seed}:{stream}")
+
+    def pick_user(self, rng):
+        """Zipf-like user index: index 0 is the biggest whale, the tail is long."""
+        return min(self.users - 1, int(self.users ** rng.random()) - 1)
+
+    @property
+    def layout(self):
+        if self._layout is None:
+            self._layout = Layout(self)
+        return self._layout
+
+    def estimates(self):
+        """Expected row counts per table (exact where the plan fixes them)."""
+        layout = self.layout
+        land_sales = sum(LAND_SALES_PER_PARCEL * heat for heat in layout.heat)
+        return {
+            'User_Profile': self.users,
+            'Digital_Asset': self.parcels + self.wearables,
+            'LAND_Parcel': self.parcels,
+            'Wearable': self.wearables,
+            'DAO_Proposal': self.proposals,
+            'Business': self.businesses,
+            'Scene_Content': len(layout.scenes),
+            'Transaction': int(land_sales + self.wearables * SALES_PER_WEARABLE),
+            'Event': self.events,
+            'Vote': int(self.users * VOTES_PER_USER),
+            'ATTENDS': self.events * ATTENDEES_PER_EVENT,
+            'Event_Tags': self.events * 2,
+        }
+
+
+class Layout:
+    """Parcel coordinates, districts and deployed scenes for a plan."""
+
+    def __init__(self, plan):
+        rng = plan.rng('layout')
+        # Weighted sampling without replacement (key u ** (1 / heat)): when only
+        # part of the grid is used, hot districts are the ones that fill up
+        ranked = sorted(range(GRID_PARCELS), key=lambda cell: -rng.random() ** (1.0 / district_at(*self.xy(cell))[1]))
+        self.cells = ranked[:plan.parcels]
+        self.district = []
+        self.heat = []
+        for cell in self.cells:
+            name, heat = district_at(*self.xy(cell))
+            self.district.append(name)
+            self.heat.append(heat)
+        self.cum_heat = list(itertools.accumulate(self.heat))
+
+        self.scenes = []              # (parcel index, version)
+        for parcel in range(plan.parcels):
+            if rng.random() < SCENE_SHARE:
+                self.scenes.append((parcel, 'v1'))
+                if rng.random() < SECOND_VERSION_SHARE:
+                    self.scenes.append((parcel, 'v2'))
+
+    @staticmethod
+    def xy(cell):
+        return cell % GRID_SIDE - GRID_RADIUS, cell // GRID_SIDE - GRID_RADIUS
+
+    def hot_parcel(self, rng):
+        """Parcel index weighted by district heat."""
+        return rng.choices(range(len(self.cells)), cum_weights=self.cum_heat)[0]
+
+
+# ============================================================================
+# ROW GENERATORS
+# ============================================================================
+# Each yields tuples in TABLE_COLUMNS order. Parents are generated before
+# children and every reference points at a row a parent generator yields.
+
+def land_id(parcel):
+    return f"LAND-{parcel}"
+
+
+def wearable_id(index):
+    return f"WEAR-{index}"
+
+
+def asset_owners(plan):
+    """(asset_id, parcel index or None, owner index) for every asset, in load order."""
+    rng = plan.rng('owners')
+    for parcel in range(plan.parcels):
+        yield land_id(parcel), parcel, plan.pick_user(rng)
+    for index in range(plan.wearables):
+        yield wearable_id(index), None, plan.pick_user(rng)
+
+
+def user_rows(plan):
+    rng = plan.rng('users')
+    for n in range(plan.users):
+        prefix = USERNAME_PREFIXES[0] if n < 10 else rng.choice(USERNAME_PREFIXES)
+        # Whales (low indexes) are early adopters
+        age_days = rng.randrange(2000, 3000) if n < 100 else rng.randrange(3000)
+        joined = (plan.anchor - timedelta(days=age_days)).date()
+        last_seen = None
+        if rng.random() >= 0.1:
+            last_seen = plan.anchor - timedelta(seconds=rng.randrange(age_days * 86400 + 1))
+        yield wallet(n), f"{prefix}_{n}", joined, last_seen
+
+
+def asset_rows(plan):
+    layout = plan.layout
+    wearable_rng = plan.rng('wearable-uri')
+    for asset_id, parcel, owner in asset_owners(plan):
+        if parcel is not None:
+            x, y = layout.xy(layout.cells[parcel])
+            uri = f"https://api.decentraland.org/v2/parcels/{x},{y}"
+        else:
+            uri = f"https://api.decentraland.org/v2/wearables/{wearable_rng.choice(WEARABLE_CATEGORIES)}_{asset_id[5:]}"
+        yield asset_id, uri, wallet(owner)
+
+
+def parcel_rows(plan):
+    layout = plan.layout
+    for parcel, cell in enumerate(layout.cells):
+        x, y = layout.xy(cell)
+        yield land_id(parcel), x, y, layout.district[parcel]
+
+
+def wearable_rows(plan):
+    rng = plan.rng('wearables')
+    for index in range(plan.wearables):
+        yield wearable_id(index), rng.choice(WEARABLE_CATEGORIES), weighted(rng, RARITIES)
+
+
+def proposal_rows(plan):
+    rng = plan.rng('proposals')
+    for index in range(plan.proposals):
+        yield f"DCL-PROP-{index + 1:06d}", f"{words(rng)} Proposal", weighted(rng, PROPOSAL_STATUSES), \
+            wallet(plan.pick_user(rng))
+
+
+def business_rows(plan):
+    rng = plan.rng('businesses')
+    layout = plan.layout
+    for index in range(plan.businesses):
+        owner = wallet(plan.pick_user(rng)) if rng.random() >= 0.05 else None
+        established = (plan.anchor - timedelta(days=rng.randrange(2500))).date()
+        yield (index + 1, words(rng, 1, 3), rng.choice(BUSINESS_TYPES), established, owner,
+               land_id(layout.hot_parcel(rng)))
+
+
+def scene_rows(plan):
+    rng = plan.rng('scenes')
+    for parcel, version in plan.layout.scenes:
+        description = f"{words(rng)} scene" if rng.random() >= 0.3 else None
+        deployed = (plan.anchor - timedelta(days=rng.randrange(1500))).date()
+        creator = wallet(plan.pick_user(rng)) if rng.random() >= 0.1 else None
+        yield land_id(parcel), version, description, deployed, creator
+
+
+def transaction_rows(plan):
+    """Sale history per asset: a chain of owners that ends with the current one."""
+    rng = plan.rng('sales')
+    layout = plan.layout
+    span = SALE_HISTORY_DAYS * 86400
+    for asset_id, parcel, owner in asset_owners(plan):
+        if parcel is not None:
+            mean, base_price = LAND_SALES_PER_PARCEL * layout.heat[parcel], 3000.0
+        else:
+            mean, base_price = SALES_PER_WEARABLE, 50.0
+        sales = min(50, int(rng.expovariate(1.0 / mean) + 0.5))
+        if not sales:
+            continue
+        chain = [owner]
+        while len(chain) <= sales:
+            previous = plan.pick_user(rng)
+            if previous != chain[-1]:
+                chain.append(previous)
+        chain.reverse()
+        # Squared offsets cluster sales towards the present
+        stamps = sorted((plan.anchor - timedelta(seconds=int(span * rng.random() ** 2) + 1)
+                         for _ in range(sales)))
+        for step, stamp in enumerate(stamps):
+            price = rng.lognormvariate(math.log(base_price), 0.9)
+            currency = 'MANA' if rng.random() < 0.85 else 'ETH'
+            if currency == 'ETH':
+                price /= MANA_PER_ETH
+            yield (tx_hash(rng), stamp, money(price), currency, asset_id,
+                   wallet(chain[step]), wallet(chain[step + 1]))
+
+
+def event_rows(plan):
+    rng = plan.rng('events')
+    scenes = plan.layout.scenes
+    for index in range(plan.events):
+        # Two years of history plus a quarter of upcoming events
+        start = plan.anchor + timedelta(hours=rng.randrange(-2 * 365 * 24, 90 * 24))
+        end = start + timedelta(hours=rng.randint(1, 6))
+        organizer = wallet(plan.pick_user(rng)) if rng.random() >= 0.05 else None
+        business = rng.randrange(plan.businesses) + 1 if rng.random() < 0.3 else None
+        parcel, version = rng.choice(scenes) if scenes else (None, None)
+        yield (index + 1, words(rng), start, end, organizer, business,
+               land_id(parcel) if parcel is not None else None, version)
+
+
+def distinct_users(plan, rng, count):
+    """Up to `count` distinct user indexes, half whale-skewed, half uniform."""
+    chosen = set()
+    attempts = 0
+    while len(chosen) < count and attempts < count * 4:
+        chosen.add(plan.pick_user(rng) if rng.random() < 0.5 else rng.randrange(plan.users))
+        attempts += 1
+    return sorted(chosen)
+
+
+def skewed_count(rng, mean, cap):
+    """Heavy-tailed count with the given mean (Pareto, alpha 1.5)."""
+    return max(1, min(cap, int(rng.paretovariate(1.5) * mean / 3.0)))
+
+
+def vote_rows(plan):
+    rng = plan.rng('votes')
+    mean = plan.users * VOTES_PER_USER / plan.proposals
+    for index in range(plan.proposals):
+        proposal = f"DCL-PROP-{index + 1:06d}"
+        for voter in distinct_users(plan, rng, skewed_count(rng, mean, plan.users)):
+            # Whales carry more voting power
+            weight = rng.lognormvariate(math.log(100), 1.0) * (50 if voter < 10 else 1)
+            stamp = plan.anchor - timedelta(seconds=rng.randrange(700 * 86400))
+            yield proposal, wallet(voter), 'For' if rng.random() < 0.65 else 'Against', money(weight), stamp
+
+
+def attendance_rows(plan):
+    rng = plan.rng('attendance')
+    for index in range(plan.events):
+        for user in distinct_users(plan, rng, skewed_count(rng, ATTENDEES_PER_EVENT, plan.users)):
+            yield wallet(user), index + 1
+
+
+def tag_rows(plan):
+    rng = plan.rng('tags')
+    for index in range(plan.events):
+        for tag in rng.sample(TAGS, rng.randint(1, 3)):
+            yield index + 1, tag
+
+
+# Load order respects every foreign key
+GENERATORS = [
+    ('User_Profile', user_rows),
+    ('Digital_Asset', asset_rows),
+    ('LAND_Parcel', parcel_rows),
+    ('Wearable', wearable_rows),
+    ('DAO_Proposal', proposal_rows),
+    ('Business', business_rows),
+    ('Scene_Content', scene_rows),
+    ('Transaction', transaction_rows),
+    ('Event', event_rows),
+    ('Vote', vote_rows),
+    ('ATTENDS', attendance_rows),
+    ('Event_Tags', tag_rows),
+]
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def batches(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def insert_rows(conn, table, columns, rows, batch=5000):
+    """Multi-row INSERTs, one commit per batch; returns the row count."""
+    sql = f"INSERT INTO `{table}` ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    count = 0
+    with conn.cursor() as cursor:
+        for chunk in batches(rows, batch):
+            # pymysql rewrites executemany(INSERT ... VALUES) into multi-row statements
+            cursor.executemany(sql, chunk)
+            conn.commit()
+            count += len(chunk)
+    return count
+
+
+def tsv_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+    return str(value)
+
+
+def infile_rows(conn, table, columns, rows, batch=INFILE_CHUNK):
+    """LOAD DATA LOCAL INFILE through temporary TSV files; returns the row count."""
+    sql = (f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+           f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})")
+    count = 0
+    with conn.cursor() as cursor:
+        for chunk in batches(rows, batch):
+            handle = tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', delete=False)
+            try:
+                with handle:
+                    handle.writelines('\t'.join(tsv_value(value) for value in row) + '\n' for row in chunk)
+                cursor.execute(sql, (handle.name,))
+                conn.commit()
+            finally:
+                os.unlink(handle.name)
+            count += len(chunk)
+    return count
+
+
+def reset_tables(conn):
+    """Empty every generated table (and trigger-maintained ones) without firing triggers."""
+    with conn.cursor() as cursor:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        try:
+            for table in [name for name, _ in reversed(GENERATORS)] + DERIVED_TABLES:
+                if table_exists(cursor, table):
+                    cursor.execute(f"TRUNCATE TABLE `{table}`")
+        finally:
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+
+def generate(conn, plan, method='insert', batch=5000, fk_checks=True, log=print):
+    """Load the plan's rows into `conn`'s database; returns {table: rows}."""
+    load = insert_rows if method == 'insert' else infile_rows
+    if method == 'infile':
+        batch = max(batch, INFILE_CHUNK)
+    counts = {}
+    with conn.cursor() as cursor:
+        if not fk_checks:
+            cursor.execute("SET SESSION FOREIGN_KEY_CHECKS = 0")
+            cursor.execute("SET SESSION UNIQUE_CHECKS = 0")
+    try:
+        for table, rows in GENERATORS:
+            start = time.perf_counter()
+            counts[table] = load(conn, table, TABLE_COLUMNS[table], rows(plan), batch)
+            elapsed = time.perf_counter() - start
+            log(f"{Style.SUCCESS} {table:<14} {counts[table]:>12,} rows  "
+                f"{counts[table] / elapsed if elapsed else 0:>12,.0f} rows/s")
+    finally:
+        if not fk_checks:
+            with conn.cursor() as cursor:
+                cursor.execute("SET SESSION FOREIGN_KEY_CHECKS = 1")
+                cursor.execute("SET SESSION UNIQUE_CHECKS = 1")
+    with conn.cursor() as cursor:
+        for table in counts:
+            cursor.execute(f"ANALYZE TABLE `{table}`")
+            cursor.fetchall()
+    return counts
+
+
+def connect(database):
+    """Unpooled connection to `database` with LOAD DATA LOCAL enabled."""
+    return pymysql.connect(**dict(connection_settings(), database=database),
+                           cursorclass=DictCursor, autocommit=False, local_infile=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill the Mini World schema with synthetic data.")
+    parser.add_argument('--users', type=parse_count, default=1000, help="size factor, e.g. 1k, 250k, 10M")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--anchor', type=date.fromisoformat, default=None,
+                        help="YYYY-MM-DD that dates count back from (default: today)")
+    parser.add_argument('--database', default='decentraland_bench', help="target database with the schema")
+    parser.add_argument('--method', choices=('insert', 'infile'), default='insert',
+                        help="multi-row INSERTs or LOAD DATA LOCAL INFILE")
+    parser.add_argument('--batch-size', type=int, default=5000, help="rows per INSERT statement")
+    parser.add_argument('--no-fk-checks', action='store_true',
+                        help="disable foreign-key and unique checks for the load (data is valid by construction)")
+    parser.add_argument('--reset', action='store_true', help="empty the tables first")
+    parser.add_argument('--plan', action='store_true', help="only print the expected row counts")
+    args = parser.parse_args(argv)
+
+    try:
+        plan = Plan(args.users, seed=args.seed, anchor=args.anchor)
+    except ValueError as e:
+        print(f"{Style.ERROR} {e}")
+        return 1
+    if args.plan:
+        for table, count in plan.estimates().items():
+            print(f"  {table:<14} ~{count:>12,}")
+        return 0
+
+    authenticate_user()
+    try:
+        conn = connect(args.database)
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Cannot open {args.database}: {e}")
+        return 1
+    try:
+        if args.reset:
+            reset_tables(conn)
+        else:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM User_Profile LIMIT 1")
+                if cursor.fetchone():
+                    print(f"{Style.ERROR} {args.database} already has data; pass --reset to replace it.")
+                    return 1
+        print(f"{Style.INFO} Generating {plan.users:,} users into {args.database} (seed {plan.seed}, "
+              f"anchor {plan.anchor.date()})")
+        start = time.perf_counter()
+        counts = generate(conn, plan, method=args.method, batch=args.batch_size, fk_checks=not args.no_fk_checks)
+        print(f"{Style.SUCCESS} {sum(counts.values()):,} rows in {time.perf_counter() - start:.1f}s")
+        return 0
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Load failed: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
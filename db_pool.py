@@ -0,0 +1,255 @@
+"""
+MINI WORLD - GENESIS CITY
+Connection Pool
+
+A small thread-safe pool of pymysql connections so menu operations can borrow
+an already-authenticated connection instead of paying a TCP handshake and
+login for every action.
+"""
+
+import threading
+import time
+from collections import deque
+
+import pymysql
+
+
+class PoolTimeout(pymysql.err.OperationalError):
+    """Raised when no connection could be checked out before the wait timeout."""
+
+
+class PooledConnection:
+    """Proxy around a borrowed connection; close() hands it back to the pool."""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._broken = False
+        self._returned = False
+
+    def __getattr__(self, name):
+        if self._returned:
+            raise pymysql.err.InterfaceError(0, "Connection already returned to pool")
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and not self._returned:
+            try:
+                self._raw.rollback()
+            except pymysql.Error:
+                self._broken = True
+        self.close()
+
+    def invalidate(self):
+        """Mark the connection as unusable so the pool discards it on return."""
+        self._broken = True
+
+    def close(self):
+        """Return the connection to the pool (safe to call more than once)."""
+        if self._returned:
+            return
+        self._returned = True
+        self._pool._release(self._raw, self._created_at, self._broken)
+
+
+class ConnectionPool:
+    """Bounded pool with ping-on-checkout, idle eviction and max lifetime."""
+
+    def __init__(self, connect_kwargs, max_size=8, checkout_timeout=10.0,
+                 idle_timeout=300.0, max_lifetime=1800.0, ping_after=2.0, connect=pymysql.connect):
+        self.connect_kwargs = dict(connect_kwargs)
+        self.connect = connect        # factory called with connect_kwargs
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+
+        self._idle = deque()          # (raw, created_at, last_used)
+        self._size = 0                # idle + checked out
+        self._closed = False
+        self._cond = threading.Condition()
+        self._metrics = {
+            'checkouts': 0,
+            'created': 0,
+            'reused': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'timeouts': 0,
+            'ping_failures': 0,
+            'evicted_idle': 0,
+            'evicted_lifetime': 0,
+            'discarded_broken': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+
+    def acquire(self, timeout=None):
+        """Borrow a healthy connection, waiting up to `timeout` seconds for one."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited_since = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise pymysql.err.InterfaceError(0, "Connection pool is closed")
+                self._evict_expired_locked()
+
+                if self._idle:
+                    raw, created_at, last_used = self._idle.pop()
+                    reuse = True
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    raw = created_at = last_used = None
+                    reuse = False
+                    break
+
+                remaining = deadline - time.monotonic()
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                    self._metrics['waits'] += 1
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    self._record_wait_locked(waited_since)
+                    raise PoolTimeout(
+                        2013, f"Timed out after {timeout:.1f}s waiting for a pooled connection"
+                    )
+                self._cond.wait(remaining)
+
+            if waited_since is not None:
+                self._record_wait_locked(waited_since)
+            self._metrics['checkouts'] += 1
+
+        if reuse:
+            raw = self._validate(raw, created_at, last_used)
+            if raw is None:
+                # Stale connection was dropped; the slot is free to open a new one.
+                created_at = None
+            else:
+                with self._cond:
+                    self._metrics['reused'] += 1
+                return PooledConnection(self, raw, created_at)
+
+        try:
+            raw = self.connect(**self.connect_kwargs)
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        created_at = time.monotonic()
+        with self._cond:
+            self._metrics['created'] += 1
+        return PooledConnection(self, raw, created_at)
+
+    def _validate(self, raw, created_at, last_used):
+        """Ping connections that sat idle; returns None if the connection was dropped."""
+        if time.monotonic() - last_used < self.ping_after:
+            return raw
+        try:
+            raw.ping(reconnect=False)
+            return raw
+        except pymysql.Error:
+            with self._cond:
+                self._metrics['ping_failures'] += 1
+            self._close_raw(raw)
+            return None
+
+    def _release(self, raw, created_at, broken):
+        now = time.monotonic()
+        if not broken:
+            try:
+                # Never hand the next borrower someone else's open transaction.
+                raw.rollback()
+            except pymysql.Error:
+                broken = True
+
+        with self._cond:
+            expired = now - created_at >= self.max_lifetime
+            if broken or expired or self._closed:
+                if broken:
+                    self._metrics['discarded_broken'] += 1
+                elif expired:
+                    self._metrics['evicted_lifetime'] += 1
+                self._size -= 1
+                self._cond.notify()
+                discard = True
+            else:
+                self._idle.append((raw, created_at, now))
+                self._cond.notify()
+                discard = False
+        if discard:
+            self._close_raw(raw)
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def _evict_expired_locked(self):
+        now = time.monotonic()
+        keep = deque()
+        stale = []
+        for raw, created_at, last_used in self._idle:
+            if now - created_at >= self.max_lifetime:
+                self._metrics['evicted_lifetime'] += 1
+                stale.append(raw)
+            elif now - last_used >= self.idle_timeout:
+                self._metrics['evicted_idle'] += 1
+                stale.append(raw)
+            else:
+                keep.append((raw, created_at, last_used))
+        if stale:
+            self._idle = keep
+            self._size -= len(stale)
+            self._cond.notify(len(stale))
+            for raw in stale:
+                self._close_raw(raw)
+
+    def _record_wait_locked(self, waited_since):
+        waited = time.monotonic() - waited_since
+        self._metrics['wait_time_total'] += waited
+        self._metrics['wait_time_max'] = max(self._metrics['wait_time_max'], waited)
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except pymysql.Error:
+            pass
+
+    def evict_idle(self):
+        """Drop idle connections past their idle timeout or lifetime."""
+        with self._cond:
+            self._evict_expired_locked()
+
+    def stats(self):
+        """Return a snapshot of pool size and checkout/wait metrics."""
+        with self._cond:
+            snapshot = dict(self._metrics)
+            snapshot['size'] = self._size
+            snapshot['idle'] = len(self._idle)
+            snapshot['in_use'] = self._size - len(self._idle)
+            snapshot['max_size'] = self.max_size
+        waits = snapshot['waits']
+        snapshot['wait_time_avg'] = snapshot['wait_time_total'] / waits if waits else 0.0
+        return snapshot
+
+    def close(self):
+        """Close idle connections; borrowed ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle = [raw for raw, _, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for raw in idle:
+            self._close_raw(raw)
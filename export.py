@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Result Export
+
+Streams any SELECT, or one of the built-in reports, to CSV, newline-delimited
+JSON, Parquet or Arrow IPC files. Rows are read from an unbuffered
+server-side cursor and written in batches, so memory stays flat however large
+the result is. DECIMAL columns keep every digit (decimal128 in Parquet/Arrow)
+and TIMESTAMP/DATETIME columns become real timestamps.
+
+Usage:
+    python3 export.py --report transactions -o transactions.parquet
+    python3 export.py --query "SELECT * FROM Vote WHERE Timestamp >= %s" --param 2025-01-01 -o votes.csv
+
+Parquet and Arrow output need pyarrow (pip install pyarrow).
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import pymysql
+from pymysql.constants import FIELD_TYPE
+from pymysql.cursors import SSCursor
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for Parquet/Arrow output
+    pa = None
+    pq = None
+
+import queries
+from main_app import InvalidRequest, Style, authenticate_user, borrowed_connection, plain_value
+
+
+DEFAULT_BATCH_SIZE = 10000
+
+FORMATS = ('csv', 'ndjson', 'parquet', 'arrow')
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+
+# name -> (sql, parameter names)
+REPORTS = {
+    'transactions': (queries.EXPORT_TRANSACTIONS, ()),
+    'transactions_between': (queries.EXPORT_TRANSACTIONS_BETWEEN, ('since', 'until')),
+    'votes': (queries.EXPORT_VOTES, ()),
+    'users': (queries.ALL_USERS_SELECT, ()),
+    'assets': (queries.ALL_ASSETS_SELECT, ()),
+    'proposals': (queries.DAO_PROPOSALS_BY_USER, ('wallet',)),
+    'businesses': (queries.BUSINESSES_AFTER_DATE, ('date',)),
+    'influence': (queries.VOTER_INFLUENCE, ()),
+}
+
+INTEGER_TYPES = {
+    FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.INT24,
+    FIELD_TYPE.LONGLONG, FIELD_TYPE.YEAR,
+}
+DECIMAL_TYPES = {FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+TIMESTAMP_TYPES = {FIELD_TYPE.TIMESTAMP, FIELD_TYPE.DATETIME}
+
+
+def arrow_type(description):
+    """Arrow type for one cursor.description entry, or None to infer from the data."""
+    _, type_code, _, length, _, scale, _ = description
+    if type_code in DECIMAL_TYPES:
+        # Display length counts the sign and the decimal point
+        precision = max((length or 0) - (1 if scale else 0), (scale or 0) + 1)
+        if precision <= 38:
+            return pa.decimal128(precision, scale or 0)
+        return pa.decimal256(min(precision, 76), scale or 0)
+    if type_code in TIMESTAMP_TYPES:
+        return pa.timestamp('us')
+    if type_code == FIELD_TYPE.DATE:
+        return pa.date32()
+    if type_code == FIELD_TYPE.TIME:
+        return pa.duration('us')
+    if type_code in INTEGER_TYPES:
+        return pa.int64()
+    if type_code in (FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE):
+        return pa.float64()
+    return None
+
+
+# ============================================================================
+# SINKS
+# ============================================================================
+
+class CsvSink:
+    """CSV with exact decimals and ISO 8601 timestamps."""
+
+    def __init__(self, path):
+        self._handle = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._handle)
+
+    def begin(self, description):
+        self._writer.writerow([column[0] for column in description])
+
+    def write(self, rows):
+        self._writer.writerows([[plain_value(value) for value in row] for row in rows])
+
+    def close(self):
+        self._handle.close()
+
+
+class NdjsonSink:
+    """One JSON object per line; decimals are strings so no digits are lost."""
+
+    def __init__(self, path):
+        self._handle = open(path, 'w', encoding='utf-8')
+        self._columns = None
+
+    def begin(self, description):
+        self._columns = [column[0] for column in description]
+
+    def write(self, rows):
+        self._handle.writelines(
+            json.dumps(dict(zip(self._columns, (plain_value(value) for value in row))), default=str) + '\n'
+            for row in rows
+        )
+
+    def close(self):
+        self._handle.close()
+
+
+class ArrowSink:
+    """Parquet (one row group per batch) or Arrow IPC file output via pyarrow."""
+
+    def __init__(self, path, fmt):
+        if pa is None:
+            raise InvalidRequest(f"{fmt} output needs pyarrow (pip install pyarrow)")
+        self.path = path
+        self.fmt = fmt
+        self._types = None
+        self._schema = None
+        self._writer = None
+
+    def begin(self, description):
+        self._names = [column[0] for column in description]
+        self._types = [arrow_type(column) for column in description]
+
+    def _open(self, columns):
+        fields = []
+        for name, declared, values in zip(self._names, self._types, columns):
+            if declared is None:
+                # Strings vs. binary cannot be told apart from the type code alone
+                inferred = pa.array(values).type
+                declared = pa.string() if pa.types.is_null(inferred) else inferred
+            fields.append(pa.field(name, declared))
+        self._schema = pa.schema(fields)
+        if self.fmt == 'parquet':
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(self.path, self._schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        if self._writer is None:
+            self._open(columns)
+        arrays = [pa.array(values, type=field.type) for values, field in zip(columns, self._schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        if self._writer is None and self._types is not None:
+            # Empty result: still produce a file with the declared schema
+            self._open([[] for _ in self._types])
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_sink(path, fmt):
+    if fmt == 'csv':
+        return CsvSink(path)
+    if fmt == 'ndjson':
+        return NdjsonSink(path)
+    return ArrowSink(path, fmt)
+
+
+def format_for(path, fmt=None):
+    """Explicit format, or the one implied by the file extension."""
+    fmt = fmt or EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt not in FORMATS:
+        raise InvalidRequest(f"Cannot tell the export format of {path}; pass one of {', '.join(FORMATS)}")
+    return fmt
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def export_query(query, path, params=None, fmt=None, batch_size=DEFAULT_BATCH_SIZE, conn=None):
+    """Stream the rows of `query` into `path`; returns the number of rows written."""
+    fmt = format_for(path, fmt)
+    sink = open_sink(path, fmt)
+    count = 0
+    try:
+        with borrowed_connection(conn) as conn:
+            # Not a `with` block: closing an unbuffered cursor drains every remaining row
+            cursor = conn.cursor(SSCursor)
+            try:
+                cursor.execute(query, params or ())
+                sink.begin(cursor.description)
+                rows = cursor.fetchmany(batch_size)
+                while rows:
+                    sink.write(rows)
+                    count += len(rows)
+                    rows = cursor.fetchmany(batch_size)
+                cursor.close()
+                conn.rollback()
+            except BaseException:
+                # A half-read result set leaves the connection unusable
+                if hasattr(conn, 'invalidate'):
+                    conn.invalidate()
+                raise
+    finally:
+        sink.close()
+    return count
+
+
+def export_report(name, path, params=None, **kwargs):
+    """Export one of REPORTS; `params` maps the report's parameter names to values."""
+    if name not in REPORTS:
+        raise InvalidRequest(f"Unknown report {name!r}; choose from {', '.join(REPORTS)}")
+    sql, names = REPORTS[name]
+    params = params or {}
+    missing = [param for param in names if param not in params]
+    if missing:
+        raise InvalidRequest(f"Report {name!r} needs --{' --'.join(missing)}")
+    return export_query(sql, path, params=[params[param] for param in names], **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a query or report to CSV, NDJSON, Parquet or Arrow.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--report', choices=sorted(REPORTS), help="built-in report")
+    source.add_argument('--query', help="any SELECT statement (%%s placeholders bind --param values)")
+    parser.add_argument('-o', '--output', required=True, help="output file")
+    parser.add_argument('--format', choices=FORMATS, help="default: taken from the output extension")
+    parser.add_argument('--param', action='append', default=[], help="value for a --query placeholder")
+    parser.add_argument('--wallet', help="wallet for the proposals report")
+    parser.add_argument('--date', help="YYYY-MM-DD for the businesses report")
+    parser.add_argument('--since', help="window start (inclusive) for the transactions_between report")
+    parser.add_argument('--until', help="window end (exclusive) for the transactions_between report")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="rows per fetch/write")
+    args = parser.parse_args(argv)
+
+    authenticate_user()
+    try:
+        if args.report:
+            report_params = {key: getattr(args, key) for key in ('wallet', 'date', 'since', 'until')
+                             if getattr(args, key)}
+            count = export_report(args.report, args.output, report_params,
+                                  fmt=args.format, batch_size=args.batch_size)
+        else:
+            count = export_query(args.query, args.output, params=args.param,
+                                 fmt=args.format, batch_size=args.batch_size)
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return 1
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Export failed: {e}")
+        return 1
+    print(f"{Style.SUCCESS} Exported {Style.GREEN}{count}{Style.RESET} row(s) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
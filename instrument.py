@@ -0,0 +1,335 @@
+"""
+MINI WORLD - GENESIS CITY
+Query Instrumentation
+
+A pymysql connection class that counts round trips and bytes on the wire,
+plus cursors that record every statement. Each record holds the statement's
+fingerprint (literals and placeholders replaced by ?), a hash of its
+parameters, wall time, rows and bytes received. Records are charged to the
+operation that issued them (see `operation`). Statements slower than the
+threshold are appended to a JSON-lines slow-query log together with their
+EXPLAIN plan.
+
+Settings come from the environment:
+    MINIWORLD_SLOW_MS    slow-query threshold in milliseconds (default 200)
+    MINIWORLD_SLOW_LOG   slow-query log path (default slow_queries.log; empty disables it)
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+import pymysql
+from pymysql.connections import Connection
+from pymysql.cursors import Cursor, DictCursor, SSCursor, SSDictCursor
+
+
+SLOW_QUERY_MS = float(os.environ.get('MINIWORLD_SLOW_MS', '200'))
+SLOW_QUERY_LOG = os.environ.get('MINIWORLD_SLOW_LOG', 'slow_queries.log')
+
+DEFAULT_OPERATION = 'other'
+_CURRENT_OPERATION = contextvars.ContextVar('instrument_operation', default=DEFAULT_OPERATION)
+
+EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH|UPDATE|DELETE|INSERT|REPLACE)\b', re.IGNORECASE)
+
+_FINGERPRINT_RULES = [
+    (re.compile(r'/\*.*?\*/|--[^\n]*', re.DOTALL), ' '),
+    (re.compile(r"'(?:[^'\\]|\\.|'')*'"), '?'),
+    (re.compile(r'"(?:[^"\\]|\\.)*"'), '?'),
+    (re.compile(r'%\(\w+\)s|%s'), '?'),
+    (re.compile(r'\b0x[0-9a-f]+\b', re.IGNORECASE), '?'),
+    (re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?:e[-+]?\d+)?\b', re.IGNORECASE), '?'),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?+)'),
+    (re.compile(r'(VALUES\s*\(\?\+\))(?:\s*,\s*\(\?\+\))+', re.IGNORECASE), r'\1...'),
+]
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """Normalise a statement so calls that differ only in values group together."""
+    for pattern, replacement in _FINGERPRINT_RULES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def params_hash(args):
+    """Short stable hash of the bound parameters (the values themselves are never logged)."""
+    if args is None:
+        return None
+    return hashlib.sha1(repr(args).encode('utf-8', 'replace')).hexdigest()[:12]
+
+
+def current_operation():
+    return _CURRENT_OPERATION.get()
+
+
+# ============================================================================
+# AGGREGATION
+# ============================================================================
+
+class QueryStats:
+    """Thread-safe per-operation and per-fingerprint aggregates, plus the slow log."""
+
+    def __init__(self, slow_ms=SLOW_QUERY_MS, slow_log=SLOW_QUERY_LOG, explain=True):
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self.explain = explain
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._operations = {}
+            self._fingerprints = {}
+            self.started_at = time.time()
+
+    def _operation_locked(self, name):
+        entry = self._operations.get(name)
+        if entry is None:
+            entry = self._operations[name] = {
+                'runs': 0, 'wall_time': 0.0, 'statements': 0, 'db_time': 0.0,
+                'round_trips': 0, 'rows': 0, 'bytes_received': 0, 'bytes_sent': 0, 'slow': 0,
+            }
+        return entry
+
+    def operation_finished(self, name, elapsed):
+        with self._lock:
+            entry = self._operation_locked(name)
+            entry['runs'] += 1
+            entry['wall_time'] += elapsed
+
+    def round_trip(self, sent):
+        with self._lock:
+            entry = self._operation_locked(current_operation())
+            entry['round_trips'] += 1
+            entry['bytes_sent'] += sent
+
+    def record(self, sql, args, elapsed, rows, received):
+        """Add one finished statement; returns True if it was slow."""
+        fp = fingerprint(sql)
+        name = current_operation()
+        slow = elapsed * 1000.0 >= self.slow_ms
+        with self._lock:
+            entry = self._operation_locked(name)
+            entry['statements'] += 1
+            entry['db_time'] += elapsed
+            entry['rows'] += max(rows, 0)
+            entry['bytes_received'] += received
+            entry['slow'] += slow
+            stats = self._fingerprints.get(fp)
+            if stats is None:
+                stats = self._fingerprints[fp] = {
+                    'calls': 0, 'total_time': 0.0, 'max_time': 0.0, 'rows': 0, 'bytes_received': 0,
+                    'slow': 0, 'operations': set(),
+                }
+            stats['calls'] += 1
+            stats['total_time'] += elapsed
+            stats['max_time'] = max(stats['max_time'], elapsed)
+            stats['rows'] += max(rows, 0)
+            stats['bytes_received'] += received
+            stats['slow'] += slow
+            stats['operations'].add(name)
+        return slow
+
+    def log_slow(self, sql, args, elapsed, rows, received, plan=None):
+        if not self.slow_log:
+            return
+        entry = {
+            'at': datetime.now().isoformat(timespec='milliseconds'),
+            'operation': current_operation(),
+            'fingerprint': fingerprint(sql),
+            'params_hash': params_hash(args),
+            'ms': round(elapsed * 1000.0, 3),
+            'rows': rows,
+            'bytes_received': received,
+        }
+        if plan is not None:
+            entry['explain'] = plan
+        line = json.dumps(entry, default=str) + '\n'
+        with self._lock:
+            with open(self.slow_log, 'a', encoding='utf-8') as handle:
+                handle.write(line)
+
+    def operation_rows(self):
+        """One dict per operation, busiest first."""
+        with self._lock:
+            items = [(name, dict(entry)) for name, entry in self._operations.items()]
+        rows = []
+        for name, entry in items:
+            runs = entry['runs'] or 1
+            rows.append({
+                'operation': name,
+                'runs': entry['runs'],
+                'statements': entry['statements'],
+                'round_trips': entry['round_trips'],
+                'trips_per_run': round(entry['round_trips'] / runs, 1),
+                'db_ms': round(entry['db_time'] * 1000.0, 1),
+                'db_ms_per_run': round(entry['db_time'] * 1000.0 / runs, 2),
+                'rows': entry['rows'],
+                'kb_received': round(entry['bytes_received'] / 1024.0, 1),
+                'slow': entry['slow'],
+            })
+        rows.sort(key=lambda row: -row['db_ms'])
+        return rows
+
+    def statement_rows(self, limit=20):
+        """The `limit` fingerprints with the most total time."""
+        with self._lock:
+            items = [(fp, dict(stats, operations=sorted(stats['operations'])))
+                     for fp, stats in self._fingerprints.items()]
+        items.sort(key=lambda item: -item[1]['total_time'])
+        return [{
+            'fingerprint': fp,
+            'calls': stats['calls'],
+            'total_ms': round(stats['total_time'] * 1000.0, 1),
+            'avg_ms': round(stats['total_time'] * 1000.0 / stats['calls'], 2),
+            'max_ms': round(stats['max_time'] * 1000.0, 2),
+            'rows': stats['rows'],
+            'kb_received': round(stats['bytes_received'] / 1024.0, 1),
+            'slow': stats['slow'],
+            'operations': ', '.join(stats['operations']),
+        } for fp, stats in items[:limit]]
+
+
+STATS = QueryStats()
+
+
+@contextmanager
+def operation(name):
+    """Charge every statement issued inside the block (in this context) to `name`."""
+    token = _CURRENT_OPERATION.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STATS.operation_finished(name, time.perf_counter() - start)
+        _CURRENT_OPERATION.reset(token)
+
+
+# ============================================================================
+# CONNECTION AND CURSORS
+# ============================================================================
+
+class InstrumentedConnection(Connection):
+    """pymysql connection that counts commands and bytes, and hands out instrumented cursors."""
+
+    def __init__(self, *args, stats=None, **kwargs):
+        self.stats = stats or STATS
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.round_trips = 0
+        self._counting = True
+        super().__init__(*args, **kwargs)
+
+    def _read_bytes(self, num_bytes):
+        data = super()._read_bytes(num_bytes)
+        self.bytes_received += len(data)
+        return data
+
+    def _write_bytes(self, data):
+        self.bytes_sent += len(data)
+        super()._write_bytes(data)
+
+    def _execute_command(self, command, sql):
+        if self._counting:
+            self.round_trips += 1
+            self.stats.round_trip(len(sql) if sql else 0)
+        return super()._execute_command(command, sql)
+
+    def cursor(self, cursor=None):
+        cursor = cursor or self.cursorclass
+        return super().cursor(INSTRUMENTED_CURSORS.get(cursor, cursor))
+
+    def explain(self, sql):
+        """EXPLAIN rows for an already-interpolated statement, without counting it."""
+        self._counting = False
+        try:
+            with DictCursor(self) as cursor:
+                cursor.execute("EXPLAIN " + sql)
+                return cursor.fetchall()
+        except pymysql.Error as e:
+            return [{'error': str(e)}]
+        finally:
+            self._counting = True
+
+
+class InstrumentedCursorMixin:
+    """Times execute(); unbuffered statements are finished when the cursor is closed or reused."""
+
+    _pending = None
+
+    def execute(self, query, args=None):
+        self._finish_pending(self.connection)
+        received = getattr(self.connection, 'bytes_received', 0)
+        start = time.perf_counter()
+        result = super().execute(query, args)
+        pending = (query, args, start, received, self._executed)
+        if isinstance(self, SSCursor):
+            # Rows are still on the wire; the statement ends when they are drained
+            self._pending = pending
+        else:
+            self._finish(self.connection, pending, self.rowcount)
+        return result
+
+    def close(self):
+        conn = self.connection
+        try:
+            super().close()
+        finally:
+            self._finish_pending(conn)
+
+    def _finish_pending(self, conn):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._finish(conn, pending, self.rownumber)
+
+    @staticmethod
+    def _finish(conn, pending, rows):
+        query, args, start, received, executed = pending
+        elapsed = time.perf_counter() - start
+        if not isinstance(conn, InstrumentedConnection):
+            return
+        received = conn.bytes_received - received
+        stats = conn.stats
+        if stats.record(query, args, elapsed, rows, received):
+            plan = None
+            if stats.explain and executed and EXPLAINABLE.match(executed):
+                plan = conn.explain(executed)
+            stats.log_slow(query, args, elapsed, rows, received, plan)
+
+
+class InstrumentedCursor(InstrumentedCursorMixin, Cursor):
+    pass
+
+
+class InstrumentedDictCursor(InstrumentedCursorMixin, DictCursor):
+    pass
+
+
+class InstrumentedSSCursor(InstrumentedCursorMixin, SSCursor):
+    pass
+
+
+class InstrumentedSSDictCursor(InstrumentedCursorMixin, SSDictCursor):
+    pass
+
+
+INSTRUMENTED_CURSORS = {
+    Cursor: InstrumentedCursor,
+    DictCursor: InstrumentedDictCursor,
+    SSCursor: InstrumentedSSCursor,
+    SSDictCursor: InstrumentedSSDictCursor,
+}
+
+
+def connect(**kwargs):
+    """pymysql.connect() replacement returning an InstrumentedConnection."""
+    return InstrumentedConnection(**kwargs)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Influence Leaderboard Maintenance
+
+User_Influence is kept current by triggers on Digital_Asset and Vote
+(migration 2). Changes that bypass triggers, such as FK cascades, can make it
+drift from the source tables; this module rebuilds it or reports the drift.
+
+Usage:
+    python3 leaderboard.py verify [--repair]
+    python3 leaderboard.py rebuild
+"""
+
+import argparse
+import sys
+
+import pymysql
+
+import queries
+from main_app import Style, authenticate_user, get_connection
+
+
+DRIFT_QUERY = f"""
+    SELECT
+        e.Wallet_Address,
+        e.Parcels_Owned, ui.Parcels_Owned AS Stored_Parcels,
+        e.Votes_Cast, ui.Votes_Cast AS Stored_Votes,
+        e.Total_Weight, ui.Total_Weight AS Stored_Weight
+    FROM ({queries.INFLUENCE_FROM_SOURCE}) e
+    LEFT JOIN User_Influence ui ON ui.Wallet_Address = e.Wallet_Address
+    WHERE ui.Wallet_Address IS NULL
+       OR ui.Parcels_Owned <> e.Parcels_Owned
+       OR ui.Votes_Cast <> e.Votes_Cast
+       OR ui.Total_Weight <> e.Total_Weight
+    UNION ALL
+    SELECT
+        ui.Wallet_Address,
+        0, ui.Parcels_Owned,
+        0, ui.Votes_Cast,
+        0, ui.Total_Weight
+    FROM User_Influence ui
+    LEFT JOIN ({queries.INFLUENCE_FROM_SOURCE}) e ON e.Wallet_Address = ui.Wallet_Address
+    WHERE e.Wallet_Address IS NULL
+      AND (ui.Parcels_Owned <> 0 OR ui.Votes_Cast <> 0 OR ui.Total_Weight <> 0)
+"""
+
+
+def rebuild_influence_rows(cursor):
+    """Replace User_Influence with values recomputed from the source tables."""
+    cursor.execute("DELETE FROM User_Influence")
+    cursor.execute(
+        "INSERT INTO User_Influence (Wallet_Address, Parcels_Owned, Votes_Cast, Total_Weight) "
+        + queries.INFLUENCE_FROM_SOURCE
+    )
+    return cursor.rowcount
+
+
+def rebuild_influence(conn):
+    """Rebuild the leaderboard in one transaction; returns the row count."""
+    try:
+        with conn.cursor() as cursor:
+            count = rebuild_influence_rows(cursor)
+        conn.commit()
+        return count
+    except pymysql.Error:
+        conn.rollback()
+        raise
+
+
+def find_drift(conn):
+    """Return rows where User_Influence disagrees with the source tables."""
+    with conn.cursor() as cursor:
+        cursor.execute(DRIFT_QUERY)
+        return cursor.fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild or verify the User_Influence leaderboard.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    verify_cmd = sub.add_parser('verify', help="compare User_Influence with the source tables")
+    verify_cmd.add_argument('--repair', action='store_true', help="rebuild if any drift is found")
+    sub.add_parser('rebuild', help="recompute User_Influence from scratch")
+    args = parser.parse_args(argv)
+
+    authenticate_user()
+    conn = get_connection()
+    if not conn:
+        return 1
+    try:
+        if args.command == 'rebuild':
+            count = rebuild_influence(conn)
+            print(f"{Style.SUCCESS} Rebuilt User_Influence ({count} wallets).")
+            return 0
+
+        drift = find_drift(conn)
+        if not drift:
+            print(f"{Style.SUCCESS} User_Influence matches the source tables.")
+            return 0
+        print(f"{Style.WARNING} {len(drift)} wallet(s) drifted:")
+        for row in drift[:20]:
+            print(
+                f"  {Style.CYAN}{row['Wallet_Address']}{Style.RESET} "
+                f"parcels {row['Stored_Parcels']} -> {row['Parcels_Owned']}, "
+                f"votes {row['Stored_Votes']} -> {row['Votes_Cast']}, "
+                f"weight {row['Stored_Weight']} -> {row['Total_Weight']}"
+            )
+        if args.repair:
+            count = rebuild_influence(conn)
+            print(f"{Style.SUCCESS} Rebuilt User_Influence ({count} wallets).")
+            return 0
+        return 1
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Database error: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
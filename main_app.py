@@ -8,13 +8,26 @@ Handles users, digital assets, land parcels, businesses, events, and DAO governa
 """
 
 import pymysql
-from pymysql.cursors import DictCursor
+from pymysql.cursors import DictCursor, SSDictCursor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
 import os
+import random
 import re
+import secrets
+import sys
+import threading
+import time
 from getpass import getpass
 
+import instrument
+import queries
+from cache import QueryCache, TTLCache
+from db_pool import ConnectionPool
+from prefetch import PagePrefetcher
+from scheduling import EventSchedule, ScheduledEvent
+
 
 # ============================================================================
 # CYBERPUNK TERMINAL THEME - ANSI COLOR CODES
@@ -61,6 +74,20 @@ class Style:
 
 A_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
 
+# MySQL error codes handled explicitly
+ER_NO_SUCH_TABLE = 1146
+ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+# Asset transfers retry deadlocks/lock-wait timeouts with exponential backoff
+TRANSFER_RETRIES = 5
+TRANSFER_BACKOFF = 0.05
+
+# Event search: InnoDB does not index words shorter than innodb_ft_min_token_size
+FULLTEXT_MIN_WORD = 3
+SEARCH_RESULT_LIMIT = 50
+
 
 FIGLET_TITLE = """ ____                      _             _                 _ 
 |  _ \\  ___  ___ ___ _ __ | |_ _ __ __ _| | __ _ _ __   __| |
@@ -149,6 +176,84 @@ def compute_column_widths(columns, rows):
     return widths
 
 
+# ---------------------------------------------------------------------------
+# Fast table rendering: each cell is formatted and measured once, and a whole
+# page is emitted with a single write. ANSI colors are dropped when stdout is
+# not a terminal.
+# ---------------------------------------------------------------------------
+
+def visible_width(text):
+    """Printable length, skipping the regex for the common escape-free case."""
+    return visual_length(text) if '\x1b' in text else len(text)
+
+
+def format_cells(columns, rows):
+    """format_value() every cell once; returns a list of string lists."""
+    return [[format_value(row.get(col)) for col in columns] for row in rows]
+
+
+def measure_widths(columns, cells):
+    """Column widths (content + 2) for already formatted cells."""
+    widest = [len(str(col)) for col in columns]
+    for line in cells:
+        for i, text in enumerate(line):
+            width = visible_width(text)
+            if width > widest[i]:
+                widest[i] = width
+    return [width + 2 for width in widest]
+
+
+class TableLayout:
+    """Pre-rendered borders and cell separators for fixed columns and widths."""
+
+    def __init__(self, columns, widths, color=None):
+        if color is None:
+            color = sys.stdout.isatty()
+        cyan, gray, white, reset = (
+            (Style.CYAN, Style.GRAY, Style.WHITE, Style.RESET) if color else ('', '', '', '')
+        )
+        self.columns = list(columns)
+        self.widths = list(widths)
+        self._white = white
+        self._reset = reset
+        self._open = f"{cyan}{Style.BOX_V}{reset} "
+        self._join = f" {gray}{Style.BOX_V}{reset}"
+        self._close = f" {cyan}{Style.BOX_V}{reset}"
+        inner = sum(self.widths) + 2 * len(self.widths)
+        self._top = f"{cyan}{Style.BOX_TL}{Style.BOX_H * inner}{Style.BOX_TR}{reset}"
+        self._rule = f"{cyan}{Style.BOX_VR}{Style.BOX_H * inner}{Style.BOX_VL}{reset}"
+        self._bottom = f"{cyan}{Style.BOX_BL}{Style.BOX_H * inner}{Style.BOX_BR}{reset}"
+        bold_green = f"{Style.BOLD}{Style.GREEN}" if color else ''
+        self._header = self._line([str(col) for col in self.columns], bold_green)
+
+    def _line(self, texts, prefix):
+        reset = self._reset if prefix else ''
+        cells = []
+        for text, width in zip(texts, self.widths):
+            pad = width - visible_width(text)
+            cells.append(f"{prefix}{text}{reset}{' ' * pad}" if pad > 0 else f"{prefix}{text}{reset}")
+        return self._open + self._join.join(cells) + self._close
+
+    def header(self):
+        return f"{self._top}\n{self._header}\n{self._rule}\n"
+
+    def rows(self, cells):
+        """Body lines for formatted cells, as one string."""
+        if not cells:
+            return ''
+        return '\n'.join(self._line(line, self._white) for line in cells) + '\n'
+
+    def footer(self):
+        return self._bottom + '\n'
+
+
+def render_table(columns, rows, color=None):
+    """Render dict rows as one boxed table string."""
+    cells = format_cells(columns, rows)
+    layout = TableLayout(columns, measure_widths(columns, cells), color=color)
+    return layout.header() + layout.rows(cells) + layout.footer()
+
+
 def print_divider(width=78, char=None):
     """Prints a horizontal divider."""
     if char:
@@ -163,6 +268,45 @@ DB_CREDENTIALS = {
     'password': None
 }
 
+# Connection pool tuning (seconds); the pool itself is built lazily per login
+POOL_SETTINGS = {
+    'max_size': 8,
+    'checkout_timeout': 10.0,
+    'idle_timeout': 300.0,
+    'max_lifetime': 1800.0,
+    'ping_after': 2.0
+}
+
+# Streaming (server-side cursor) output: rows used to size columns, rows per fetch
+STREAM_SAMPLE_ROWS = 200
+STREAM_FETCH_SIZE = 500
+
+# Interactive paging: pages fetched in the background while one is on screen
+PREFETCH_PAGES = 2
+
+_POOL = None
+_POOL_KEY = None
+_POOL_LOCK = threading.Lock()
+
+# Dashboard counts are served from here until the TTL (seconds, adjustable via
+# SUMMARY_CACHE.ttl) lapses or a write to one of the counted tables invalidates them
+SUMMARY_CACHE = TTLCache(ttl=30.0)
+
+# Results of read operations 1-5, keyed on (query id, params); writes bump the
+# versions of the tables they touch through notify_tables_written()
+QUERY_CACHE = QueryCache(max_entries=256, ttl=60.0)
+
+# Callables invoked as listener(asset_id, new_owner) after transfer_asset()
+# commits, so in-process indexes (spatial.py) can follow ownership changes
+OWNERSHIP_LISTENERS = []
+
+# Interval index over events that have not ended, used to reject overlapping
+# slots (same scene parcel or same organizer) before anything is written
+EVENT_SCHEDULE = EventSchedule(
+    loader=lambda conn: load_scheduled_events(conn),
+    versions=lambda: QUERY_CACHE.versions(*queries.SCHEDULE_TABLES),
+)
+
 # ---------------------------------------------------------------------------
 # Helper Functions for Enhanced CLI
 # ---------------------------------------------------------------------------
@@ -189,28 +333,62 @@ def authenticate_user():
         else:
             print(f"{Style.WARNING} Both username and password are required.\n")
 
+def get_pool():
+    """Return the shared connection pool for the current credentials."""
+    global _POOL, _POOL_KEY
+    if DB_CREDENTIALS['user'] is None:
+        return None
+    key = (DB_CREDENTIALS['user'], DB_CREDENTIALS['password'])
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_KEY != key:
+            if _POOL is not None:
+                _POOL.close()
+            config = dict(connection_settings(), cursorclass=DictCursor, autocommit=False)
+            # Every pooled connection records its statements in instrument.STATS
+            _POOL = ConnectionPool(config, connect=instrument.connect, **POOL_SETTINGS)
+            _POOL_KEY = key
+        return _POOL
+
+def connection_settings():
+    """Server, database and login shared by the sync pool and the async layer."""
+    return {
+        'host': 'localhost',
+        'user': DB_CREDENTIALS['user'],
+        'password': DB_CREDENTIALS['password'],
+        'database': 'decentraland_db',
+        'charset': 'utf8mb4'
+    }
+
+def close_pool():
+    """Close the shared pool (idle connections are dropped immediately)."""
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+        _POOL = None
+        _POOL_KEY = None
+
 def get_connection():
-    """Establishes and returns a database connection using stored credentials."""
+    """Borrow a pooled database connection; close() returns it to the pool."""
     try:
-        if DB_CREDENTIALS['user'] is None:
+        pool = get_pool()
+        if pool is None:
             return None
-        config = {
-            'host': 'localhost',
-            'user': DB_CREDENTIALS['user'],
-            'password': DB_CREDENTIALS['password'],
-            'database': 'decentraland_db',
-            'charset': 'utf8mb4',
-            'cursorclass': DictCursor
-        }
-        conn = pymysql.connect(**config)
-        conn.autocommit = False
-        return conn
+        return pool.acquire()
     except pymysql.Error as e:
         print(f"\n{Style.ERROR} Database connection failed: {e}")
         return None
 
-def paginate_query(query, params=None, page_size=20):
-    """Yield results page by page for large result sets."""
+def paginate_query(query, params=None, page_size=20, keys=None, where=None):
+    """Yield results page by page for large result sets.
+
+    Without `keys` this pages with LIMIT/OFFSET. With `keys` (see KeysetPager)
+    each page seeks past the last key of the previous one instead, so later
+    pages cost the same as the first.
+    """
+    if keys:
+        yield from KeysetPager(query, keys, params=params, page_size=page_size, where=where)
+        return
     conn = get_connection()
     if not conn:
         return
@@ -228,67 +406,303 @@ def paginate_query(query, params=None, page_size=20):
     finally:
         conn.close()
 
+
+class KeysetPager:
+    """Seek (keyset) pager over a SELECT ordered by a unique key.
+
+    `keys` is a list of (sql_expression, result_column, 'ASC'|'DESC') tuples that
+    together must be unique and NOT NULL, e.g.
+    [('Join_Date', 'Join_Date', 'DESC'), ('Wallet_Address', 'Wallet_Address', 'DESC')].
+    The pager builds the WHERE/ORDER BY/LIMIT itself, so `select_sql` must not
+    contain them; pass an extra filter through `where`/`params` instead.
+    Each page borrows a connection from `connect` (default: the shared pool).
+    """
+
+    def __init__(self, select_sql, keys, params=None, page_size=20, where=None, connect=None):
+        self.select_sql = select_sql.strip()
+        self.connect = connect or get_connection
+        self.keys = [(expr, column, direction.upper()) for expr, column, direction in keys]
+        self.params = tuple(params or ())
+        self.page_size = page_size
+        self.where = where
+        self.page_num = 0
+        self.first_key = None
+        self.last_key = None
+
+    def _key_of(self, row):
+        return tuple(row[column] for _, column, _ in self.keys)
+
+    def _seek_clause(self, key, backward):
+        """Expand (k1, k2, ...) > (v1, v2, ...) honouring each key's direction."""
+        disjuncts = []
+        params = []
+        for i, (expr, _, direction) in enumerate(self.keys):
+            ascending = (direction == 'ASC') != backward
+            terms = [f"{prev_expr} = %s" for prev_expr, _, _ in self.keys[:i]]
+            terms.append(f"{expr} {'>' if ascending else '<'} %s")
+            disjuncts.append("(" + " AND ".join(terms) + ")")
+            params.extend(key[:i + 1])
+        return "(" + " OR ".join(disjuncts) + ")", params
+
+    def page_sql(self, key=None, backward=False):
+        """Return (sql, params) for the page after (or before) `key`."""
+        conditions = []
+        params = list(self.params)
+        if self.where:
+            conditions.append(f"({self.where})")
+        if key is not None:
+            clause, seek_params = self._seek_clause(key, backward)
+            conditions.append(clause)
+            params.extend(seek_params)
+        order = ", ".join(
+            f"{expr} {('ASC' if direction == 'DESC' else 'DESC') if backward else direction}"
+            for expr, _, direction in self.keys
+        )
+        sql = self.select_sql
+        if conditions:
+            sql += "\nWHERE " + " AND ".join(conditions)
+        sql += f"\nORDER BY {order}\nLIMIT {int(self.page_size)}"
+        return sql, params
+
+    def _fetch(self, key, backward):
+        conn = self.connect()
+        if not conn:
+            return []
+        try:
+            with conn.cursor() as cursor:
+                sql, params = self.page_sql(key, backward)
+                cursor.execute(sql, params)
+                rows = list(cursor.fetchall())
+        finally:
+            conn.close()
+        if backward:
+            rows.reverse()
+        return rows
+
+    def _land(self, rows, page_num):
+        if rows:
+            self.first_key = self._key_of(rows[0])
+            self.last_key = self._key_of(rows[-1])
+            self.page_num = page_num
+        return rows
+
+    def first_page(self):
+        """Fetch page 1."""
+        return self._land(self._fetch(None, backward=False), 1)
+
+    def next_page(self):
+        """Fetch the page after the current one ([] when past the end)."""
+        if self.page_num == 0:
+            return self.first_page()
+        return self._land(self._fetch(self.last_key, backward=False), self.page_num + 1)
+
+    def prev_page(self):
+        """Fetch the page before the current one ([] when already on page 1)."""
+        if self.page_num <= 1:
+            return []
+        rows = self._fetch(self.first_key, backward=True)
+        return self._land(rows, self.page_num - 1)
+
+    def pages_from(self, key):
+        """Yield the pages after `key` without moving the pager (for prefetching)."""
+        while True:
+            rows = self._fetch(key, backward=False)
+            if not rows:
+                return
+            yield rows
+            key = self._key_of(rows[-1])
+
+    def advance(self, rows):
+        """Make `rows`, fetched by pages_from(), the current page."""
+        return self._land(rows, self.page_num + 1)
+
+    def __iter__(self):
+        rows = self.first_page()
+        while rows:
+            yield rows
+            rows = self.next_page()
+
+
+def print_result_page(rows, title, page_num):
+    """Render one page of dict rows as a table."""
+    print_box(f"{title} - Page {page_num}")
+    if rows:
+        sys.stdout.write(render_table(list(rows[0].keys()), rows))
+        sys.stdout.flush()
+    else:
+        print(f"{Style.WARNING} No data to display.")
+
 def display_paginated_results(rows_generator, title="Results"):
     """Display paginated query results with navigation prompts."""
+    if isinstance(rows_generator, KeysetPager):
+        display_keyset_results(rows_generator, title)
+        return
     page_num = 1
-    for rows in rows_generator:
-        print_box(f"{title} - Page {page_num}")
-        if rows:
-            columns = list(rows[0].keys())
-            widths = compute_column_widths(columns, rows)
-            inner_width = print_table_header(columns, widths)
-            for row in rows:
-                values = [f"{Style.WHITE}{format_value(row[col])}{Style.RESET}" for col in columns]
-                print(build_table_row(values, widths))
-            print_table_footer(inner_width)
+    # Later pages are fetched on a worker thread while this one is read
+    with PagePrefetcher(rows_generator, depth=PREFETCH_PAGES) as pages:
+        try:
+            for rows in pages:
+                print_result_page(rows, title, page_num)
+                input(f"{Style.CYAN}>{Style.RESET} Press Enter for next page (or Ctrl+C to stop)...")
+                page_num += 1
+        except KeyboardInterrupt:
+            print(f"\n{Style.WARNING} Paging cancelled.")
+
+def display_keyset_results(pager, title="Results"):
+    """Interactive forward/backward navigation over a KeysetPager."""
+    rows = pager.first_page()
+    if not rows:
+        print_result_page(rows, title, 1)
+        return
+    ahead = PagePrefetcher(pager.pages_from(pager.last_key), depth=PREFETCH_PAGES)
+    try:
+        while True:
+            print_result_page(rows, title, pager.page_num)
+            choice = input(
+                f"{Style.CYAN}>{Style.RESET} Enter = next page, p = previous page, q = back to menu: "
+            ).strip().lower()
+            if choice == 'q':
+                return
+            if choice == 'p':
+                if pager.page_num <= 1:
+                    print(f"{Style.INFO} Already on the first page.")
+                    continue
+                # Pages buffered after this one no longer follow it; restart from the new page
+                ahead.cancel()
+                rows = pager.prev_page()
+                ahead = PagePrefetcher(pager.pages_from(pager.last_key), depth=PREFETCH_PAGES)
+                continue
+            next_rows = ahead.next_page()
+            if not next_rows:
+                print(f"{Style.INFO} End of results.")
+                return
+            rows = pager.advance(next_rows)
+    except KeyboardInterrupt:
+        print(f"\n{Style.WARNING} Paging cancelled.")
+    finally:
+        ahead.cancel()
+
+def truncate_cell(text, width):
+    """Clip plain text to fit a fixed column width."""
+    limit = width - 2
+    if len(text) <= limit:
+        return text
+    return text[:max(limit - 1, 0)] + '…'
+
+def stream_rows(cursor, sample_size=None, fetch_size=None):
+    """Print rows from an executed server-side cursor with constant memory.
+
+    Column widths come from the first `sample_size` rows only; later values that
+    do not fit are clipped. Returns the number of rows printed.
+    """
+    sample_size = sample_size or STREAM_SAMPLE_ROWS
+    fetch_size = fetch_size or STREAM_FETCH_SIZE
+    sample = cursor.fetchmany(sample_size)
+    if not sample:
+        return 0
+    columns = list(sample[0].keys())
+    cells = format_cells(columns, sample)
+    layout = TableLayout(columns, measure_widths(columns, cells))
+    out = sys.stdout
+    out.write(layout.header() + layout.rows(cells))
+    count = len(sample)
+    rows = cursor.fetchmany(fetch_size)
+    while rows:
+        # One write per fetched batch; cells wider than the sampled widths are clipped
+        cells = [
+            [truncate_cell(text, width) for text, width in zip(line, layout.widths)]
+            for line in format_cells(columns, rows)
+        ]
+        out.write(layout.rows(cells))
+        count += len(rows)
+        rows = cursor.fetchmany(fetch_size)
+    out.write(layout.footer())
+    out.flush()
+    return count
+
+def stream_query(query, params=None, title=None):
+    """Run a SELECT on an unbuffered SSDictCursor and print it incrementally."""
+    conn = get_connection()
+    if not conn:
+        return
+    if title:
+        print_box(title)
+    # Not a `with` block: closing an unbuffered cursor drains every remaining row.
+    cursor = conn.cursor(SSDictCursor)
+    try:
+        cursor.execute(query, params or ())
+        count = stream_rows(cursor)
+        cursor.close()
+        if count == 0:
+            print(f"\n{Style.WARNING} Query returned no results.")
         else:
-            print(f"{Style.WARNING} No data to display.")
-        input(f"{Style.CYAN}>{Style.RESET} Press Enter for next page (or Ctrl+C to stop)...")
-        page_num += 1
+            print(f"\n{Style.SUCCESS} Streamed {Style.GREEN}{Style.BOLD}{count}{Style.RESET} row(s).")
+    except KeyboardInterrupt:
+        # Abandon the half-read result set; the pool drops this connection.
+        conn.invalidate()
+        print(f"\n{Style.WARNING} Fetch cancelled.")
+    except pymysql.Error as e:
+        conn.invalidate()
+        print(f"{Style.ERROR} Query failed: {e}")
+    finally:
+        conn.close()
 
 def view_all_users():
     """Display a list of all user profiles."""
-    query = "SELECT Wallet_Address, Username, Join_Date, Last_Seen FROM User_Profile ORDER BY Join_Date DESC"
-    rows_gen = paginate_query(query)
-    display_paginated_results(rows_gen, title="All Users")
+    pager = KeysetPager(queries.ALL_USERS_SELECT, keys=queries.ALL_USERS_KEYS)
+    display_paginated_results(pager, title="All Users")
 
 def view_all_assets():
     """Display a list of all digital assets (land and wearables)."""
-    query = """
-        SELECT da.Asset_ID, da.Token_URI, da.Owner_Address, 
-               CASE WHEN lp.Asset_ID IS NOT NULL THEN 'Land' ELSE 'Wearable' END AS Asset_Type,
-               lp.X_Coordinate, lp.Y_Coordinate, w.Category, w.Rarity
-        FROM Digital_Asset da
-        LEFT JOIN LAND_Parcel lp ON da.Asset_ID = lp.Asset_ID
-        LEFT JOIN Wearable w ON da.Asset_ID = w.Asset_ID
-        ORDER BY da.Asset_ID
-    """
-    rows_gen = paginate_query(query)
-    display_paginated_results(rows_gen, title="All Digital Assets")
-
-def view_summary_stats():
-    """Show high‑level statistics about the mini‑world."""
+    pager = KeysetPager(queries.ALL_ASSETS_SELECT, keys=queries.ALL_ASSETS_KEYS)
+    display_paginated_results(pager, title="All Digital Assets")
+
+def notify_tables_written(*tables):
+    """Invalidate cached reads that depend on `tables` (all caches if none given)."""
+    if not tables or set(tables) & set(queries.SUMMARY_TABLES):
+        SUMMARY_CACHE.invalidate()
+    QUERY_CACHE.bump(*tables)
+
+def fetch_summary_stats():
+    """Return (counts, from_cache); a cache miss costs a single round trip."""
+    counts = SUMMARY_CACHE.get('summary')
+    if counts is not None:
+        return counts, True
     conn = get_connection()
     if not conn:
-        return
+        return None, False
     try:
         with conn.cursor() as cursor:
-            cursor.execute("SELECT COUNT(*) AS total_users FROM User_Profile")
-            users = cursor.fetchone()['total_users']
-            cursor.execute("SELECT COUNT(*) AS total_assets FROM Digital_Asset")
-            assets = cursor.fetchone()['total_assets']
-            cursor.execute("SELECT COUNT(*) AS total_businesses FROM Business")
-            businesses = cursor.fetchone()['total_businesses']
-            cursor.execute("SELECT COUNT(*) AS total_events FROM Event")
-            events = cursor.fetchone()['total_events']
-        print_box("MINI-WORLD SUMMARY")
-        print(f"{Style.GREEN}Users:{Style.RESET} {users}")
-        print(f"{Style.CYAN}Assets:{Style.RESET} {assets}")
-        print(f"{Style.MAGENTA}Businesses:{Style.RESET} {businesses}")
-        print(f"{Style.YELLOW}Events:{Style.RESET} {events}")
-        input(f"\n{Style.CYAN}>{Style.RESET} Press Enter to return to menu...")
+            cursor.execute(queries.SUMMARY_STATS)
+            counts = cursor.fetchone()
     finally:
         conn.close()
+    SUMMARY_CACHE.put('summary', counts)
+    return counts, False
+
+def view_summary_stats():
+    """Show high‑level statistics about the mini‑world."""
+    try:
+        counts, cached = fetch_summary_stats()
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Database error: {e}")
+        return
+    if counts is None:
+        return
+    print_box("MINI-WORLD SUMMARY")
+    print(f"{Style.GREEN}Users:{Style.RESET} {counts['total_users']}")
+    print(f"{Style.CYAN}Assets:{Style.RESET} {counts['total_assets']}")
+    print(f"{Style.MAGENTA}Businesses:{Style.RESET} {counts['total_businesses']}")
+    print(f"{Style.YELLOW}Events:{Style.RESET} {counts['total_events']}")
+    if cached:
+        age = SUMMARY_CACHE.age('summary') or 0
+        print(f"{Style.GRAY}(cached {age:.0f}s ago){Style.RESET}")
+    stats = QUERY_CACHE.stats()
+    print(
+        f"{Style.GRAY}Query cache: {stats['hits']} hit(s), {stats['misses']} miss(es) "
+        f"({stats['hit_rate']:.0%}), {stats['entries']}/{stats['max_entries']} entries{Style.RESET}"
+    )
+    input(f"\n{Style.CYAN}>{Style.RESET} Press Enter to return to menu...")
 
 # ---------------------------------------------------------------------------
 # Existing Functions (unchanged) – kept for reference
@@ -329,51 +743,470 @@ def format_value(value):
         return str(value)
 
 
+def plain_value(value):
+    """Machine-readable scalar: Decimals keep every digit, dates become ISO 8601."""
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+# ============================================================================
+# DATA OPERATIONS (no prompts or printing; shared by the menu and the CLI)
+# ============================================================================
+
+class InvalidRequest(Exception):
+    """An operation's input failed validation; the message says why."""
+
+
+@contextmanager
+def borrowed_connection(conn=None):
+    """Yield `conn` unchanged, or a pooled connection returned after the block."""
+    if conn is not None:
+        yield conn
+        return
+    pool = get_pool()
+    if pool is None:
+        raise pymysql.err.OperationalError(2003, "No database credentials configured")
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def cached_read(query_id, params, loader):
+    """Serve a read operation from QUERY_CACHE; callers must not mutate the result."""
+    value, _ = QUERY_CACHE.get_or_load(query_id, params, queries.READ_TABLES[query_id], loader)
+    return value
+
+
+# ============================================================================
+# READ OPERATIONS (shared by the fetch_* functions and async_db)
+# ============================================================================
+
+class ReadOp:
+    """One validated read: which statements to run, in what order, and how to shape the result.
+
+    `attempts` are (label, sql, params, fallback_codes) tried in order; an
+    error whose code is in fallback_codes (a table or index that has not been
+    migrated yet) moves on to the next attempt. finish(result, label) shapes
+    the rows of the attempt that ran. The result is cached in QUERY_CACHE
+    under `query_id` and `cache_params`, unless query_id is None.
+    """
+
+    def __init__(self, query_id, cache_params, attempts, one=False, finish=None):
+        self.query_id = query_id
+        self.cache_params = tuple(cache_params)
+        self.attempts = attempts
+        self.one = one
+        self.finish = finish or (lambda result, label: result)
+
+    def falls_back(self, error, index):
+        """True if `error` from attempt `index` should move on to the next attempt."""
+        return index < len(self.attempts) - 1 and error.args[0] in self.attempts[index][3]
+
+
+def run_read(op, conn=None):
+    """Run a ReadOp on `conn` (or a pooled connection) through QUERY_CACHE."""
+    def load():
+        with borrowed_connection(conn) as c, c.cursor() as cursor:
+            for index, (label, sql, params, _) in enumerate(op.attempts):
+                try:
+                    cursor.execute(sql, params)
+                except pymysql.Error as e:
+                    if op.falls_back(e, index):
+                        continue
+                    raise
+                return op.finish(cursor.fetchone() if op.one else cursor.fetchall(), label)
+    if op.query_id is None:
+        return load()
+    return cached_read(op.query_id, op.cache_params, load)
+
+
+def dao_proposals_op(wallet):
+    if not wallet:
+        raise InvalidRequest("Wallet address cannot be empty.")
+    return ReadOp('dao_proposals', (wallet,), [('rows', queries.DAO_PROPOSALS_BY_USER, (wallet,), ())])
+
+
+def businesses_after_op(date_str):
+    try:
+        datetime.strptime(date_str, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise InvalidRequest("Invalid date format. Use YYYY-MM-DD.")
+    return ReadOp('businesses_after', (date_str,), [('rows', queries.BUSINESSES_AFTER_DATE, (date_str,), ())])
+
+
+def event_search_op(keyword):
+    """Keyword search returning (rows, mode), preferring the full-text index.
+
+    Falls back to the LIKE '%keyword%' scan when the keyword has no indexable
+    word or the FULLTEXT indexes have not been created yet.
+    """
+    if not keyword:
+        raise InvalidRequest("Keyword cannot be empty.")
+    attempts = []
+    ft_query = fulltext_query(keyword)
+    if ft_query:
+        attempts.append(('fulltext', queries.SEARCH_EVENTS_FULLTEXT, (ft_query,) * 4 + (SEARCH_RESULT_LIMIT,),
+                         (ER_FT_MATCHING_KEY_NOT_FOUND,)))
+    attempts.append(('like', queries.SEARCH_EVENTS_LIKE, (f"%{keyword}%",), ()))
+    return ReadOp('search_events', (keyword,), attempts, finish=lambda rows, mode: (rows, mode))
+
+
+def voter_influence_op():
+    return ReadOp('voter_influence', (), [
+        ('leaderboard', queries.INFLUENCE_LEADERBOARD, (), (ER_NO_SUCH_TABLE,)),
+        # User_Influence not migrated yet: aggregate from source tables
+        ('aggregate', queries.VOTER_INFLUENCE, (), ()),
+    ])
+
+
+def upcoming_events_op():
+    # Not cached: the reschedule prompt must see the current slots
+    return ReadOp(None, (), [('rows', queries.UPCOMING_EVENTS, (), ())])
+
+
+def land_sales_window(period_start):
+    """Params for the rollup land-sales queries: whole days after the start day
+    come from Land_Sales_Daily, the partial start day from raw rows."""
+    first_day = period_start.date()
+    return first_day, period_start, first_day + timedelta(days=1)
+
+
+def land_sales_period(days):
+    """(period_start, period_end) for the last `days` days, in whole minutes so
+    repeated calls within a minute share one cache entry."""
+    period_end = datetime.now().replace(second=0, microsecond=0)
+    return period_end - timedelta(days=days), period_end
+
+
+def _land_sales_attempts(rollup_sql, raw_sql, period_start):
+    return [
+        ('rollup', rollup_sql, land_sales_window(period_start), (ER_NO_SUCH_TABLE,)),
+        # Land_Sales_Daily not migrated yet: aggregate the raw rows
+        ('raw', raw_sql, (period_start,), ()),
+    ]
+
+
+def land_sales_op(days):
+    if days <= 0:
+        raise InvalidRequest("Number of days must be positive.")
+    period_start, period_end = land_sales_period(days)
+
+    def finish(row, label):
+        return dict(row, period_start=period_start, period_end=period_end)
+    return ReadOp('land_sales', (period_start,),
+                  _land_sales_attempts(queries.LAND_SALES_ROLLUP, queries.LAND_SALES_SINCE, period_start),
+                  one=True, finish=finish)
+
+
+def land_sales_by_district_op(days):
+    if days <= 0:
+        raise InvalidRequest("Number of days must be positive.")
+    period_start, _ = land_sales_period(days)
+    return ReadOp('land_sales_by_district', (period_start,),
+                  _land_sales_attempts(queries.LAND_SALES_BY_DISTRICT_ROLLUP, queries.LAND_SALES_BY_DISTRICT_SINCE,
+                                       period_start))
+
+
+def fetch_dao_proposals(wallet, conn=None):
+    """DAO proposals created by `wallet`, newest first."""
+    return run_read(dao_proposals_op(wallet), conn)
+
+
+def fetch_businesses_after(date_str, conn=None):
+    """Businesses established after `date_str` (YYYY-MM-DD)."""
+    return run_read(businesses_after_op(date_str), conn)
+
+
+def fetch_land_sales(days=90, conn=None):
+    """MANA land-sale totals over the last `days` days, with the period bounds."""
+    return run_read(land_sales_op(days), conn)
+
+
+def fetch_land_sales_by_district(days=90, conn=None):
+    """MANA land-sale totals per district over the last `days` days, largest first."""
+    return run_read(land_sales_by_district_op(days), conn)
+
+
+def fetch_event_search(keyword, conn=None):
+    """Return (rows, mode) for an event keyword search (see event_search_op)."""
+    return run_read(event_search_op(keyword), conn)
+
+
+def fetch_voter_influence(conn=None):
+    """Top voters by influence score."""
+    return run_read(voter_influence_op(), conn)
+
+
+def fetch_owned_parcels(owner_address, conn=None):
+    """Land parcels a business owner could register on; raises if there are none."""
+    with borrowed_connection(conn) as conn, conn.cursor() as cursor:
+        cursor.execute(queries.USER_EXISTS, (owner_address,))
+        if not cursor.fetchone():
+            raise InvalidRequest(f"User with wallet {owner_address} does not exist.")
+        cursor.execute(queries.PARCELS_OWNED_BY, (owner_address,))
+        parcels = cursor.fetchall()
+    if not parcels:
+        raise InvalidRequest("User must own at least one land parcel to register a business.")
+    return parcels
+
+
+def register_business(business_name, business_type, owner_address, parcel_id=None, conn=None):
+    """Register a business on one of the owner's parcels (the first if none is given)."""
+    if not all([business_name, business_type, owner_address]):
+        raise InvalidRequest("All fields are required.")
+    with borrowed_connection(conn) as conn:
+        parcels = fetch_owned_parcels(owner_address, conn=conn)
+        owned = [parcel['Asset_ID'] for parcel in parcels]
+        parcel_id = parcel_id or owned[0]
+        if parcel_id not in owned:
+            raise InvalidRequest(f"Parcel {parcel_id} is not owned by {owner_address}.")
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(queries.INSERT_BUSINESS, (business_name, business_type, owner_address, parcel_id))
+                business_id = cursor.lastrowid
+            conn.commit()
+        except pymysql.Error:
+            conn.rollback()
+            raise
+    notify_tables_written('Business')
+    return {
+        'Business_ID': business_id,
+        'Business_Name': business_name,
+        'Business_Type': business_type,
+        'Owner_Address': owner_address,
+        'Parcel_ID': parcel_id,
+    }
+
+
+def fetch_upcoming_events(conn=None):
+    """Events that have not started yet and can be rescheduled."""
+    return run_read(upcoming_events_op(), conn)
+
+
+class ScheduleConflict(InvalidRequest):
+    """The new slot overlaps events on the same parcel or by the same organizer."""
+
+    def __init__(self, message, conflicts):
+        super().__init__(message)
+        self.conflicts = conflicts
+
+
+def _scheduled_event(row):
+    return ScheduledEvent(
+        row['Event_ID'], row['Start_Timestamp'], row['End_Timestamp'],
+        row['Scene_Parcel_ID'], row['Organizer_Address'], row['District_Name']
+    )
+
+
+def load_scheduled_events(conn=None):
+    """Every event that has not ended, as ScheduledEvent records for EVENT_SCHEDULE."""
+    with borrowed_connection(conn) as conn, conn.cursor() as cursor:
+        cursor.execute(queries.SCHEDULED_EVENTS)
+        return [_scheduled_event(row) for row in cursor.fetchall()]
+
+
+def _raise_conflicts(conflicts):
+    examples = "; ".join(
+        f"event {row['Event_ID']} overlaps event {row['Conflicts_With']} (same {row['Scope']})"
+        for row in conflicts[:3]
+    )
+    more = f"; {len(conflicts) - 3} more" if len(conflicts) > 3 else ""
+    raise ScheduleConflict(f"Schedule conflict: {examples}{more}.", conflicts)
+
+
+def _conflict_key(row):
+    return row['Event_ID'], row['Scope'], row['Conflicts_With'], row['Other_Start'], row['Other_End']
+
+
+def _check_conflicts(conflicts, allow_conflicts):
+    """Raise ScheduleConflict unless every conflict is allowed.
+
+    `allow_conflicts` is True to allow any overlap, or the conflict rows a user
+    confirmed, so an overlap that appeared after the confirmation still raises.
+    """
+    if allow_conflicts is True:
+        return
+    allowed = {_conflict_key(row) for row in allow_conflicts or ()}
+    if any(_conflict_key(row) not in allowed for row in conflicts):
+        _raise_conflicts(conflicts)
+
+
+def update_event_schedule(event_id, new_start, new_end, conn=None, allow_conflicts=False):
+    """Move an event to [new_start, new_end); both must be in the future.
+
+    Raises ScheduleConflict if the new slot overlaps another event on the same
+    scene parcel or by the same organizer, unless `allow_conflicts` covers the
+    overlaps (see _check_conflicts).
+    """
+    if new_end <= new_start:
+        raise InvalidRequest("End time must be after start time.")
+    if new_start <= datetime.now():
+        raise InvalidRequest("Start time must be in the future.")
+    with borrowed_connection(conn) as conn, EVENT_SCHEDULE.locked(conn) as schedule:
+        if event_id not in schedule:
+            # Already over, so not indexed; it can still be moved into the future
+            with conn.cursor() as cursor:
+                cursor.execute(queries.EVENT_SLOT, (event_id,))
+                row = cursor.fetchone()
+            if not row:
+                raise InvalidRequest(f"Event {event_id} does not exist.")
+            schedule.add(_scheduled_event(row))
+        moves = {event_id: (new_start, new_end)}
+        conflicts = schedule.conflicts(moves)
+        _check_conflicts(conflicts, allow_conflicts)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(queries.UPDATE_EVENT_TIMES, (new_start, new_end, event_id))
+                updated = cursor.rowcount
+            if not updated:
+                raise InvalidRequest(f"Event {event_id} was not rescheduled (unknown ID or unchanged times).")
+            conn.commit()
+        except (pymysql.Error, InvalidRequest):
+            conn.rollback()
+            raise
+        notify_tables_written('Event')
+        schedule.apply(moves)
+    return {'Event_ID': event_id, 'Start_Timestamp': new_start, 'End_Timestamp': new_end}
+
+
+def shift_district_events(district, delta, conn=None, allow_conflicts=False, dry_run=False):
+    """Move every upcoming event in `district` by `delta` with one UPDATE.
+
+    All new slots are validated first (still in the future, no overlaps beyond
+    `allow_conflicts`); nothing is written if any check fails, or with `dry_run`.
+    Returns a summary row.
+    """
+    if not district:
+        raise InvalidRequest("District name cannot be empty.")
+    seconds = int(delta.total_seconds())
+    if not seconds:
+        raise InvalidRequest("The shift must be at least one second.")
+    delta = timedelta(seconds=seconds)
+    now = datetime.now().replace(microsecond=0)
+    with borrowed_connection(conn) as conn, EVENT_SCHEDULE.locked(conn) as schedule:
+        moves = {
+            event_id: (start + delta, end + delta)
+            for event_id, (start, end) in schedule.district_slots(district, after=now).items()
+        }
+        if not moves:
+            raise InvalidRequest(f"No upcoming events in district '{district}'.")
+        too_early = sum(1 for start, _ in moves.values() if start <= now)
+        if too_early:
+            raise InvalidRequest(f"{too_early} event(s) would start in the past; nothing was moved.")
+        conflicts = schedule.conflicts(moves)
+        _check_conflicts(conflicts, allow_conflicts)
+        summary = {
+            'District_Name': district,
+            'Events': len(moves),
+            'Shift_Seconds': seconds,
+            'Conflicts': len(conflicts),
+            'Applied': not dry_run,
+        }
+        if dry_run:
+            return summary
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(queries.SHIFT_DISTRICT_EVENTS, (seconds, seconds, district, now))
+                if cursor.rowcount != len(moves):
+                    schedule.invalidate()
+                    raise InvalidRequest(
+                        f"Events in '{district}' changed during validation ({cursor.rowcount} matched, "
+                        f"{len(moves)} checked); nothing was moved. Try again."
+                    )
+            conn.commit()
+        except (pymysql.Error, InvalidRequest):
+            conn.rollback()
+            raise
+        notify_tables_written('Event')
+        schedule.apply(moves)
+    return summary
+
+
+def execute_if_table_exists(cursor, statement, params=None):
+    """Run `statement`; returns its row count, or 0 if its table has not been created yet."""
+    try:
+        cursor.execute(statement, params)
+    except pymysql.err.ProgrammingError as e:
+        if e.args[0] != ER_NO_SUCH_TABLE:
+            raise
+        return 0
+    return cursor.rowcount
+
+
+def delete_wallet(wallet, conn=None):
+    """Delete a user and clear their references; returns (username, affected counts)."""
+    if not wallet:
+        raise InvalidRequest("Wallet address cannot be empty.")
+    with borrowed_connection(conn) as conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(queries.USERNAME_OF, (wallet,))
+                user = cursor.fetchone()
+                if not user:
+                    raise InvalidRequest(f"User {wallet} does not exist.")
+                affected = {}
+                for label, statement in queries.DELETE_USER_STEPS:
+                    cursor.execute(statement, (wallet,))
+                    affected[label] = cursor.rowcount
+                for label, statement in queries.ARCHIVE_DELETE_USER_STEPS:
+                    affected[label] = execute_if_table_exists(cursor, statement, (wallet,))
+            conn.commit()
+        except (pymysql.Error, InvalidRequest):
+            conn.rollback()
+            raise
+    notify_tables_written(*queries.DELETE_USER_TABLES)
+    return user['Username'], affected
+
+
+def execute_statement(query, conn=None):
+    """Run and commit one non-SELECT statement; returns the affected row count."""
+    with borrowed_connection(conn) as conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query)
+                count = cursor.rowcount
+            conn.commit()
+        except pymysql.Error:
+            conn.rollback()
+            raise
+    # Arbitrary SQL: we cannot tell which tables changed
+    notify_tables_written()
+    return count
+
+
 def view_dao_proposals_by_user():
     """READ Operation 1: List all DAO proposals created by a specific user."""
     print_box("VIEW DAO PROPOSALS BY USER")
     
     wallet = input(f"{Style.CYAN}>{Style.RESET} Enter creator wallet address: ").strip()
     
-    if not wallet:
-        print(f"{Style.ERROR} Wallet address cannot be empty.")
-        return
-    
-    conn = get_connection()
-    if not conn:
-        return
-    
     try:
-        with conn.cursor() as cursor:
-            query = """
-                SELECT 
-                    Proposal_ID,
-                    Title,
-                    Status,
-                    Creator_Address
-                FROM DAO_Proposal
-                WHERE Creator_Address = %s
-                ORDER BY Proposal_ID DESC
-            """
-            cursor.execute(query, (wallet,))
-            results = cursor.fetchall()
-            
-            if not results:
-                print(f"\n{Style.WARNING} No proposals found for wallet: {Style.YELLOW}{wallet}{Style.RESET}")
-            else:
-                print(f"\n{Style.SUCCESS} Found {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} proposal(s):\n")
-                for idx, row in enumerate(results, 1):
-                    print(f"{Style.CYAN}{Style.BOX_V}{Style.RESET} {Style.MAGENTA}Proposal #{idx}{Style.RESET}")
-                    print(f"  {Style.GRAY}ID:{Style.RESET} {Style.WHITE}{row['Proposal_ID']}{Style.RESET}")
-                    print(f"  {Style.GRAY}Title:{Style.RESET} {Style.WHITE}{row['Title']}{Style.RESET}")
-                    print(f"  {Style.GRAY}Status:{Style.RESET} {Style.GREEN}{row['Status']}{Style.RESET}")
-                    print(f"  {Style.GRAY}Creator:{Style.RESET} {Style.CYAN}{row['Creator_Address']}{Style.RESET}")
-                    print()
-    
+        results = fetch_dao_proposals(wallet)
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return
     except pymysql.Error as e:
         print(f"{Style.ERROR} Database error: {e}")
-    finally:
-        conn.close()
+        return
+    
+    if not results:
+        print(f"\n{Style.WARNING} No proposals found for wallet: {Style.YELLOW}{wallet}{Style.RESET}")
+    else:
+        print(f"\n{Style.SUCCESS} Found {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} proposal(s):\n")
+        for idx, row in enumerate(results, 1):
+            print(f"{Style.CYAN}{Style.BOX_V}{Style.RESET} {Style.MAGENTA}Proposal #{idx}{Style.RESET}")
+            print(f"  {Style.GRAY}ID:{Style.RESET} {Style.WHITE}{row['Proposal_ID']}{Style.RESET}")
+            print(f"  {Style.GRAY}Title:{Style.RESET} {Style.WHITE}{row['Title']}{Style.RESET}")
+            print(f"  {Style.GRAY}Status:{Style.RESET} {Style.GREEN}{row['Status']}{Style.RESET}")
+            print(f"  {Style.GRAY}Creator:{Style.RESET} {Style.CYAN}{row['Creator_Address']}{Style.RESET}")
+            print()
 
 
 def list_businesses_after_date():
@@ -383,103 +1216,64 @@ def list_businesses_after_date():
     date_str = input(f"{Style.CYAN}>{Style.RESET} Enter date (YYYY-MM-DD): ").strip()
     
     try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-    except ValueError:
-        print(f"{Style.ERROR} Invalid date format. Use YYYY-MM-DD.")
+        results = fetch_businesses_after(date_str)
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
         return
-    
-    conn = get_connection()
-    if not conn:
-        return
-    
-    try:
-        with conn.cursor() as cursor:
-            query = """
-                SELECT 
-                    b.Business_ID,
-                    b.Business_Name,
-                    b.Business_Type,
-                    b.Date_Established,
-                    b.Owner_Address,
-                    u.Username
-                FROM Business b
-                LEFT JOIN User_Profile u ON b.Owner_Address = u.Wallet_Address
-                WHERE b.Date_Established > %s
-                ORDER BY b.Date_Established ASC
-            """
-            cursor.execute(query, (date_str,))
-            results = cursor.fetchall()
-            
-            if not results:
-                print(f"\n{Style.WARNING} No businesses found established after {Style.YELLOW}{date_str}{Style.RESET}")
-            else:
-                print(f"\n{Style.SUCCESS} Found {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} business(es):\n")
-                for idx, row in enumerate(results, 1):
-                    owner_name = row['Username'] if row['Username'] else f"{Style.RED}Abandoned{Style.RESET}"
-                    print(f"{Style.CYAN}{Style.BOX_V}{Style.RESET} {Style.MAGENTA}Business #{idx}{Style.RESET}")
-                    print(f"  {Style.GRAY}ID:{Style.RESET} {Style.WHITE}{row['Business_ID']}{Style.RESET}")
-                    print(f"  {Style.GRAY}Name:{Style.RESET} {Style.WHITE}{row['Business_Name']}{Style.RESET}")
-                    print(f"  {Style.GRAY}Type:{Style.RESET} {Style.GREEN}{row['Business_Type']}{Style.RESET}")
-                    print(f"  {Style.GRAY}Established:{Style.RESET} {Style.YELLOW}{format_value(row['Date_Established'])}{Style.RESET}")
-                    print(f"  {Style.GRAY}Owner:{Style.RESET} {owner_name} {Style.CYAN}({row['Owner_Address']}){Style.RESET}")
-                    print()
-    
     except pymysql.Error as e:
         print(f"{Style.ERROR} Database error: {e}")
-    finally:
-        conn.close()
+        return
+    
+    if not results:
+        print(f"\n{Style.WARNING} No businesses found established after {Style.YELLOW}{date_str}{Style.RESET}")
+    else:
+        print(f"\n{Style.SUCCESS} Found {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} business(es):\n")
+        for idx, row in enumerate(results, 1):
+            owner_name = row['Username'] if row['Username'] else f"{Style.RED}Abandoned{Style.RESET}"
+            print(f"{Style.CYAN}{Style.BOX_V}{Style.RESET} {Style.MAGENTA}Business #{idx}{Style.RESET}")
+            print(f"  {Style.GRAY}ID:{Style.RESET} {Style.WHITE}{row['Business_ID']}{Style.RESET}")
+            print(f"  {Style.GRAY}Name:{Style.RESET} {Style.WHITE}{row['Business_Name']}{Style.RESET}")
+            print(f"  {Style.GRAY}Type:{Style.RESET} {Style.GREEN}{row['Business_Type']}{Style.RESET}")
+            print(f"  {Style.GRAY}Established:{Style.RESET} {Style.YELLOW}{format_value(row['Date_Established'])}{Style.RESET}")
+            print(f"  {Style.GRAY}Owner:{Style.RESET} {owner_name} {Style.CYAN}({row['Owner_Address']}){Style.RESET}")
+            print()
 
 
 def total_land_sales_last_quarter():
     """READ Operation 3: Calculate total MANA land sales in the last quarter."""
     print_box("TOTAL LAND SALES (LAST QUARTER)")
     
-    conn = get_connection()
-    if not conn:
-        return
-    
     try:
-        with conn.cursor() as cursor:
-            three_months_ago = datetime.now() - timedelta(days=90)
-            
-            query = """
-                SELECT 
-                    COUNT(*) as total_sales,
-                    SUM(t.Price) as total_mana,
-                    AVG(t.Price) as avg_price,
-                    MIN(t.Price) as min_price,
-                    MAX(t.Price) as max_price
-                FROM Transaction t
-                JOIN LAND_Parcel lp ON t.Asset_ID = lp.Asset_ID
-                WHERE t.Timestamp >= %s AND t.Currency = 'MANA'
-            """
-            cursor.execute(query, (three_months_ago,))
-            result = cursor.fetchone()
-            
-            width = 80
-            print(f"\n{Style.CYAN}{Style.BOX_TL}{Style.BOX_H * (width - 2)}{Style.BOX_TR}{Style.RESET}")
-            print_box_line(f"{Style.BOLD}{Style.MAGENTA}Land Sales Report (Last 90 Days){Style.RESET}", width)
-            print_box_line(
-                f"{Style.GRAY}Period:{Style.RESET} {three_months_ago.strftime('%Y-%m-%d')} to {datetime.now().strftime('%Y-%m-%d')}",
-                width
-            )
-            print_box_separator(width)
-            
-            if result['total_sales'] == 0:
-                print_box_line(f"{Style.WARNING} No land sales in the last quarter.", width)
-            else:
-                print_box_line(f"{Style.GREEN}Total Sales:{Style.RESET} {Style.WHITE}{result['total_sales']}{Style.RESET}", width)
-                print_box_line(f"{Style.GREEN}Total MANA:{Style.RESET} {Style.YELLOW}{format_value(result['total_mana'])}{Style.RESET}", width)
-                print_box_line(f"{Style.GREEN}Average Price:{Style.RESET} {Style.YELLOW}{format_value(result['avg_price'])}{Style.RESET}", width)
-                print_box_line(f"{Style.GREEN}Min Price:{Style.RESET} {Style.YELLOW}{format_value(result['min_price'])}{Style.RESET}", width)
-                print_box_line(f"{Style.GREEN}Max Price:{Style.RESET} {Style.YELLOW}{format_value(result['max_price'])}{Style.RESET}", width)
-            
-            print(f"{Style.CYAN}{Style.BOX_BL}{Style.BOX_H * (width - 2)}{Style.BOX_BR}{Style.RESET}")
-    
+        result = fetch_land_sales(days=90)
+        districts = fetch_land_sales_by_district(days=90)
     except pymysql.Error as e:
         print(f"{Style.ERROR} Database error: {e}")
-    finally:
-        conn.close()
+        return
+    
+    width = 80
+    print(f"\n{Style.CYAN}{Style.BOX_TL}{Style.BOX_H * (width - 2)}{Style.BOX_TR}{Style.RESET}")
+    print_box_line(f"{Style.BOLD}{Style.MAGENTA}Land Sales Report (Last 90 Days){Style.RESET}", width)
+    print_box_line(
+        f"{Style.GRAY}Period:{Style.RESET} {result['period_start'].strftime('%Y-%m-%d')} to {result['period_end'].strftime('%Y-%m-%d')}",
+        width
+    )
+    print_box_separator(width)
+    
+    if result['total_sales'] == 0:
+        print_box_line(f"{Style.WARNING} No land sales in the last quarter.", width)
+    else:
+        print_box_line(f"{Style.GREEN}Total Sales:{Style.RESET} {Style.WHITE}{result['total_sales']}{Style.RESET}", width)
+        print_box_line(f"{Style.GREEN}Total MANA:{Style.RESET} {Style.YELLOW}{format_value(result['total_mana'])}{Style.RESET}", width)
+        print_box_line(f"{Style.GREEN}Average Price:{Style.RESET} {Style.YELLOW}{format_value(result['avg_price'])}{Style.RESET}", width)
+        print_box_line(f"{Style.GREEN}Min Price:{Style.RESET} {Style.YELLOW}{format_value(result['min_price'])}{Style.RESET}", width)
+        print_box_line(f"{Style.GREEN}Max Price:{Style.RESET} {Style.YELLOW}{format_value(result['max_price'])}{Style.RESET}", width)
+    
+    print(f"{Style.CYAN}{Style.BOX_BL}{Style.BOX_H * (width - 2)}{Style.BOX_BR}{Style.RESET}")
+
+    if districts:
+        print(f"\n{Style.BOLD}By district:{Style.RESET}")
+        rows = [dict(row, District_Name=row['District_Name'] or '(none)') for row in districts]
+        sys.stdout.write(render_table(list(rows[0].keys()), rows))
 
 
 def search_events_by_name():
@@ -488,120 +1282,79 @@ def search_events_by_name():
     
     keyword = input(f"{Style.CYAN}>{Style.RESET} Enter event name keyword: ").strip()
     
-    if not keyword:
-        print(f"{Style.ERROR} Keyword cannot be empty.")
-        return
-    
-    conn = get_connection()
-    if not conn:
-        return
-    
     try:
-        with conn.cursor() as cursor:
-            query = """
-                SELECT 
-                    e.Event_ID,
-                    e.Event_Name,
-                    e.Start_Timestamp,
-                    e.End_Timestamp,
-                    e.Organizer_Address,
-                    u.Username as organizer_name,
-                    lp.X_Coordinate,
-                    lp.Y_Coordinate,
-                    lp.District_Name
-                FROM Event e
-                LEFT JOIN User_Profile u ON e.Organizer_Address = u.Wallet_Address
-                LEFT JOIN LAND_Parcel lp ON e.Scene_Parcel_ID = lp.Asset_ID
-                WHERE e.Event_Name LIKE %s
-                ORDER BY e.Start_Timestamp DESC
-            """
-            cursor.execute(query, (f"%{keyword}%",))
-            results = cursor.fetchall()
-            
-            if not results:
-                print(f"\n{Style.WARNING} No events found matching '{Style.YELLOW}{keyword}{Style.RESET}'")
-            else:
-                print(f"\n{Style.SUCCESS} Found {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} event(s):\n")
-                for idx, row in enumerate(results, 1):
-                    organizer_name = row['organizer_name'] if row['organizer_name'] else f"{Style.RED}Unknown{Style.RESET}"
-                    print(f"{Style.CYAN}{Style.BOX_V}{Style.RESET} {Style.MAGENTA}Event #{idx}{Style.RESET}")
-                    print(f"  {Style.GRAY}ID:{Style.RESET} {Style.WHITE}{row['Event_ID']}{Style.RESET}")
-                    print(f"  {Style.GRAY}Name:{Style.RESET} {Style.WHITE}{row['Event_Name']}{Style.RESET}")
-                    print(f"  {Style.GRAY}Start:{Style.RESET} {Style.YELLOW}{format_value(row['Start_Timestamp'])}{Style.RESET}")
-                    print(f"  {Style.GRAY}End:{Style.RESET} {Style.YELLOW}{format_value(row['End_Timestamp'])}{Style.RESET}")
-                    print(f"  {Style.GRAY}Organizer:{Style.RESET} {organizer_name} {Style.CYAN}({row['Organizer_Address']}){Style.RESET}")
-                    if row['X_Coordinate'] is not None:
-                        print(f"  {Style.GRAY}Venue:{Style.RESET} {Style.GREEN}({row['X_Coordinate']}, {row['Y_Coordinate']}){Style.RESET} - {Style.MAGENTA}{row['District_Name']}{Style.RESET}")
-                    print()
-    
+        results, mode = fetch_event_search(keyword)
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return
     except pymysql.Error as e:
         print(f"{Style.ERROR} Database error: {e}")
-    finally:
-        conn.close()
+        return
+    
+    if not results:
+        print(f"\n{Style.WARNING} No events found matching '{Style.YELLOW}{keyword}{Style.RESET}'")
+    else:
+        print(f"\n{Style.SUCCESS} Found {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} event(s):\n")
+        if mode == 'fulltext':
+            print(f"{Style.GRAY}Ranked by relevance (name and tags, top {SEARCH_RESULT_LIMIT}){Style.RESET}\n")
+        for idx, row in enumerate(results, 1):
+            organizer_name = row['organizer_name'] if row['organizer_name'] else f"{Style.RED}Unknown{Style.RESET}"
+            print(f"{Style.CYAN}{Style.BOX_V}{Style.RESET} {Style.MAGENTA}Event #{idx}{Style.RESET}")
+            print(f"  {Style.GRAY}ID:{Style.RESET} {Style.WHITE}{row['Event_ID']}{Style.RESET}")
+            print(f"  {Style.GRAY}Name:{Style.RESET} {Style.WHITE}{row['Event_Name']}{Style.RESET}")
+            print(f"  {Style.GRAY}Start:{Style.RESET} {Style.YELLOW}{format_value(row['Start_Timestamp'])}{Style.RESET}")
+            print(f"  {Style.GRAY}End:{Style.RESET} {Style.YELLOW}{format_value(row['End_Timestamp'])}{Style.RESET}")
+            print(f"  {Style.GRAY}Organizer:{Style.RESET} {organizer_name} {Style.CYAN}({row['Organizer_Address']}){Style.RESET}")
+            if row['X_Coordinate'] is not None:
+                print(f"  {Style.GRAY}Venue:{Style.RESET} {Style.GREEN}({row['X_Coordinate']}, {row['Y_Coordinate']}){Style.RESET} - {Style.MAGENTA}{row['District_Name']}{Style.RESET}")
+            print()
+
+
+def fulltext_query(keyword):
+    """Boolean-mode query requiring every word as a prefix, or None if no word is indexable."""
+    words = [w for w in re.findall(r'\w+', keyword) if len(w) >= FULLTEXT_MIN_WORD]
+    if not words:
+        return None
+    return ' '.join(f"+{word}*" for word in words)
 
 
 def voter_influence_report():
     """READ Operation 5: Generate voter influence report (land owned + votes cast)."""
     print_box("VOTER INFLUENCE REPORT")
     
-    conn = get_connection()
-    if not conn:
-        return
-    
     try:
-        with conn.cursor() as cursor:
-            query = """
-                SELECT 
-                    u.Wallet_Address,
-                    u.Username,
-                    COUNT(DISTINCT da.Asset_ID) as land_parcels_owned,
-                    COUNT(DISTINCT v.Proposal_ID) as votes_cast,
-                    SUM(DISTINCT v.Voting_Weight) as total_voting_weight,
-                    (COUNT(DISTINCT da.Asset_ID) * 10 + COUNT(DISTINCT v.Proposal_ID)) as influence_score
-                FROM User_Profile u
-                LEFT JOIN Digital_Asset da ON u.Wallet_Address = da.Owner_Address
-                LEFT JOIN LAND_Parcel lp ON da.Asset_ID = lp.Asset_ID
-                LEFT JOIN Vote v ON u.Wallet_Address = v.Voter_Address
-                GROUP BY u.Wallet_Address, u.Username
-                HAVING land_parcels_owned > 0 OR votes_cast > 0
-                ORDER BY influence_score DESC
-                LIMIT 20
-            """
-            cursor.execute(query)
-            results = cursor.fetchall()
-            
-            if not results:
-                print(f"\n{Style.WARNING} No voter activity found.")
-            else:
-                print(f"\n{Style.SUCCESS} Top {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} Most Influential Voters:\n")
-                columns = ["Rank", "Username", "Land", "Votes", "Score"]
-                width_rows = []
-                for idx, row in enumerate(results, 1):
-                    width_rows.append({
-                        "Rank": str(idx),
-                        "Username": row['Username'] or "Unknown",
-                        "Land": str(row['land_parcels_owned']),
-                        "Votes": str(row['votes_cast']),
-                        "Score": str(row['influence_score'])
-                    })
-                widths = compute_column_widths(columns, width_rows)
-                inner_width = print_table_header(columns, widths)
-                for idx, row in enumerate(results, 1):
-                    rank_color = Style.YELLOW if idx <= 3 else Style.WHITE
-                    values = [
-                        f"{rank_color}{idx}{Style.RESET}",
-                        f"{Style.MAGENTA}{row['Username'] or 'Unknown'}{Style.RESET}",
-                        f"{Style.WHITE}{row['land_parcels_owned']}{Style.RESET}",
-                        f"{Style.WHITE}{row['votes_cast']}{Style.RESET}",
-                        f"{Style.GREEN}{row['influence_score']}{Style.RESET}"
-                    ]
-                    print(build_table_row(values, widths))
-                print_table_footer(inner_width)
-    
+        results = fetch_voter_influence()
     except pymysql.Error as e:
         print(f"{Style.ERROR} Database error: {e}")
-    finally:
-        conn.close()
+        return
+    
+    if not results:
+        print(f"\n{Style.WARNING} No voter activity found.")
+    else:
+        print(f"\n{Style.SUCCESS} Top {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} Most Influential Voters:\n")
+        columns = ["Rank", "Username", "Land", "Votes", "Score"]
+        width_rows = []
+        for idx, row in enumerate(results, 1):
+            width_rows.append({
+                "Rank": str(idx),
+                "Username": row['Username'] or "Unknown",
+                "Land": str(row['land_parcels_owned']),
+                "Votes": str(row['votes_cast']),
+                "Score": str(row['influence_score'])
+            })
+        widths = compute_column_widths(columns, width_rows)
+        inner_width = print_table_header(columns, widths)
+        for idx, row in enumerate(results, 1):
+            rank_color = Style.YELLOW if idx <= 3 else Style.WHITE
+            values = [
+                f"{rank_color}{idx}{Style.RESET}",
+                f"{Style.MAGENTA}{row['Username'] or 'Unknown'}{Style.RESET}",
+                f"{Style.WHITE}{row['land_parcels_owned']}{Style.RESET}",
+                f"{Style.WHITE}{row['votes_cast']}{Style.RESET}",
+                f"{Style.GREEN}{row['influence_score']}{Style.RESET}"
+            ]
+            print(build_table_row(values, widths))
+        print_table_footer(inner_width)
 
 
 def reschedule_event():
@@ -609,120 +1362,148 @@ def reschedule_event():
     print_box("RESCHEDULE EVENT")
     
     # First, show available events to reschedule
-    conn = get_connection()
-    if not conn:
+    try:
+        events = fetch_upcoming_events()
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Database error: {e}")
+        return
+    
+    if not events:
+        print(f"\n{Style.WARNING} No upcoming events available to reschedule.")
         return
     
+    print(f"\n{Style.INFO} Available events to reschedule:\n")
+    for idx, event in enumerate(events, 1):
+        start_time = event['Start_Timestamp'].strftime('%Y-%m-%d %H:%M:%S')
+        end_time = event['End_Timestamp'].strftime('%Y-%m-%d %H:%M:%S')
+        organizer = event['organizer_name'] or event['Organizer_Address'][:10] + '...'
+        
+        print(f"  {Style.GREEN}{idx}.{Style.RESET} {Style.BOLD}{event['Event_Name']}{Style.RESET}")
+        print(f"     {Style.GRAY}ID: {event['Event_ID']} | Organizer: {organizer}{Style.RESET}")
+        print(f"     {Style.CYAN}Current: {start_time} → {end_time}{Style.RESET}\n")
+    
+    # Get event selection
+    choice = input(
+        f"{Style.CYAN}>{Style.RESET} Select event number to reschedule (1-{len(events)}), "
+        f"or d to shift a whole district: "
+    ).strip().lower()
+    if choice == 'd':
+        shift_district_prompt()
+        return
     try:
-        with conn.cursor() as cursor:
-            # Show current events that can be rescheduled
-            query = """
-                SELECT 
-                    e.Event_ID,
-                    e.Event_Name,
-                    e.Start_Timestamp,
-                    e.End_Timestamp,
-                    e.Organizer_Address,
-                    u.Username as organizer_name
-                FROM Event e
-                LEFT JOIN User_Profile u ON e.Organizer_Address = u.Wallet_Address
-                WHERE e.Start_Timestamp > NOW()
-                ORDER BY e.Start_Timestamp ASC
-            """
-            cursor.execute(query)
-            events = cursor.fetchall()
-            
-            if not events:
-                print(f"\n{Style.WARNING} No upcoming events available to reschedule.")
-                return
-            
-            print(f"\n{Style.INFO} Available events to reschedule:\n")
-            for idx, event in enumerate(events, 1):
-                start_time = event['Start_Timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-                end_time = event['End_Timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-                organizer = event['organizer_name'] or event['Organizer_Address'][:10] + '...'
-                
-                print(f"  {Style.GREEN}{idx}.{Style.RESET} {Style.BOLD}{event['Event_Name']}{Style.RESET}")
-                print(f"     {Style.GRAY}ID: {event['Event_ID']} | Organizer: {organizer}{Style.RESET}")
-                print(f"     {Style.CYAN}Current: {start_time} → {end_time}{Style.RESET}\n")
-            
-            # Get event selection
+        choice = int(choice)
+    except ValueError:
+        print(f"{Style.ERROR} Please enter a valid number.")
+        return
+    if choice < 1 or choice > len(events):
+        print(f"{Style.ERROR} Invalid selection.")
+        return
+    
+    selected_event = events[choice - 1]
+    print(f"\n{Style.INFO} Rescheduling: {Style.BOLD}{selected_event['Event_Name']}{Style.RESET}")
+    
+    # Get new start datetime
+    print(f"\n{Style.CYAN}Enter new start time:{Style.RESET}")
+    start_date = input(f"{Style.CYAN}>{Style.RESET} Date (YYYY-MM-DD): ").strip()
+    start_time = input(f"{Style.CYAN}>{Style.RESET} Time (HH:MM): ").strip()
+    
+    # Get new end datetime  
+    print(f"\n{Style.CYAN}Enter new end time:{Style.RESET}")
+    end_date = input(f"{Style.CYAN}>{Style.RESET} Date (YYYY-MM-DD): ").strip()
+    end_time = input(f"{Style.CYAN}>{Style.RESET} Time (HH:MM): ").strip()
+    
+    # Validate datetime format
+    try:
+        new_start = datetime.strptime(f"{start_date} {start_time}:00", "%Y-%m-%d %H:%M:%S")
+        new_end = datetime.strptime(f"{end_date} {end_time}:00", "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        print(f"{Style.ERROR} Invalid datetime format. Use YYYY-MM-DD and HH:MM.")
+        return
+    
+    confirmed = []
+    try:
+        while True:
             try:
-                choice = int(input(f"{Style.CYAN}>{Style.RESET} Select event number to reschedule (1-{len(events)}): "))
-                if choice < 1 or choice > len(events):
-                    print(f"{Style.ERROR} Invalid selection.")
-                    return
-                
-                selected_event = events[choice - 1]
-                event_id = selected_event['Event_ID']
-                
-                print(f"\n{Style.INFO} Rescheduling: {Style.BOLD}{selected_event['Event_Name']}{Style.RESET}")
-                
-                # Get new start datetime
-                print(f"\n{Style.CYAN}Enter new start time:{Style.RESET}")
-                start_date = input(f"{Style.CYAN}>{Style.RESET} Date (YYYY-MM-DD): ").strip()
-                start_time = input(f"{Style.CYAN}>{Style.RESET} Time (HH:MM): ").strip()
-                
-                # Get new end datetime  
-                print(f"\n{Style.CYAN}Enter new end time:{Style.RESET}")
-                end_date = input(f"{Style.CYAN}>{Style.RESET} Date (YYYY-MM-DD): ").strip()
-                end_time = input(f"{Style.CYAN}>{Style.RESET} Time (HH:MM): ").strip()
-                
-                # Validate datetime format
-                try:
-                    new_start = datetime.strptime(f"{start_date} {start_time}:00", "%Y-%m-%d %H:%M:%S")
-                    new_end = datetime.strptime(f"{end_date} {end_time}:00", "%Y-%m-%d %H:%M:%S")
-                    
-                    # Validate that end > start (this will test our CHECK constraint)
-                    if new_end <= new_start:
-                        print(f"{Style.ERROR} End time must be after start time.")
-                        return
-                    
-                    # Validate that start time is in the future
-                    if new_start <= datetime.now():
-                        print(f"{Style.ERROR} Start time must be in the future.")
-                        return
-                        
-                except ValueError as e:
-                    print(f"{Style.ERROR} Invalid datetime format. Use YYYY-MM-DD and HH:MM.")
+                update_event_schedule(selected_event['Event_ID'], new_start, new_end, allow_conflicts=confirmed)
+                break
+            except ScheduleConflict as e:
+                # Only the overlaps shown are accepted; new ones are shown again
+                if not confirm_conflicts(e):
                     return
-                
-                # Update the event
-                update_query = """
-                    UPDATE Event 
-                    SET Start_Timestamp = %s, End_Timestamp = %s
-                    WHERE Event_ID = %s
-                """
-                
-                cursor.execute(update_query, (new_start, new_end, event_id))
-                
-                if cursor.rowcount > 0:
-                    conn.commit()
-                    print(f"\n{Style.SUCCESS} Event '{selected_event['Event_Name']}' successfully rescheduled!")
-                    print(f"{Style.INFO} New schedule:")
-                    print(f"  {Style.GREEN}Start:{Style.RESET} {new_start.strftime('%Y-%m-%d %H:%M:%S')}")
-                    print(f"  {Style.GREEN}End:{Style.RESET}   {new_end.strftime('%Y-%m-%d %H:%M:%S')}")
-                    
-                    # Show duration
-                    duration = new_end - new_start
-                    hours = duration.seconds // 3600
-                    minutes = (duration.seconds % 3600) // 60
-                    print(f"  {Style.CYAN}Duration:{Style.RESET} {duration.days} day(s), {hours} hour(s), {minutes} minute(s)")
-                else:
-                    print(f"{Style.ERROR} Failed to reschedule event.")
-                    
-            except ValueError:
-                print(f"{Style.ERROR} Please enter a valid number.")
-                return
-            
+                confirmed = e.conflicts
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return
     except pymysql.Error as e:
         print(f"{Style.ERROR} Database error: {e}")
-        if conn:
-            conn.rollback()
+        return
     
-    finally:
-        if conn:
-            conn.close()
+    print(f"\n{Style.SUCCESS} Event '{selected_event['Event_Name']}' successfully rescheduled!")
+    print(f"{Style.INFO} New schedule:")
+    print(f"  {Style.GREEN}Start:{Style.RESET} {new_start.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  {Style.GREEN}End:{Style.RESET}   {new_end.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # Show duration
+    duration = new_end - new_start
+    hours = duration.seconds // 3600
+    minutes = (duration.seconds % 3600) // 60
+    print(f"  {Style.CYAN}Duration:{Style.RESET} {duration.days} day(s), {hours} hour(s), {minutes} minute(s)")
+
+
+def confirm_conflicts(conflict):
+    """Show the overlaps behind a ScheduleConflict; returns True to go ahead anyway."""
+    print(f"\n{Style.WARNING} {conflict}")
+    rows = [{
+        'Event_ID': row['Event_ID'],
+        'New_Start': row['Start_Timestamp'],
+        'New_End': row['End_Timestamp'],
+        'Same': row['Scope'],
+        'Conflicts_With': row['Conflicts_With'],
+        'Other_Start': row['Other_Start'],
+        'Other_End': row['Other_End'],
+    } for row in conflict.conflicts[:20]]
+    sys.stdout.write(render_table(list(rows[0].keys()), rows))
+    if len(conflict.conflicts) > len(rows):
+        print(f"{Style.GRAY}... and {len(conflict.conflicts) - len(rows)} more{Style.RESET}")
+    answer = input(f"{Style.CYAN}>{Style.RESET} Schedule anyway? (y/N): ").strip().lower()
+    return answer == 'y'
+
+
+def shift_district_prompt():
+    """Move every upcoming event in one district by the same amount, in one statement."""
+    district = input(f"{Style.CYAN}>{Style.RESET} District name: ").strip()
+    try:
+        minutes = int(input(f"{Style.CYAN}>{Style.RESET} Shift by minutes (negative = earlier): ").strip())
+    except ValueError:
+        print(f"{Style.ERROR} Please enter a whole number of minutes.")
+        return
+    delta = timedelta(minutes=minutes)
+    confirmed = []
+    try:
+        while True:
+            try:
+                plan = shift_district_events(district, delta, allow_conflicts=confirmed, dry_run=True)
+                answer = input(
+                    f"{Style.CYAN}>{Style.RESET} Move {plan['Events']} event(s) in {district} "
+                    f"by {minutes} minute(s)? (y/N): "
+                ).strip().lower()
+                if answer != 'y':
+                    print(f"{Style.INFO} Nothing was changed.")
+                    return
+                # Raises again if an overlap appeared since the preview
+                result = shift_district_events(district, delta, allow_conflicts=confirmed)
+                break
+            except ScheduleConflict as e:
+                if not confirm_conflicts(e):
+                    return
+                confirmed = e.conflicts
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Database error: {e}")
+        return
+    print(f"\n{Style.SUCCESS} Moved {Style.GREEN}{result['Events']}{Style.RESET} event(s) in {district}.")
 
 
 def register_new_business():
@@ -737,81 +1518,114 @@ def register_new_business():
         print(f"{Style.ERROR} All fields are required.")
         return
     
-    conn = get_connection()
-    if not conn:
+    try:
+        # Get all land parcels owned by this user
+        parcels = fetch_owned_parcels(owner_address)
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Database error: {e}")
         return
     
+    # Show available parcels and let user choose
+    print(f"\n{Style.INFO} Available land parcels owned by {Style.CYAN}{owner_address[:10]}...{Style.RESET}:\n")
+    
+    for idx, parcel in enumerate(parcels, 1):
+        district = parcel['District_Name'] or "Uncharted Territory"
+        coords = f"({parcel['X_Coordinate']}, {parcel['Y_Coordinate']})"
+        
+        print(f"  {Style.GREEN}{idx}.{Style.RESET} {Style.BOLD}{parcel['Asset_ID']}{Style.RESET}")
+        print(f"     {Style.GRAY}Location: {coords} | District: {district}{Style.RESET}\n")
+    
+    # Get user's parcel choice
     try:
-        with conn.cursor() as cursor:
-            check_query = "SELECT Wallet_Address FROM User_Profile WHERE Wallet_Address = %s"
-            cursor.execute(check_query, (owner_address,))
-            
-            if not cursor.fetchone():
-                print(f"{Style.ERROR} User with wallet {Style.CYAN}{owner_address}{Style.RESET} does not exist.")
-                return
-            
-            # Get all land parcels owned by this user
-            parcel_query = """
-                SELECT lp.Asset_ID, lp.X_Coordinate, lp.Y_Coordinate, lp.District_Name
-                FROM LAND_Parcel lp
-                JOIN Digital_Asset da ON lp.Asset_ID = da.Asset_ID
-                WHERE da.Owner_Address = %s
-                ORDER BY lp.Asset_ID
-            """
-            cursor.execute(parcel_query, (owner_address,))
-            parcels = cursor.fetchall()
-            
-            if not parcels:
-                print(f"{Style.ERROR} User must own at least one land parcel to register a business.")
-                return
-            
-            # Show available parcels and let user choose
-            print(f"\n{Style.INFO} Available land parcels owned by {Style.CYAN}{owner_address[:10]}...{Style.RESET}:\n")
-            
-            for idx, parcel in enumerate(parcels, 1):
-                district = parcel['District_Name'] or "Uncharted Territory"
-                coords = f"({parcel['X_Coordinate']}, {parcel['Y_Coordinate']})"
-                
-                print(f"  {Style.GREEN}{idx}.{Style.RESET} {Style.BOLD}{parcel['Asset_ID']}{Style.RESET}")
-                print(f"     {Style.GRAY}Location: {coords} | District: {district}{Style.RESET}\n")
-            
-            # Get user's parcel choice
-            try:
-                choice = int(input(f"{Style.CYAN}>{Style.RESET} Select parcel number for business (1-{len(parcels)}): "))
-                if choice < 1 or choice > len(parcels):
-                    print(f"{Style.ERROR} Invalid selection.")
-                    return
-                
-                selected_parcel = parcels[choice - 1]
-                parcel_id = selected_parcel['Asset_ID']
-                
-                print(f"\n{Style.INFO} Business will be registered on parcel {Style.YELLOW}{parcel_id}{Style.RESET}")
-                
-            except ValueError:
-                print(f"{Style.ERROR} Please enter a valid number.")
-                return
-            
-            insert_query = """
-                INSERT INTO Business (Business_Name, Business_Type, Owner_Address, Date_Established, Parcel_ID)
-                VALUES (%s, %s, %s, CURDATE(), %s)
-            """
-            cursor.execute(insert_query, (business_name, business_type, owner_address, parcel_id))
-            
-            business_id = cursor.lastrowid
-            conn.commit()
-            
-            print(f"\n{Style.SUCCESS} Business registered successfully!")
-            print(f"   {Style.GRAY}Business ID:{Style.RESET} {Style.WHITE}{business_id}{Style.RESET}")
-            print(f"   {Style.GRAY}Name:{Style.RESET} {Style.MAGENTA}{business_name}{Style.RESET}")
-            print(f"   {Style.GRAY}Type:{Style.RESET} {Style.GREEN}{business_type}{Style.RESET}")
-            print(f"   {Style.GRAY}Owner:{Style.RESET} {Style.CYAN}{owner_address}{Style.RESET}")
-            print(f"   {Style.GRAY}Parcel:{Style.RESET} {Style.YELLOW}{parcel_id}{Style.RESET}")
+        choice = int(input(f"{Style.CYAN}>{Style.RESET} Select parcel number for business (1-{len(parcels)}): "))
+    except ValueError:
+        print(f"{Style.ERROR} Please enter a valid number.")
+        return
+    if choice < 1 or choice > len(parcels):
+        print(f"{Style.ERROR} Invalid selection.")
+        return
+    
+    parcel_id = parcels[choice - 1]['Asset_ID']
+    print(f"\n{Style.INFO} Business will be registered on parcel {Style.YELLOW}{parcel_id}{Style.RESET}")
     
+    try:
+        business = register_business(business_name, business_type, owner_address, parcel_id)
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return
     except pymysql.Error as e:
-        conn.rollback()
         print(f"{Style.ERROR} Failed to register business: {e}")
-    finally:
-        conn.close()
+        return
+    
+    print(f"\n{Style.SUCCESS} Business registered successfully!")
+    print(f"   {Style.GRAY}Business ID:{Style.RESET} {Style.WHITE}{business['Business_ID']}{Style.RESET}")
+    print(f"   {Style.GRAY}Name:{Style.RESET} {Style.MAGENTA}{business_name}{Style.RESET}")
+    print(f"   {Style.GRAY}Type:{Style.RESET} {Style.GREEN}{business_type}{Style.RESET}")
+    print(f"   {Style.GRAY}Owner:{Style.RESET} {Style.CYAN}{owner_address}{Style.RESET}")
+    print(f"   {Style.GRAY}Parcel:{Style.RESET} {Style.YELLOW}{parcel_id}{Style.RESET}")
+
+
+class SaleRejected(InvalidRequest):
+    """A sale failed validation (unknown asset/buyer, seller is not the owner or is the buyer)."""
+
+
+def _transfer_once(conn, asset_id, seller_address, buyer_address, price):
+    with conn.cursor() as cursor:
+        cursor.execute(queries.ASSET_OWNER_FOR_UPDATE, (asset_id,))
+        asset = cursor.fetchone()
+        if not asset:
+            raise SaleRejected(f"Asset {asset_id} does not exist.")
+        if asset['Owner_Address'] != seller_address:
+            raise SaleRejected(f"Seller does not own this asset. Current owner: {asset['Owner_Address']}")
+
+        cursor.execute(queries.USER_EXISTS, (buyer_address,))
+        if not cursor.fetchone():
+            raise SaleRejected(f"Buyer wallet {buyer_address} does not exist.")
+
+        # Generate transaction ID (66 char blockchain hash format: 0x + 64 hex chars)
+        transaction_id = '0x' + secrets.token_hex(32)
+        cursor.execute(queries.INSERT_SALE, (transaction_id, asset_id, seller_address, buyer_address, price))
+
+        cursor.execute(queries.TRANSFER_ASSET_OWNER, (buyer_address, asset_id, seller_address))
+        if cursor.rowcount != 1:
+            # The row is locked and buyer != seller, so the owner always changes
+            # here; guards against callers that skip the lock
+            raise SaleRejected("Asset changed owner during the sale.")
+    conn.commit()
+    return transaction_id
+
+
+def transfer_asset(asset_id, seller_address, buyer_address, price, conn=None):
+    """Record a sale and move ownership atomically; returns the transaction ID.
+
+    The asset row is locked with SELECT ... FOR UPDATE and the ownership UPDATE
+    is conditional on the seller, so concurrent sales of the same asset cannot
+    both succeed. Deadlocks and lock-wait timeouts are retried with backoff.
+    Raises SaleRejected for invalid sales and pymysql.Error for other failures.
+    """
+    if buyer_address == seller_address:
+        # The ownership UPDATE would change no row, which reads as a lost race
+        raise SaleRejected("Seller and buyer are the same wallet.")
+    with borrowed_connection(conn) as conn:
+        for attempt in range(TRANSFER_RETRIES + 1):
+            try:
+                transaction_id = _transfer_once(conn, asset_id, seller_address, buyer_address, price)
+                break
+            except SaleRejected:
+                conn.rollback()
+                raise
+            except pymysql.Error as e:
+                conn.rollback()
+                if e.args[0] not in (ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT) or attempt == TRANSFER_RETRIES:
+                    raise
+                time.sleep(TRANSFER_BACKOFF * (2 ** attempt) * (0.5 + random.random()))
+    notify_tables_written('Transaction', 'Digital_Asset', 'User_Influence')
+    for listener in OWNERSHIP_LISTENERS:
+        listener(asset_id, buyer_address)
+    return transaction_id
 
 
 def record_asset_sale():
@@ -835,65 +1649,22 @@ def record_asset_sale():
         print(f"{Style.ERROR} Invalid input: {e}")
         return
     
-    conn = get_connection()
-    if not conn:
-        return
-    
     try:
-        with conn.cursor() as cursor:
-            check_asset = """
-                SELECT Owner_Address FROM Digital_Asset 
-                WHERE Asset_ID = %s
-            """
-            cursor.execute(check_asset, (asset_id,))
-            asset = cursor.fetchone()
-            
-            if not asset:
-                print(f"{Style.ERROR} Asset {Style.YELLOW}{asset_id}{Style.RESET} does not exist.")
-                return
-            
-            if asset['Owner_Address'] != seller_address:
-                print(f"{Style.ERROR} Seller does not own this asset. Current owner: {Style.CYAN}{asset['Owner_Address']}{Style.RESET}")
-                return
-            
-            check_buyer = "SELECT Wallet_Address FROM User_Profile WHERE Wallet_Address = %s"
-            cursor.execute(check_buyer, (buyer_address,))
-            if not cursor.fetchone():
-                print(f"{Style.ERROR} Buyer wallet {Style.CYAN}{buyer_address}{Style.RESET} does not exist.")
-                return
-            
-            # Generate transaction ID (66 char blockchain hash format: 0x + 64 hex chars)
-            import secrets
-            transaction_id = '0x' + secrets.token_hex(32)
-            
-            insert_transaction = """
-                INSERT INTO Transaction (Transaction_ID, Asset_ID, Seller_Address, Buyer_Address, Price, Currency, Timestamp)
-                VALUES (%s, %s, %s, %s, %s, 'MANA', NOW())
-            """
-            cursor.execute(insert_transaction, (transaction_id, asset_id, seller_address, buyer_address, price))
-            
-            update_ownership = """
-                UPDATE Digital_Asset 
-                SET Owner_Address = %s 
-                WHERE Asset_ID = %s
-            """
-            cursor.execute(update_ownership, (buyer_address, asset_id))
-            
-            conn.commit()
-            
-            print(f"\n{Style.SUCCESS} Transaction recorded successfully!")
-            print(f"   {Style.GRAY}Transaction ID:{Style.RESET} {Style.YELLOW}{transaction_id}{Style.RESET}")
-            print(f"   {Style.GRAY}Asset ID:{Style.RESET} {Style.WHITE}{asset_id}{Style.RESET}")
-            print(f"   {Style.GRAY}From:{Style.RESET} {Style.CYAN}{seller_address}{Style.RESET}")
-            print(f"   {Style.GRAY}To:{Style.RESET} {Style.CYAN}{buyer_address}{Style.RESET}")
-            print(f"   {Style.GRAY}Price:{Style.RESET} {Style.GREEN}{price} MANA{Style.RESET}")
-            print(f"   {Style.INFO} Ownership transferred to buyer.")
-    
+        transaction_id = transfer_asset(asset_id, seller_address, buyer_address, price)
+    except SaleRejected as e:
+        print(f"{Style.ERROR} {e}")
+        return
     except pymysql.Error as e:
-        conn.rollback()
         print(f"{Style.ERROR} Transaction failed: {e}")
-    finally:
-        conn.close()
+        return
+    
+    print(f"\n{Style.SUCCESS} Transaction recorded successfully!")
+    print(f"   {Style.GRAY}Transaction ID:{Style.RESET} {Style.YELLOW}{transaction_id}{Style.RESET}")
+    print(f"   {Style.GRAY}Asset ID:{Style.RESET} {Style.WHITE}{asset_id}{Style.RESET}")
+    print(f"   {Style.GRAY}From:{Style.RESET} {Style.CYAN}{seller_address}{Style.RESET}")
+    print(f"   {Style.GRAY}To:{Style.RESET} {Style.CYAN}{buyer_address}{Style.RESET}")
+    print(f"   {Style.GRAY}Price:{Style.RESET} {Style.GREEN}{price} MANA{Style.RESET}")
+    print(f"   {Style.INFO} Ownership transferred to buyer.")
 
 
 def delete_user():
@@ -911,77 +1682,23 @@ def delete_user():
         print(f"{Style.WARNING} Deletion cancelled.")
         return
     
-    conn = get_connection()
-    if not conn:
-        return
-    
     try:
-        with conn.cursor() as cursor:
-            check_user = "SELECT Username FROM User_Profile WHERE Wallet_Address = %s"
-            cursor.execute(check_user, (wallet,))
-            user = cursor.fetchone()
-            
-            if not user:
-                print(f"{Style.ERROR} User {Style.CYAN}{wallet}{Style.RESET} does not exist.")
-                return
-            
-            delete_votes = "DELETE FROM Vote WHERE Voter_Address = %s"
-            cursor.execute(delete_votes, (wallet,))
-            votes_deleted = cursor.rowcount
-            
-            delete_attends = "DELETE FROM ATTENDS WHERE Wallet_Address = %s"
-            cursor.execute(delete_attends, (wallet,))
-            attends_deleted = cursor.rowcount
-            
-            delete_proposals = "DELETE FROM DAO_Proposal WHERE Creator_Address = %s"
-            cursor.execute(delete_proposals, (wallet,))
-            proposals_deleted = cursor.rowcount
-            
-            set_businesses_null = "UPDATE Business SET Owner_Address = NULL WHERE Owner_Address = %s"
-            cursor.execute(set_businesses_null, (wallet,))
-            businesses_updated = cursor.rowcount
-            
-            set_events_null = "UPDATE Event SET Organizer_Address = NULL WHERE Organizer_Address = %s"
-            cursor.execute(set_events_null, (wallet,))
-            events_updated = cursor.rowcount
-            
-            set_scenes_null = "UPDATE Scene_Content SET Creator_Address = NULL WHERE Creator_Address = %s"
-            cursor.execute(set_scenes_null, (wallet,))
-            scenes_updated = cursor.rowcount
-            
-            set_transactions_null = """
-                UPDATE Transaction 
-                SET Seller_Address = NULL 
-                WHERE Seller_Address = %s
-            """
-            cursor.execute(set_transactions_null, (wallet,))
-            
-            set_transactions_buyer_null = """
-                UPDATE Transaction 
-                SET Buyer_Address = NULL 
-                WHERE Buyer_Address = %s
-            """
-            cursor.execute(set_transactions_buyer_null, (wallet,))
-            
-            delete_user_query = "DELETE FROM User_Profile WHERE Wallet_Address = %s"
-            cursor.execute(delete_user_query, (wallet,))
-            
-            conn.commit()
-            
-            print(f"\n{Style.SUCCESS} User {Style.MAGENTA}{user['Username']}{Style.RESET} deleted successfully!")
-            print(f"   {Style.GRAY}Votes deleted:{Style.RESET} {Style.WHITE}{votes_deleted}{Style.RESET}")
-            print(f"   {Style.GRAY}Event attendances deleted:{Style.RESET} {Style.WHITE}{attends_deleted}{Style.RESET}")
-            print(f"   {Style.GRAY}DAO proposals deleted:{Style.RESET} {Style.WHITE}{proposals_deleted}{Style.RESET}")
-            print(f"   {Style.GRAY}Businesses set to abandoned:{Style.RESET} {Style.WHITE}{businesses_updated}{Style.RESET}")
-            print(f"   {Style.GRAY}Events organizer cleared:{Style.RESET} {Style.WHITE}{events_updated}{Style.RESET}")
-            print(f"   {Style.GRAY}Scenes creator cleared:{Style.RESET} {Style.WHITE}{scenes_updated}{Style.RESET}")
-            print(f"   {Style.INFO} Digital assets remain (constraint prevents deletion)")
-    
+        username, affected = delete_wallet(wallet)
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return
     except pymysql.Error as e:
-        conn.rollback()
         print(f"{Style.ERROR} Failed to delete user: {e}")
-    finally:
-        conn.close()
+        return
+    
+    print(f"\n{Style.SUCCESS} User {Style.MAGENTA}{username}{Style.RESET} deleted successfully!")
+    print(f"   {Style.GRAY}Votes deleted:{Style.RESET} {Style.WHITE}{affected['votes_deleted']}{Style.RESET}")
+    print(f"   {Style.GRAY}Event attendances deleted:{Style.RESET} {Style.WHITE}{affected['attends_deleted']}{Style.RESET}")
+    print(f"   {Style.GRAY}DAO proposals deleted:{Style.RESET} {Style.WHITE}{affected['proposals_deleted']}{Style.RESET}")
+    print(f"   {Style.GRAY}Businesses set to abandoned:{Style.RESET} {Style.WHITE}{affected['businesses_updated']}{Style.RESET}")
+    print(f"   {Style.GRAY}Events organizer cleared:{Style.RESET} {Style.WHITE}{affected['events_updated']}{Style.RESET}")
+    print(f"   {Style.GRAY}Scenes creator cleared:{Style.RESET} {Style.WHITE}{affected['scenes_updated']}{Style.RESET}")
+    print(f"   {Style.INFO} Digital assets remain (constraint prevents deletion)")
 
 
 def custom_sql_query():
@@ -1006,39 +1723,48 @@ def custom_sql_query():
         print(f"{Style.ERROR} Query cannot be empty.")
         return
     
-    conn = get_connection()
-    if not conn:
+    if query.strip().upper().startswith('SELECT'):
+        # Stream SELECTs through a server-side cursor instead of fetchall()
+        stream_query(query)
         return
     
     try:
-        with conn.cursor() as cursor:
-            cursor.execute(query)
-            
-            if query.strip().upper().startswith('SELECT'):
-                results = cursor.fetchall()
-                
-                if not results:
-                    print(f"\n{Style.WARNING} Query returned no results.")
-                else:
-                    print(f"\n{Style.SUCCESS} Query returned {Style.GREEN}{Style.BOLD}{len(results)}{Style.RESET} row(s):\n")
-                    
-                    if results:
-                        columns = list(results[0].keys())
-                        widths = compute_column_widths(columns, results)
-                        inner_width = print_table_header(columns, widths)
-                        for row in results:
-                            values = [f"{Style.WHITE}{format_value(row[col])}{Style.RESET}" for col in columns]
-                            print(build_table_row(values, widths))
-                        print_table_footer(inner_width)
-            else:
-                conn.commit()
-                print(f"\n{Style.SUCCESS} Query executed successfully. Rows affected: {Style.GREEN}{cursor.rowcount}{Style.RESET}")
-    
+        count = execute_statement(query)
     except pymysql.Error as e:
-        conn.rollback()
         print(f"{Style.ERROR} Query failed: {e}")
-    finally:
-        conn.close()
+        return
+    print(f"\n{Style.SUCCESS} Query executed successfully. Rows affected: {Style.GREEN}{count}{Style.RESET}")
+
+
+def view_query_stats():
+    """Show per-operation and per-statement timings recorded this session."""
+    print_box("SESSION QUERY STATISTICS")
+    operations = instrument.STATS.operation_rows()
+    if not operations:
+        print(f"{Style.WARNING} No queries recorded yet.")
+    else:
+        print(f"{Style.BOLD}By operation:{Style.RESET}")
+        sys.stdout.write(render_table(list(operations[0].keys()), operations))
+        statements = instrument.STATS.statement_rows(limit=10)
+        for row in statements:
+            row['fingerprint'] = truncate_cell(row['fingerprint'], 62)
+        print(f"\n{Style.BOLD}Top statements by total time:{Style.RESET}")
+        sys.stdout.write(render_table(list(statements[0].keys()), statements))
+    pool = get_pool()
+    if pool:
+        stats = pool.stats()
+        print(
+            f"\n{Style.GRAY}Pool: {stats['in_use']} in use, {stats['idle']} idle of {stats['max_size']}; "
+            f"{stats['checkouts']} checkout(s), {stats['created']} connection(s) opened, "
+            f"{stats['waits']} wait(s){Style.RESET}"
+        )
+    stats = QUERY_CACHE.stats()
+    print(
+        f"{Style.GRAY}Query cache: {stats['hits']} hit(s), {stats['misses']} miss(es) "
+        f"({stats['hit_rate']:.0%}), {stats['entries']}/{stats['max_entries']} entries{Style.RESET}"
+    )
+    slow_log = instrument.STATS.slow_log or 'disabled'
+    print(f"{Style.GRAY}Slow-query log (>= {instrument.STATS.slow_ms:g} ms): {slow_log}{Style.RESET}")
 
 
 def display_menu():
@@ -1062,6 +1788,7 @@ def display_menu():
         f"{Style.YELLOW}8.{Style.RESET} {Style.WHITE}Reschedule an event{Style.RESET}",
         f"{Style.RED}9.{Style.RESET} {Style.WHITE}Delete a user{Style.RESET}",
         f"{Style.MAGENTA}10.{Style.RESET} {Style.WHITE}Custom SQL query{Style.RESET}",
+        f"{Style.CYAN}s.{Style.RESET} {Style.WHITE}Session query statistics{Style.RESET}",
         f"{Style.GRAY}q.{Style.RESET} {Style.WHITE}Quit{Style.RESET}"
     ]
     for item in menu_items:
@@ -1070,6 +1797,21 @@ def display_menu():
     print(f"{Style.CYAN}{Style.BOX_BL}{Style.BOX_H * (width - 2)}{Style.BOX_BR}{Style.RESET}\n")
 
 
+MENU_ACTIONS = {
+    '1': view_dao_proposals_by_user,
+    '2': list_businesses_after_date,
+    '3': total_land_sales_last_quarter,
+    '4': search_events_by_name,
+    '5': voter_influence_report,
+    '6': register_new_business,
+    '7': record_asset_sale,
+    '8': reschedule_event,
+    '9': delete_user,
+    '10': custom_sql_query,
+    's': view_query_stats,
+}
+
+
 def main():
     """Main application loop."""
     clear_screen()
@@ -1108,31 +1850,17 @@ def main():
         display_menu()
         choice = input(f"{Style.CYAN}>{Style.RESET} Select an option: ").strip().lower()
         
-        if choice == '1':
-            view_dao_proposals_by_user()
-        elif choice == '2':
-            list_businesses_after_date()
-        elif choice == '3':
-            total_land_sales_last_quarter()
-        elif choice == '4':
-            search_events_by_name()
-        elif choice == '5':
-            voter_influence_report()
-        elif choice == '6':
-            register_new_business()
-        elif choice == '7':
-            record_asset_sale()
-        elif choice == '8':
-            reschedule_event()
-        elif choice == '9':
-            delete_user()
-        elif choice == '10':
-            custom_sql_query()
+        action = MENU_ACTIONS.get(choice)
+        if action:
+            # Statements issued by the action are charged to it in the session stats
+            with instrument.operation(action.__name__):
+                action()
         elif choice == 'q':
             print(f"\n{Style.CYAN}{'═' * 80}{Style.RESET}")
             print(f"{Style.MAGENTA}{Style.BOLD}{'Thank you for using Decentraland DBMS!':^80}{Style.RESET}")
             print(f"{Style.GREEN}{'Goodbye!':^80}{Style.RESET}")
             print(f"{Style.CYAN}{'═' * 80}{Style.RESET}\n")
+            close_pool()
             break
         else:
             print(f"\n{Style.ERROR} Invalid option. Please try again.")
@@ -1141,4 +1869,9 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Arguments select the headless CLI (see cli.py); none opens the menu.
+        # client.main() hands them to a running daemon.py, else runs cli.py here.
+        import client
+        sys.exit(client.main(sys.argv[1:]))
     main()
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Schema Migrations
+
+Versioned, idempotent changes applied on top of schema.sql, plus a plan
+checker that EXPLAINs every shipped menu query.
+
+Usage:
+    python3 migrations.py status
+    python3 migrations.py migrate [--target VERSION]
+    python3 migrations.py check [--strict]
+    python3 migrations.py rebuild-land-sales
+
+Migration 6 partitions Transaction by month; partitions.py maintains it.
+"""
+
+import argparse
+import sys
+from datetime import date, datetime, timedelta
+
+import pymysql
+
+import leaderboard
+import partitions
+import queries
+from main_app import Style, KeysetPager, authenticate_user, get_connection, land_sales_window
+
+
+MIGRATION_TABLE = """
+    CREATE TABLE IF NOT EXISTS Schema_Migration
+    (
+        Version INT PRIMARY KEY,
+        Description VARCHAR(255) NOT NULL,
+        Applied_At TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+# ============================================================================
+# STEP BUILDERS
+# ============================================================================
+# Each step is a callable(cursor) -> bool (True if it changed anything) and
+# must be safe to re-run, since MySQL DDL cannot be rolled back.
+
+def index_exists(cursor, table, name):
+    """Return True if `table` already has an index called `name`."""
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        LIMIT 1
+        """,
+        (table, name)
+    )
+    return cursor.fetchone() is not None
+
+
+def ensure_index(table, name, columns, kind=''):
+    """Step: CREATE [kind] INDEX name ON table (columns) unless it exists."""
+    def step(cursor):
+        if index_exists(cursor, table, name):
+            return False
+        prefix = f"{kind} " if kind else ""
+        cursor.execute(f"CREATE {prefix}INDEX {name} ON `{table}` ({columns})")
+        return True
+    step.description = f"{kind + ' ' if kind else ''}index {name} on {table}({columns})"
+    return step
+
+
+def table_exists(cursor, table):
+    """Return True if `table` exists in the current database."""
+    cursor.execute(
+        "SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def ensure_table(table, ddl):
+    """Step: run a CREATE TABLE statement unless the table exists."""
+    def step(cursor):
+        if table_exists(cursor, table):
+            return False
+        cursor.execute(ddl)
+        return True
+    step.description = f"table {table}"
+    return step
+
+
+def ensure_trigger(name, ddl):
+    """Step: (re)create a trigger so its body always matches `ddl`."""
+    def step(cursor):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(ddl)
+        return True
+    step.description = f"trigger {name}"
+    return step
+
+
+def ensure_procedure(name, ddl):
+    """Step: (re)create a stored procedure so its body always matches `ddl`."""
+    def step(cursor):
+        cursor.execute(f"DROP PROCEDURE IF EXISTS {name}")
+        cursor.execute(ddl)
+        return True
+    step.description = f"procedure {name}"
+    return step
+
+
+def run_step(description, fn):
+    """Step: arbitrary idempotent callable(cursor)."""
+    def step(cursor):
+        fn(cursor)
+        return True
+    step.description = description
+    return step
+
+
+# ============================================================================
+# DDL
+# ============================================================================
+
+USER_INFLUENCE_TABLE = """
+    CREATE TABLE User_Influence
+    (
+        Wallet_Address CHAR(42) PRIMARY KEY,
+        Parcels_Owned INT NOT NULL DEFAULT 0,
+        Votes_Cast INT NOT NULL DEFAULT 0,
+        Total_Weight DECIMAL(30, 10) NOT NULL DEFAULT 0,
+        Score INT AS (Parcels_Owned * 10 + Votes_Cast) STORED,
+
+        INDEX idx_influence_score (Score, Wallet_Address),
+
+        FOREIGN KEY (Wallet_Address) REFERENCES User_Profile(Wallet_Address)
+            ON DELETE CASCADE
+            ON UPDATE CASCADE
+    )
+"""
+
+INFLUENCE_TRIGGERS = [
+    ('trg_asset_influence_ins', """
+        CREATE TRIGGER trg_asset_influence_ins AFTER INSERT ON Digital_Asset
+        FOR EACH ROW
+            INSERT INTO User_Influence (Wallet_Address, Parcels_Owned)
+            VALUES (NEW.Owner_Address, 1)
+            ON DUPLICATE KEY UPDATE Parcels_Owned = Parcels_Owned + 1
+    """),
+    ('trg_asset_influence_upd', """
+        CREATE TRIGGER trg_asset_influence_upd AFTER UPDATE ON Digital_Asset
+        FOR EACH ROW
+        BEGIN
+            IF NOT (OLD.Owner_Address <=> NEW.Owner_Address) THEN
+                UPDATE User_Influence SET Parcels_Owned = Parcels_Owned - 1
+                WHERE Wallet_Address = OLD.Owner_Address;
+                INSERT INTO User_Influence (Wallet_Address, Parcels_Owned)
+                VALUES (NEW.Owner_Address, 1)
+                ON DUPLICATE KEY UPDATE Parcels_Owned = Parcels_Owned + 1;
+            END IF;
+        END
+    """),
+    ('trg_asset_influence_del', """
+        CREATE TRIGGER trg_asset_influence_del AFTER DELETE ON Digital_Asset
+        FOR EACH ROW
+            UPDATE User_Influence SET Parcels_Owned = Parcels_Owned - 1
+            WHERE Wallet_Address = OLD.Owner_Address
+    """),
+    ('trg_vote_influence_ins', """
+        CREATE TRIGGER trg_vote_influence_ins AFTER INSERT ON Vote
+        FOR EACH ROW
+            INSERT INTO User_Influence (Wallet_Address, Votes_Cast, Total_Weight)
+            VALUES (NEW.Voter_Address, 1, NEW.Voting_Weight)
+            ON DUPLICATE KEY UPDATE
+                Votes_Cast = Votes_Cast + 1,
+                Total_Weight = Total_Weight + NEW.Voting_Weight
+    """),
+    ('trg_vote_influence_upd', """
+        CREATE TRIGGER trg_vote_influence_upd AFTER UPDATE ON Vote
+        FOR EACH ROW
+        BEGIN
+            UPDATE User_Influence
+            SET Votes_Cast = Votes_Cast - 1, Total_Weight = Total_Weight - OLD.Voting_Weight
+            WHERE Wallet_Address = OLD.Voter_Address;
+            INSERT INTO User_Influence (Wallet_Address, Votes_Cast, Total_Weight)
+            VALUES (NEW.Voter_Address, 1, NEW.Voting_Weight)
+            ON DUPLICATE KEY UPDATE
+                Votes_Cast = Votes_Cast + 1,
+                Total_Weight = Total_Weight + NEW.Voting_Weight;
+        END
+    """),
+    ('trg_vote_influence_del', """
+        CREATE TRIGGER trg_vote_influence_del AFTER DELETE ON Vote
+        FOR EACH ROW
+            UPDATE User_Influence
+            SET Votes_Cast = Votes_Cast - 1, Total_Weight = Total_Weight - OLD.Voting_Weight
+            WHERE Wallet_Address = OLD.Voter_Address
+    """),
+]
+
+
+# One row per (currency, day, district); District_Name '' stands for parcels
+# outside any district, since primary key columns cannot be NULL. Days follow
+# the session time zone, like DATE(Timestamp) in the report queries.
+LAND_SALES_DAILY_TABLE = """
+    CREATE TABLE Land_Sales_Daily
+    (
+        Currency VARCHAR(4) NOT NULL,
+        Sale_Date DATE NOT NULL,
+        District_Name VARCHAR(255) NOT NULL DEFAULT '',
+        Sales_Count INT NOT NULL,
+        Price_Sum DECIMAL(38, 10) NOT NULL,
+        Price_Min DECIMAL(20, 10) NOT NULL,
+        Price_Max DECIMAL(20, 10) NOT NULL,
+
+        PRIMARY KEY (Currency, Sale_Date, District_Name)
+    )
+"""
+
+# Recomputes one (day, currency) slice from raw rows. Inserts only ever widen
+# MIN/MAX, so they update in place; updates and deletes go through this.
+REFRESH_LAND_SALES_DAY = """
+    CREATE PROCEDURE refresh_land_sales_day(IN p_day DATE, IN p_currency VARCHAR(4))
+    BEGIN
+        DELETE FROM Land_Sales_Daily WHERE Currency = p_currency AND Sale_Date = p_day;
+        INSERT INTO Land_Sales_Daily
+            (Currency, Sale_Date, District_Name, Sales_Count, Price_Sum, Price_Min, Price_Max)
+        SELECT p_currency, p_day, COALESCE(lp.District_Name, ''),
+               COUNT(*), SUM(t.Price), MIN(t.Price), MAX(t.Price)
+        FROM Transaction t
+        JOIN LAND_Parcel lp ON t.Asset_ID = lp.Asset_ID
+        WHERE t.Currency = p_currency
+          AND t.Timestamp >= p_day AND t.Timestamp < p_day + INTERVAL 1 DAY
+        GROUP BY COALESCE(lp.District_Name, '');
+    END
+"""
+
+LAND_SALES_TRIGGERS = [
+    ('trg_txn_land_sales_ins', """
+        CREATE TRIGGER trg_txn_land_sales_ins AFTER INSERT ON Transaction
+        FOR EACH ROW
+            INSERT INTO Land_Sales_Daily
+                (Currency, Sale_Date, District_Name, Sales_Count, Price_Sum, Price_Min, Price_Max)
+            SELECT NEW.Currency, DATE(NEW.Timestamp), COALESCE(lp.District_Name, ''),
+                   1, NEW.Price, NEW.Price, NEW.Price
+            FROM LAND_Parcel lp
+            WHERE lp.Asset_ID = NEW.Asset_ID
+            ON DUPLICATE KEY UPDATE
+                Sales_Count = Sales_Count + 1,
+                Price_Sum = Price_Sum + NEW.Price,
+                Price_Min = LEAST(Price_Min, NEW.Price),
+                Price_Max = GREATEST(Price_Max, NEW.Price)
+    """),
+    ('trg_txn_land_sales_upd', """
+        CREATE TRIGGER trg_txn_land_sales_upd AFTER UPDATE ON Transaction
+        FOR EACH ROW
+        BEGIN
+            IF NOT (OLD.Price <=> NEW.Price AND OLD.Timestamp <=> NEW.Timestamp
+                    AND OLD.Currency <=> NEW.Currency AND OLD.Asset_ID <=> NEW.Asset_ID) THEN
+                CALL refresh_land_sales_day(DATE(OLD.Timestamp), OLD.Currency);
+                IF NOT (DATE(OLD.Timestamp) <=> DATE(NEW.Timestamp) AND OLD.Currency <=> NEW.Currency) THEN
+                    CALL refresh_land_sales_day(DATE(NEW.Timestamp), NEW.Currency);
+                END IF;
+            END IF;
+        END
+    """),
+    ('trg_txn_land_sales_del', """
+        CREATE TRIGGER trg_txn_land_sales_del AFTER DELETE ON Transaction
+        FOR EACH ROW
+            CALL refresh_land_sales_day(DATE(OLD.Timestamp), OLD.Currency)
+    """),
+]
+
+
+def rebuild_land_sales_daily(cursor):
+    """Replace Land_Sales_Daily with values recomputed from Transaction.
+
+    Days in months archived by partitions.py have no raw rows left, so their
+    rollup rows are kept as they are.
+    """
+    since = partitions.archived_through(cursor) or date(1970, 1, 1)
+    cursor.execute("DELETE FROM Land_Sales_Daily WHERE Sale_Date >= %s", (since,))
+    cursor.execute(
+        "INSERT INTO Land_Sales_Daily "
+        "(Currency, Sale_Date, District_Name, Sales_Count, Price_Sum, Price_Min, Price_Max) "
+        + queries.LAND_SALES_DAILY_FROM_SOURCE,
+        (since,)
+    )
+    return cursor.rowcount
+
+
+# ============================================================================
+# MIGRATIONS
+# ============================================================================
+
+MIGRATIONS = [
+    (1, "Secondary indexes for menu query predicates", [
+        # Op 3: Currency equality + Timestamp range; Asset_ID/Price make it covering
+        ensure_index('Transaction', 'idx_txn_currency_time', 'Currency, Timestamp, Asset_ID, Price'),
+        # Op 2: range + ORDER BY on Date_Established
+        ensure_index('Business', 'idx_business_established', 'Date_Established'),
+        # Op 8: upcoming events (Start_Timestamp > NOW() ORDER BY Start_Timestamp)
+        ensure_index('Event', 'idx_event_start', 'Start_Timestamp'),
+        # Op 1: equality on creator, ORDER BY Proposal_ID DESC read off the index
+        ensure_index('DAO_Proposal', 'idx_proposal_creator_id', 'Creator_Address, Proposal_ID'),
+        # view_all_users keyset order (Join_Date, Wallet_Address)
+        ensure_index('User_Profile', 'idx_user_join_date', 'Join_Date, Wallet_Address'),
+    ]),
+    (2, "Materialized User_Influence leaderboard", [
+        ensure_table('User_Influence', USER_INFLUENCE_TABLE),
+        *[ensure_trigger(name, ddl) for name, ddl in INFLUENCE_TRIGGERS],
+        run_step("backfill User_Influence from source tables", leaderboard.rebuild_influence_rows),
+    ]),
+    (3, "Full-text indexes for event search", [
+        ensure_index('Event', 'ft_event_name', 'Event_Name', kind='FULLTEXT'),
+        ensure_index('Event_Tags', 'ft_event_tag', 'Tag', kind='FULLTEXT'),
+    ]),
+    (4, "Daily land-sales rollup", [
+        ensure_table('Land_Sales_Daily', LAND_SALES_DAILY_TABLE),
+        ensure_procedure('refresh_land_sales_day', REFRESH_LAND_SALES_DAY),
+        *[ensure_trigger(name, ddl) for name, ddl in LAND_SALES_TRIGGERS],
+        run_step("backfill Land_Sales_Daily from Transaction", rebuild_land_sales_daily),
+    ]),
+    (5, "Event end-time index for the scheduling index", [
+        # main_app.EVENT_SCHEDULE loads events with End_Timestamp > NOW()
+        ensure_index('Event', 'idx_event_end', 'End_Timestamp'),
+    ]),
+    (6, "Monthly RANGE partitions on Transaction, with an archive", [
+        # Partitioned InnoDB tables cannot have foreign keys; transfer_asset and
+        # bulk_sales check the asset and both wallets before inserting a sale
+        run_step("drop Transaction foreign keys", partitions.drop_foreign_keys),
+        ensure_table('Transaction_Archive', partitions.ARCHIVE_TABLE),
+        ensure_table('Transaction_Archive_Log', partitions.ARCHIVE_LOG_TABLE),
+        run_step("primary key (Transaction_ID, Timestamp), one partition per month",
+                 partitions.partition_by_month),
+    ]),
+    (7, "Transaction_ID registry, unique across partitions and the archive", [
+        ensure_table('Transaction_ID_Registry', partitions.ID_REGISTRY_TABLE),
+        *[ensure_trigger(name, ddl) for name, ddl in partitions.ID_REGISTRY_TRIGGERS],
+        run_step("backfill Transaction_ID_Registry from Transaction and Transaction_Archive",
+                 partitions.register_transaction_ids),
+    ]),
+]
+
+
+def applied_versions(cursor):
+    """Return the set of migration versions already recorded."""
+    cursor.execute(MIGRATION_TABLE)
+    cursor.execute("SELECT Version FROM Schema_Migration")
+    return {row['Version'] for row in cursor.fetchall()}
+
+
+def migrate(conn, target=None, log=print):
+    """Apply pending migrations up to `target` (all if None); return versions applied."""
+    done = []
+    with conn.cursor() as cursor:
+        applied = applied_versions(cursor)
+        for version, description, steps in MIGRATIONS:
+            if version in applied or (target is not None and version > target):
+                continue
+            log(f"{Style.INFO} Applying migration {version}: {description}")
+            for step in steps:
+                changed = step(cursor)
+                state = f"{Style.GREEN}applied{Style.RESET}" if changed else f"{Style.GRAY}already present{Style.RESET}"
+                log(f"    {getattr(step, 'description', step.__name__)} - {state}")
+            cursor.execute(
+                "INSERT INTO Schema_Migration (Version, Description) VALUES (%s, %s)",
+                (version, description)
+            )
+            conn.commit()
+            done.append(version)
+    return done
+
+
+# ============================================================================
+# QUERY PLAN CHECKER
+# ============================================================================
+
+def plan_checks():
+    """(name, sql, params, allowed_scans) for every shipped menu query.
+
+    `allowed_scans` lists table aliases that are expected to be read in full,
+    e.g. a report that has to visit every user.
+    """
+    users_sql, users_params = KeysetPager(queries.ALL_USERS_SELECT, queries.ALL_USERS_KEYS).page_sql()
+    assets_sql, assets_params = KeysetPager(queries.ALL_ASSETS_SELECT, queries.ALL_ASSETS_KEYS).page_sql()
+    wallet = '0x5555555555555555555555555555555555555555'
+    quarter_start = datetime.now() - timedelta(days=90)
+
+    checks = [
+        ("View all users", users_sql, users_params, set()),
+        ("View all assets", assets_sql, assets_params, set()),
+        ("1. DAO proposals by user", queries.DAO_PROPOSALS_BY_USER, (wallet,), set()),
+        ("2. Businesses after date", queries.BUSINESSES_AFTER_DATE, ('2006-08-13',), set()),
+        ("3. Land sales last quarter", queries.LAND_SALES_SINCE, (quarter_start,), set()),
+        ("3. Land sales (rollup)", queries.LAND_SALES_ROLLUP, land_sales_window(quarter_start), set()),
+        ("3. Land sales by district", queries.LAND_SALES_BY_DISTRICT_ROLLUP,
+         land_sales_window(quarter_start), set()),
+        ("4. Search events (full-text)", queries.SEARCH_EVENTS_FULLTEXT, ('+meet*',) * 4 + (50,), set()),
+        # Fallback for short keywords: leading-wildcard LIKE cannot use a B-tree index
+        ("4. Search events (LIKE)", queries.SEARCH_EVENTS_LIKE, ('%meet%',), {'e'}),
+        ("5. Voter influence leaderboard", queries.INFLUENCE_LEADERBOARD, (), set()),
+        # Fallback when migration 2 is missing: ranks every user, so reads User_Profile in full
+        ("5. Voter influence (aggregate)", queries.VOTER_INFLUENCE, (), {'u'}),
+        ("6. Parcels owned by user", queries.PARCELS_OWNED_BY, (wallet,), set()),
+        ("7. Asset owner lookup (locking)", queries.ASSET_OWNER_FOR_UPDATE, ('LAND-000',), set()),
+        ("8. Upcoming events", queries.UPCOMING_EVENTS, (), set()),
+        # Reads every row of its window; partitioning (migration 6) limits that to the window's months
+        ("Export transactions window", queries.EXPORT_TRANSACTIONS_BETWEEN,
+         (quarter_start, datetime.now()), {'Transaction'}),
+    ]
+    for label, statement in queries.DELETE_USER_STEPS:
+        checks.append((f"9. Delete user: {label}", statement, (wallet,), set()))
+    return checks
+
+
+def explain(cursor, sql, params):
+    """Return EXPLAIN rows for a statement."""
+    cursor.execute("EXPLAIN " + sql, params)
+    return cursor.fetchall()
+
+
+def check_query_plans(conn, strict=False):
+    """EXPLAIN every menu query; return (report, failures).
+
+    A plan step fails when it reads a base table with access type ALL and no
+    usable index (`possible_keys` empty). With `strict`, any ALL access fails,
+    which is only meaningful on a realistically sized dataset since the
+    optimizer prefers scans on tiny tables.
+    """
+    report = []
+    failures = []
+    with conn.cursor() as cursor:
+        for name, sql, params, allowed in plan_checks():
+            try:
+                plan = explain(cursor, sql, params)
+            except pymysql.err.ProgrammingError as e:
+                report.append((name, '-', f"error: {e.args[1]}", None, None, True))
+                failures.append((name, '-'))
+                continue
+            for row in plan:
+                table = row.get('table') or ''
+                derived = table.startswith('<')
+                full_scan = row.get('type') == 'ALL' and not derived
+                bad = full_scan and table not in allowed and (strict or not row.get('possible_keys'))
+                report.append((name, table, row.get('type'), row.get('key'), row.get('rows'), bad))
+                if bad:
+                    failures.append((name, table))
+    return report, failures
+
+
+def print_plan_report(report):
+    """Print the checker's per-table access summary."""
+    for name, table, access, key, rows, bad in report:
+        tag = Style.ERROR if bad else f"{Style.GREEN}[OK]{Style.RESET}"
+        print(f"{tag} {name:<38} {table or '-':<12} type={access or '-':<7} key={key or '-'} rows={rows}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage schema migrations for decentraland_db.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('status', help="show applied and pending migrations")
+    migrate_cmd = sub.add_parser('migrate', help="apply pending migrations")
+    migrate_cmd.add_argument('--target', type=int, default=None, help="stop after this version")
+    check_cmd = sub.add_parser('check', help="EXPLAIN every menu query and fail on full scans")
+    check_cmd.add_argument('--strict', action='store_true', help="fail on any full table scan")
+    sub.add_parser('rebuild-land-sales', help="recompute Land_Sales_Daily from Transaction")
+    args = parser.parse_args(argv)
+
+    authenticate_user()
+    conn = get_connection()
+    if not conn:
+        return 1
+    try:
+        if args.command == 'status':
+            with conn.cursor() as cursor:
+                applied = applied_versions(cursor)
+            for version, description, _ in MIGRATIONS:
+                state = f"{Style.GREEN}applied{Style.RESET}" if version in applied else f"{Style.YELLOW}pending{Style.RESET}"
+                print(f"  {version:>3}  {description} - {state}")
+            return 0
+        if args.command == 'migrate':
+            done = migrate(conn, target=args.target)
+            print(f"{Style.SUCCESS} {len(done)} migration(s) applied.")
+            return 0
+        if args.command == 'rebuild-land-sales':
+            with conn.cursor() as cursor:
+                count = rebuild_land_sales_daily(cursor)
+            conn.commit()
+            print(f"{Style.SUCCESS} Land_Sales_Daily rebuilt with {count} row(s).")
+            return 0
+        report, failures = check_query_plans(conn, strict=args.strict)
+        print_plan_report(report)
+        if failures:
+            print(f"\n{Style.ERROR} {len(failures)} full table scan(s) found.")
+            return 1
+        print(f"\n{Style.SUCCESS} No unexpected full table scans.")
+        return 0
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Database error: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
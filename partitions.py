@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+MINI WORLD - GENESIS CITY
+Transaction Partitioning
+
+Migration 6 splits Transaction into one RANGE partition per calendar month,
+named pYYYYMM, plus a catch-all pmax. The partitioning expression is
+UNIX_TIMESTAMP(Timestamp), the only one MySQL accepts for a TIMESTAMP column.
+A query that filters on a bare Timestamp range reads only the months in its
+window. Retiring a month is a DROP PARTITION, which does not visit the rows,
+instead of a DELETE that visits each row and fires the rollup trigger per row.
+
+The maintenance job keeps --ahead empty future months split off from pmax.
+Months more than --keep months before the current one are moved out of the
+table, into Transaction_Archive (compressed InnoDB rows), into compressed
+files, or nowhere (--archive drop):
+
+    python3 partitions.py status
+    python3 partitions.py maintain [--ahead 3] [--keep 24] [--archive table|file|drop] [--dir DIR] [--dry-run]
+    python3 partitions.py check
+
+Run `maintain` from cron; monthly is enough and more often is harmless. Month
+boundaries follow the session time zone, like DATE(Timestamp) in the rollup.
+Land_Sales_Daily keeps its rows for archived days, so the land-sales report
+does not change when a month is archived.
+"""
+
+import argparse
+import gzip
+import os
+import shutil
+import sys
+from datetime import date, datetime, timedelta
+
+import pymysql
+
+import export
+import queries
+from main_app import (ER_NO_SUCH_TABLE, InvalidRequest, Style, authenticate_user, execute_if_table_exists,
+                      get_connection, land_sales_window, notify_tables_written)
+
+
+TABLE = 'Transaction'
+ARCHIVE_MODES = ('table', 'file', 'drop')
+DEFAULT_MONTHS_AHEAD = 3
+DEFAULT_KEEP_MONTHS = 24
+ARCHIVE_ATTEMPTS = 3                  # copies redone when late rows land in the partition meanwhile
+
+
+# ============================================================================
+# DDL
+# ============================================================================
+
+# Same columns as Transaction. Unpartitioned, so the key can be Transaction_ID
+# alone; the wallet indexes serve the delete-user steps
+ARCHIVE_TABLE = """
+    CREATE TABLE Transaction_Archive
+    (
+        Transaction_ID CHAR(66) PRIMARY KEY,
+        Timestamp TIMESTAMP NOT NULL,
+        Price DECIMAL(20, 10) NOT NULL,
+        Currency VARCHAR(4) NOT NULL,
+        Asset_ID VARCHAR(50) NULL,
+        Seller_Address CHAR(42) NULL,
+        Buyer_Address CHAR(42) NULL,
+
+        INDEX idx_archive_time (Timestamp),
+        INDEX idx_archive_seller (Seller_Address),
+        INDEX idx_archive_buyer (Buyer_Address)
+    ) ROW_FORMAT=COMPRESSED
+"""
+
+# One row per partition moved out of Transaction. Range_Start/Range_End are
+# session-time month bounds; the oldest partition also held anything earlier.
+ARCHIVE_LOG_TABLE = """
+    CREATE TABLE Transaction_Archive_Log
+    (
+        Partition_Name VARCHAR(16) PRIMARY KEY,
+        Range_Start DATETIME NOT NULL,
+        Range_End DATETIME NOT NULL,
+        Row_Count INT NOT NULL,
+        Destination VARCHAR(512) NOT NULL,
+        Archived_At TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# Every Transaction_ID ever recorded. The partitioned primary key is
+# (Transaction_ID, Timestamp) and archived months leave the table, so the
+# registry is what keeps an ID from being recorded twice (migration 7)
+ID_REGISTRY_TABLE = """
+    CREATE TABLE Transaction_ID_Registry
+    (
+        Transaction_ID CHAR(66) PRIMARY KEY
+    )
+"""
+
+# A duplicate ID fails the registry insert, and with it the Transaction write
+ID_REGISTRY_TRIGGERS = [
+    ('trg_txn_id_registry_ins', """
+        CREATE TRIGGER trg_txn_id_registry_ins BEFORE INSERT ON Transaction
+        FOR EACH ROW
+            INSERT INTO Transaction_ID_Registry (Transaction_ID) VALUES (NEW.Transaction_ID)
+    """),
+    ('trg_txn_id_registry_upd', """
+        CREATE TRIGGER trg_txn_id_registry_upd BEFORE UPDATE ON Transaction
+        FOR EACH ROW
+        BEGIN
+            IF NEW.Transaction_ID <> OLD.Transaction_ID THEN
+                INSERT INTO Transaction_ID_Registry (Transaction_ID) VALUES (NEW.Transaction_ID);
+            END IF;
+        END
+    """),
+]
+
+PARTITION_ROWS = """
+    SELECT Transaction_ID, Timestamp, Price, Currency, Asset_ID, Seller_Address, Buyer_Address
+    FROM `{table}` PARTITION ({partition})
+    ORDER BY Timestamp, Transaction_ID
+"""
+# Remove an earlier copy of a month, so a retry or a re-run after a failed drop
+# starts clean. By time range, so rows deleted from the partition since then go
+# too; the join catches late rows older than the month that the oldest
+# partition also holds
+UNARCHIVE_MONTH = """
+    DELETE FROM Transaction_Archive
+    WHERE Timestamp >= %s AND Timestamp < %s
+"""
+UNARCHIVE_PARTITION = """
+    DELETE a FROM Transaction_Archive a
+    JOIN `{table}` PARTITION ({partition}) t ON t.Transaction_ID = a.Transaction_ID
+"""
+ARCHIVE_PARTITION = """
+    INSERT INTO Transaction_Archive
+        (Transaction_ID, Timestamp, Price, Currency, Asset_ID, Seller_Address, Buyer_Address)
+    SELECT Transaction_ID, Timestamp, Price, Currency, Asset_ID, Seller_Address, Buyer_Address
+    FROM `{table}` PARTITION ({partition})
+"""
+# Order-independent fingerprint of a partition: the copy must match it under
+# the write lock. Nullable columns are coalesced so a NULL cannot shift fields
+PARTITION_CHECKSUM = """
+    SELECT COUNT(*) AS row_count,
+           BIT_XOR(CRC32(CONCAT_WS('|', Transaction_ID, Timestamp, Price, Currency, COALESCE(Asset_ID, ''),
+                                   COALESCE(Seller_Address, ''), COALESCE(Buyer_Address, '')))) AS checksum
+    FROM `{table}` PARTITION ({partition})
+"""
+LOG_ARCHIVED = """
+    INSERT INTO Transaction_Archive_Log (Partition_Name, Range_Start, Range_End, Row_Count, Destination)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+# ============================================================================
+# MONTHS AND PARTITIONS
+# ============================================================================
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(first, last):
+    """Month starts from `first` through `last` inclusive."""
+    months = []
+    while first <= last:
+        months.append(first)
+        first = add_months(first, 1)
+    return months
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def partition_month(name):
+    """Month a pYYYYMM partition holds, or None for pmax."""
+    if name == 'pmax':
+        return None
+    return datetime.strptime(name[1:], '%Y%m').date()
+
+
+def partition_clause(month):
+    bound = add_months(month, 1)
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (UNIX_TIMESTAMP('{bound:%Y-%m-%d} 00:00:00'))"
+
+
+def list_partitions(cursor, table=TABLE):
+    """[(name, month, estimated rows)] in range order; month is None for pmax.
+
+    Empty if `table` is not partitioned.
+    """
+    cursor.execute(
+        """
+        SELECT PARTITION_NAME AS name, TABLE_ROWS AS estimated_rows
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+        """,
+        (table,)
+    )
+    return [(row['name'], partition_month(row['name']), row['estimated_rows']) for row in cursor.fetchall()]
+
+
+def require_partitions(cursor, table=TABLE):
+    parts = list_partitions(cursor, table)
+    if not parts:
+        raise InvalidRequest(f"{table} is not partitioned yet; run python3 migrations.py migrate first.")
+    return parts
+
+
+# ============================================================================
+# CONVERSION (migration 6)
+# ============================================================================
+
+def drop_foreign_keys(cursor, table=TABLE):
+    """Drop the foreign keys of `table`; partitioned InnoDB tables cannot have any.
+
+    The indexes MySQL created for them stay, so the delete-user steps that
+    clear Seller_Address and Buyer_Address keep their index lookups.
+    """
+    cursor.execute(
+        """
+        SELECT CONSTRAINT_NAME FROM information_schema.TABLE_CONSTRAINTS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_TYPE = 'FOREIGN KEY'
+        """,
+        (table,)
+    )
+    names = [row['CONSTRAINT_NAME'] for row in cursor.fetchall()]
+    for name in names:
+        cursor.execute(f"ALTER TABLE `{table}` DROP FOREIGN KEY `{name}`")
+    return bool(names)
+
+
+def partition_by_month(cursor, table=TABLE, months_ahead=DEFAULT_MONTHS_AHEAD, today=None):
+    """Split `table` into one partition per month, from its oldest row to `months_ahead` ahead.
+
+    Every unique key of a partitioned table must contain the partitioning
+    column, so the primary key becomes (Transaction_ID, Timestamp) in the
+    same rebuild. Returns False if `table` is already partitioned.
+    """
+    if list_partitions(cursor, table):
+        return False
+    today = today or date.today()
+    cursor.execute(f"SELECT MIN(Timestamp) AS oldest FROM `{table}`")
+    oldest = cursor.fetchone()['oldest'] or today
+    months = month_range(month_start(oldest), add_months(month_start(today), months_ahead))
+    cursor.execute(
+        f"ALTER TABLE `{table}` DROP PRIMARY KEY, ADD PRIMARY KEY (Transaction_ID, Timestamp) "
+        f"PARTITION BY RANGE (UNIX_TIMESTAMP(Timestamp)) ("
+        + ", ".join(partition_clause(month) for month in months)
+        + ", PARTITION pmax VALUES LESS THAN MAXVALUE)"
+    )
+    return True
+
+
+def register_transaction_ids(cursor, table=TABLE):
+    """Backfill Transaction_ID_Registry from `table` and Transaction_Archive.
+
+    Runs after the registry triggers exist, so no insert slips between the two.
+    Months archived to files or dropped before migration 7 cannot be backfilled.
+    """
+    backfill = "INSERT IGNORE INTO Transaction_ID_Registry (Transaction_ID) SELECT Transaction_ID FROM `{}`"
+    cursor.execute(backfill.format(table))
+    return cursor.rowcount + execute_if_table_exists(cursor, backfill.format('Transaction_Archive'))
+
+
+# ============================================================================
+# MAINTENANCE
+# ============================================================================
+
+def add_future_partitions(cursor, table=TABLE, months_ahead=DEFAULT_MONTHS_AHEAD, today=None, dry_run=False):
+    """Split the months up to `months_ahead` past the current one off pmax; returns their names."""
+    parts = require_partitions(cursor, table)
+    newest = max(month for _, month, _ in parts if month is not None)
+    months = month_range(add_months(newest, 1), add_months(month_start(today or date.today()), months_ahead))
+    if months and not dry_run:
+        # pmax is normally empty, so this only rewrites its (missing) rows
+        cursor.execute(
+            f"ALTER TABLE `{table}` REORGANIZE PARTITION pmax INTO ("
+            + ", ".join(partition_clause(month) for month in months)
+            + ", PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        )
+    return [partition_name(month) for month in months]
+
+
+def cold_partitions(parts, keep_months=DEFAULT_KEEP_MONTHS, today=None):
+    """(name, month, estimated rows) of the months ending before the `keep_months` months
+    that precede the current one, oldest first."""
+    cutoff = add_months(month_start(today or date.today()), -keep_months)
+    return [(name, month, rows) for name, month, rows in parts
+            if month is not None and add_months(month, 1) <= cutoff]
+
+
+def partition_checksum(cursor, table, name, suffix=''):
+    """(row count, checksum) of one partition."""
+    cursor.execute(PARTITION_CHECKSUM.format(table=table, partition=name) + suffix)
+    row = cursor.fetchone()
+    return row['row_count'], row['checksum']
+
+
+def archive_path(directory, month, fmt):
+    path = os.path.join(directory, f"transactions_{month:%Y_%m}.{fmt}")
+    return path + '.gz' if fmt in ('csv', 'ndjson') else path
+
+
+def _copy_to_file(conn, table, name, month, directory, fmt):
+    """Export one partition; CSV and NDJSON are gzipped, Parquet compresses its own pages."""
+    path = archive_path(directory, month, fmt)
+    plain = path[:-3] if path.endswith('.gz') else path
+    with conn.cursor() as cursor:
+        # The export runs on this connection and ends the transaction, so both read one snapshot
+        cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+        copied = partition_checksum(cursor, table, name)
+    export.export_query(PARTITION_ROWS.format(table=table, partition=name), plain, fmt=fmt, conn=conn)
+    if plain != path:
+        with open(plain, 'rb') as source, gzip.open(path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.remove(plain)
+    return copied, path
+
+
+def _unarchive(cursor, table, name, month):
+    cursor.execute(UNARCHIVE_MONTH, (month, add_months(month, 1)))
+    cursor.execute(UNARCHIVE_PARTITION.format(table=table, partition=name))
+
+
+def _discard_copy(conn, table, name, month, destination):
+    """Remove a copy whose partition is being kept, so its sales do not exist twice."""
+    if destination == 'Transaction_Archive':
+        try:
+            with conn.cursor() as cursor:
+                _unarchive(cursor, table, name, month)
+            conn.commit()
+        except pymysql.Error:
+            conn.rollback()
+            raise
+    elif destination != 'dropped' and os.path.exists(destination):
+        os.remove(destination)
+
+
+def _copy_to_table(conn, table, name, month):
+    try:
+        with conn.cursor() as cursor:
+            _unarchive(cursor, table, name, month)
+            cursor.execute(ARCHIVE_PARTITION.format(table=table, partition=name))
+            # The copy holds shared locks on the rows it read until commit
+            copied = partition_checksum(cursor, table, name, " LOCK IN SHARE MODE")
+        conn.commit()
+    except pymysql.Error:
+        conn.rollback()
+        raise
+    return copied, 'Transaction_Archive'
+
+
+def archive_partition(conn, name, month, mode='table', directory='.', fmt='ndjson', table=TABLE):
+    """Copy one partition to the archive table or a file (nowhere for 'drop'), then drop it.
+
+    The copy runs without locks. Writers are blocked only while the row count
+    and checksum of the partition are compared with the copy's and the
+    partition is dropped. If a row was inserted, updated (a delete-user
+    clearing an address) or deleted in the meantime, the copy is redone. After
+    ARCHIVE_ATTEMPTS tries the copy is removed and the partition is left in place.
+    Returns (rows, destination).
+    """
+    for _ in range(ARCHIVE_ATTEMPTS):
+        if mode == 'table':
+            copied, destination = _copy_to_table(conn, table, name, month)
+        elif mode == 'file':
+            copied, destination = _copy_to_file(conn, table, name, month, directory, fmt)
+        else:
+            copied, destination = None, 'dropped'
+        with conn.cursor() as cursor:
+            cursor.execute(f"LOCK TABLES `{table}` WRITE, Transaction_Archive_Log WRITE")
+            try:
+                current = partition_checksum(cursor, table, name)
+                count = current[0]
+                if copied is None or copied == current:
+                    cursor.execute(LOG_ARCHIVED, (name, month, add_months(month, 1), count, destination))
+                    conn.commit()
+                    cursor.execute(f"ALTER TABLE `{table}` DROP PARTITION {name}")
+                    return count, destination
+            finally:
+                cursor.execute("UNLOCK TABLES")
+    _discard_copy(conn, table, name, month, destination)
+    raise InvalidRequest(f"{name} kept changing while it was archived; it was not dropped.")
+
+
+def maintain(conn, months_ahead=DEFAULT_MONTHS_AHEAD, keep_months=DEFAULT_KEEP_MONTHS, mode='table',
+             directory='.', fmt='ndjson', dry_run=False, today=None, log=print):
+    """Add future partitions and archive cold ones; returns (added names, [(name, rows, destination)])."""
+    if keep_months < 0 or months_ahead < 0:
+        raise InvalidRequest("--keep and --ahead cannot be negative.")
+    if mode not in ARCHIVE_MODES:
+        raise InvalidRequest(f"Unknown archive mode {mode!r}; choose from {', '.join(ARCHIVE_MODES)}")
+    if mode == 'file' and not dry_run:
+        os.makedirs(directory, exist_ok=True)
+
+    with conn.cursor() as cursor:
+        added = add_future_partitions(cursor, months_ahead=months_ahead, today=today, dry_run=dry_run)
+        for name in added:
+            log(f"{Style.INFO} {'Would add' if dry_run else 'Added'} partition {name}")
+        cold = cold_partitions(list_partitions(cursor), keep_months, today)
+
+    archived = []
+    for name, month, estimate in cold:
+        if dry_run:
+            log(f"{Style.INFO} Would archive {name} (~{estimate} rows) to {mode}")
+            archived.append((name, estimate, mode))
+            continue
+        rows, destination = archive_partition(conn, name, month, mode, directory, fmt)
+        log(f"{Style.SUCCESS} Archived {name}: {rows} row(s) -> {destination}")
+        archived.append((name, rows, destination))
+    if archived and not dry_run:
+        notify_tables_written(TABLE)
+    return added, archived
+
+
+def archived_through(cursor):
+    """Start of the oldest month still in Transaction, if months have been archived, else None."""
+    try:
+        cursor.execute("SELECT MAX(Range_End) AS archived_through FROM Transaction_Archive_Log")
+    except pymysql.err.ProgrammingError as e:
+        if e.args[0] != ER_NO_SUCH_TABLE:
+            raise
+        return None
+    return cursor.fetchone()['archived_through']
+
+
+# ============================================================================
+# PRUNING CHECK
+# ============================================================================
+
+def pruning_checks(now=None):
+    """(name, sql, params, window start, window end or None) for each Transaction time-window query."""
+    now = now or datetime.now()
+    quarter_start = now - timedelta(days=90)
+    first_day, window_start, next_day = land_sales_window(quarter_start)
+    month = month_start(now)
+    return [
+        ("3. Land sales (raw rows)", queries.LAND_SALES_SINCE, (quarter_start,), quarter_start, None),
+        ("3. Land sales by district (raw rows)", queries.LAND_SALES_BY_DISTRICT_SINCE,
+         (quarter_start,), quarter_start, None),
+        ("3. Land sales (rollup, first day)", queries.LAND_SALES_ROLLUP,
+         (first_day, window_start, next_day), window_start, next_day),
+        ("Export transactions, last month", queries.EXPORT_TRANSACTIONS_BETWEEN,
+         (add_months(month, -1), month), add_months(month, -1), month),
+        ("Land_Sales_Daily rebuild", queries.LAND_SALES_DAILY_FROM_SOURCE, (month,), month, None),
+    ]
+
+
+def _as_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime(value.year, value.month, value.day)
+
+
+def needed_partitions(parts, start, end):
+    """Names of the partitions a [start, end) window overlaps (end None = open)."""
+    start, end = _as_datetime(start), _as_datetime(end)
+    needed = set()
+    lower = None                      # the first partition also holds everything before it
+    for name, month, _ in parts:
+        upper = None if month is None else _as_datetime(add_months(month, 1))
+        if (upper is None or upper > start) and (end is None or lower is None or lower < end):
+            needed.add(name)
+        lower = upper
+    return needed
+
+
+def check_pruning(conn, now=None):
+    """EXPLAIN each time-window query; returns (report, failures).
+
+    A query fails when its plan reads a Transaction partition outside its window.
+    """
+    report = []
+    failures = []
+    with conn.cursor() as cursor:
+        parts = require_partitions(cursor)
+        for name, sql, params, start, end in pruning_checks(now):
+            needed = needed_partitions(parts, start, end)
+            cursor.execute("EXPLAIN " + sql, params)
+            for row in cursor.fetchall():
+                if row.get('table') not in ('t', TABLE):
+                    continue
+                read = set((row.get('partitions') or '').split(',')) - {''}
+                extra = sorted(read - needed)
+                report.append((name, len(read), len(parts), extra))
+                if extra:
+                    failures.append(name)
+    return report, failures
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def print_status(conn):
+    with conn.cursor() as cursor:
+        parts = require_partitions(cursor)
+        for name, month, rows in parts:
+            span = f"{month:%Y-%m}" if month else "later"
+            print(f"  {name:<8} {span:<8} ~{rows} row(s)")
+        try:
+            cursor.execute(
+                "SELECT Partition_Name, Row_Count, Destination, Archived_At "
+                "FROM Transaction_Archive_Log ORDER BY Range_Start"
+            )
+            archived = cursor.fetchall()
+        except pymysql.err.ProgrammingError as e:
+            if e.args[0] != ER_NO_SUCH_TABLE:
+                raise
+            archived = []
+    print(f"\n{Style.INFO} {len(parts)} partition(s), {len(archived)} month(s) archived.")
+    for row in archived:
+        print(f"  {Style.GRAY}{row['Partition_Name']}{Style.RESET} {row['Row_Count']} row(s) -> "
+              f"{row['Destination']} ({row['Archived_At']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the monthly partitions of Transaction.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('status', help="list partitions and archived months")
+    maintain_cmd = sub.add_parser('maintain', help="add future partitions and archive cold ones")
+    maintain_cmd.add_argument('--ahead', type=int, default=DEFAULT_MONTHS_AHEAD,
+                              help="empty months to keep ready past the current one")
+    maintain_cmd.add_argument('--keep', type=int, default=DEFAULT_KEEP_MONTHS,
+                              help="months before the current one to keep in Transaction")
+    maintain_cmd.add_argument('--archive', choices=ARCHIVE_MODES, default='table',
+                              help="where cold months go (drop: nowhere)")
+    maintain_cmd.add_argument('--dir', default='.', help="output directory for --archive file")
+    maintain_cmd.add_argument('--format', choices=export.FORMATS, default='ndjson',
+                              help="file format for --archive file (csv/ndjson are gzipped)")
+    maintain_cmd.add_argument('--dry-run', action='store_true', help="only show what would change")
+    sub.add_parser('check', help="EXPLAIN the time-window queries and fail if they read other months")
+    args = parser.parse_args(argv)
+
+    authenticate_user()
+    conn = get_connection()
+    if not conn:
+        return 1
+    try:
+        if args.command == 'status':
+            print_status(conn)
+            return 0
+        if args.command == 'maintain':
+            added, archived = maintain(conn, args.ahead, args.keep, args.archive, args.dir, args.format,
+                                       dry_run=args.dry_run)
+            print(f"{Style.SUCCESS} {len(added)} partition(s) added, {len(archived)} archived.")
+            return 0
+        report, failures = check_pruning(conn)
+        for name, read, total, extra in report:
+            tag = Style.ERROR if extra else f"{Style.GREEN}[OK]{Style.RESET}"
+            outside = f"  outside window: {', '.join(extra)}" if extra else ""
+            print(f"{tag} {name:<38} reads {read} of {total} partition(s){outside}")
+        if failures:
+            print(f"\n{Style.ERROR} {len(failures)} query plan(s) read partitions outside their window.")
+            return 1
+        print(f"\n{Style.SUCCESS} Every time-window query is pruned to its months.")
+        return 0
+    except InvalidRequest as e:
+        print(f"{Style.ERROR} {e}")
+        return 1
+    except pymysql.Error as e:
+        print(f"{Style.ERROR} Database error: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
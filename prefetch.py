@@ -0,0 +1,102 @@
+"""
+MINI WORLD - GENESIS CITY
+Page Prefetching
+
+Runs a page iterator on a background thread while the current page is on
+screen, so flipping to the next page usually finds it already fetched.
+"""
+
+import contextvars
+import threading
+from collections import deque
+
+
+class PagePrefetcher:
+    """Iterate `pages` on a worker thread, keeping at most `depth` pages ready.
+
+    The worker waits for a free slot before each fetch, so no more than `depth`
+    pages are ever fetched ahead of the reader. cancel() stops it after the
+    fetch in progress; the iterator is closed on the worker thread so any
+    connection it holds goes back to the pool there. Statements are charged
+    to the caller's instrument.operation().
+    """
+
+    _DONE = object()
+
+    def __init__(self, pages, depth=2):
+        self.depth = max(1, depth)
+        self._pages = pages
+        self._ready = deque()
+        self._slots = threading.Semaphore(self.depth)
+        self._available = threading.Condition()
+        self._cancelled = threading.Event()
+        self._error = None
+        self.waits = 0                # next_page() calls that had to block
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._run,), daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        iterator = iter(self._pages)
+        try:
+            while True:
+                while not self._slots.acquire(timeout=0.1):
+                    if self._cancelled.is_set():
+                        return
+                if self._cancelled.is_set():
+                    return
+                page = next(iterator, self._DONE)
+                self._push(page)
+                if page is self._DONE:
+                    return
+        except Exception as e:
+            self._error = e
+            self._push(self._DONE)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    def _push(self, page):
+        with self._available:
+            self._ready.append(page)
+            self._available.notify()
+
+    def next_page(self):
+        """The next page, or None when the pages are exhausted; re-raises fetch errors."""
+        with self._available:
+            if not self._ready:
+                self.waits += 1
+            while not self._ready:
+                self._available.wait()
+            page = self._ready[0]
+            if page is not self._DONE:
+                self._ready.popleft()
+        if page is self._DONE:
+            if self._error is not None:
+                raise self._error
+            return None
+        self._slots.release()
+        return page
+
+    def __iter__(self):
+        page = self.next_page()
+        while page is not None:
+            yield page
+            page = self.next_page()
+
+    def cancel(self, wait=0.0):
+        """Stop prefetching and drop buffered pages; optionally wait for the worker."""
+        self._cancelled.set()
+        with self._available:
+            self._ready.clear()
+            self._ready.append(self._DONE)
+            self._available.notify_all()
+        if wait:
+            self._thread.join(wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cancel()
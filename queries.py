@@ -0,0 +1,529 @@
+"""
+MINI WORLD - GENESIS CITY
+Query Definitions
+
+SQL used by the menu operations in main_app.py, kept in one place so the
+application, the migration/plan checker and the tooling share the same text.
+"""
+
+
+# ----------------------------------------------------------------------------
+# Browsing
+# ----------------------------------------------------------------------------
+
+ALL_USERS_SELECT = "SELECT Wallet_Address, Username, Join_Date, Last_Seen FROM User_Profile"
+ALL_USERS_KEYS = [('Join_Date', 'Join_Date', 'DESC'), ('Wallet_Address', 'Wallet_Address', 'DESC')]
+
+ALL_ASSETS_SELECT = """
+    SELECT da.Asset_ID, da.Token_URI, da.Owner_Address,
+           CASE WHEN lp.Asset_ID IS NOT NULL THEN 'Land' ELSE 'Wearable' END AS Asset_Type,
+           lp.X_Coordinate, lp.Y_Coordinate, w.Category, w.Rarity
+    FROM Digital_Asset da
+    LEFT JOIN LAND_Parcel lp ON da.Asset_ID = lp.Asset_ID
+    LEFT JOIN Wearable w ON da.Asset_ID = w.Asset_ID
+"""
+ALL_ASSETS_KEYS = [('da.Asset_ID', 'Asset_ID', 'ASC')]
+
+# One round trip for the dashboard instead of four separate COUNT(*) statements
+SUMMARY_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM User_Profile) AS total_users,
+        (SELECT COUNT(*) FROM Digital_Asset) AS total_assets,
+        (SELECT COUNT(*) FROM Business) AS total_businesses,
+        (SELECT COUNT(*) FROM Event) AS total_events
+"""
+SUMMARY_TABLES = ('User_Profile', 'Digital_Asset', 'Business', 'Event')
+
+
+# ----------------------------------------------------------------------------
+# Read operations 1-5
+# ----------------------------------------------------------------------------
+
+DAO_PROPOSALS_BY_USER = """
+    SELECT
+        Proposal_ID,
+        Title,
+        Status,
+        Creator_Address
+    FROM DAO_Proposal
+    WHERE Creator_Address = %s
+    ORDER BY Proposal_ID DESC
+"""
+
+BUSINESSES_AFTER_DATE = """
+    SELECT
+        b.Business_ID,
+        b.Business_Name,
+        b.Business_Type,
+        b.Date_Established,
+        b.Owner_Address,
+        u.Username
+    FROM Business b
+    LEFT JOIN User_Profile u ON b.Owner_Address = u.Wallet_Address
+    WHERE b.Date_Established > %s
+    ORDER BY b.Date_Established ASC
+"""
+
+LAND_SALES_SINCE = """
+    SELECT
+        COUNT(*) as total_sales,
+        SUM(t.Price) as total_mana,
+        AVG(t.Price) as avg_price,
+        MIN(t.Price) as min_price,
+        MAX(t.Price) as max_price
+    FROM Transaction t
+    JOIN LAND_Parcel lp ON t.Asset_ID = lp.Asset_ID
+    WHERE t.Timestamp >= %s AND t.Currency = 'MANA'
+"""
+
+# Per-day land-sale aggregates recomputed from raw rows, in Land_Sales_Daily
+# column order; used to backfill the rollup. Param: first timestamp to include
+# (months archived by partitions.py have no raw rows left).
+LAND_SALES_DAILY_FROM_SOURCE = """
+    SELECT
+        t.Currency,
+        DATE(t.Timestamp),
+        COALESCE(lp.District_Name, ''),
+        COUNT(*),
+        SUM(t.Price),
+        MIN(t.Price),
+        MAX(t.Price)
+    FROM Transaction t
+    JOIN LAND_Parcel lp ON t.Asset_ID = lp.Asset_ID
+    WHERE t.Timestamp >= %s
+    GROUP BY t.Currency, DATE(t.Timestamp), COALESCE(lp.District_Name, '')
+"""
+
+# Same totals from the Land_Sales_Daily rollup (migration 4): whole days after
+# the window's first day come from the rollup, and the partial first day from
+# raw rows, so the result matches LAND_SALES_SINCE exactly.
+# Params: first day (date), window start (datetime), first day + 1 (date).
+LAND_SALES_ROLLUP = """
+    SELECT
+        CAST(COALESCE(SUM(x.cnt), 0) AS SIGNED) as total_sales,
+        SUM(x.total) as total_mana,
+        SUM(x.total) / NULLIF(SUM(x.cnt), 0) as avg_price,
+        MIN(x.low) as min_price,
+        MAX(x.high) as max_price
+    FROM (
+        SELECT Sales_Count AS cnt, Price_Sum AS total, Price_Min AS low, Price_Max AS high
+        FROM Land_Sales_Daily
+        WHERE Currency = 'MANA' AND Sale_Date > %s
+        UNION ALL
+        SELECT COUNT(*), SUM(t.Price), MIN(t.Price), MAX(t.Price)
+        FROM Transaction t
+        JOIN LAND_Parcel lp ON t.Asset_ID = lp.Asset_ID
+        WHERE t.Currency = 'MANA' AND t.Timestamp >= %s AND t.Timestamp < %s
+    ) x
+"""
+
+# Per-district breakdown of the rollup report (same params); NULL = no district
+LAND_SALES_BY_DISTRICT_ROLLUP = """
+    SELECT
+        NULLIF(x.district, '') as District_Name,
+        CAST(SUM(x.cnt) AS SIGNED) as total_sales,
+        SUM(x.total) as total_mana,
+        SUM(x.total) / SUM(x.cnt) as avg_price,
+        MIN(x.low) as min_price,
+        MAX(x.high) as max_price
+    FROM (
+        SELECT District_Name AS district, Sales_Count AS cnt, Price_Sum AS total,
+               Price_Min AS low, Price_Max AS high
+        FROM Land_Sales_Daily
+        WHERE Currency = 'MANA' AND Sale_Date > %s
+        UNION ALL
+        SELECT COALESCE(lp.District_Name, ''), COUNT(*), SUM(t.Price), MIN(t.Price), MAX(t.Price)
+        FROM Transaction t
+        JOIN LAND_Parcel lp ON t.Asset_ID = lp.Asset_ID
+        WHERE t.Currency = 'MANA' AND t.Timestamp >= %s AND t.Timestamp < %s
+        GROUP BY COALESCE(lp.District_Name, '')
+    ) x
+    GROUP BY x.district
+    ORDER BY total_mana DESC, x.district
+"""
+
+# Raw-row fallback for the district breakdown when migration 4 is missing
+LAND_SALES_BY_DISTRICT_SINCE = """
+    SELECT
+        lp.District_Name,
+        COUNT(*) as total_sales,
+        SUM(t.Price) as total_mana,
+        AVG(t.Price) as avg_price,
+        MIN(t.Price) as min_price,
+        MAX(t.Price) as max_price
+    FROM Transaction t
+    JOIN LAND_Parcel lp ON t.Asset_ID = lp.Asset_ID
+    WHERE t.Timestamp >= %s AND t.Currency = 'MANA'
+    GROUP BY lp.District_Name
+    ORDER BY total_mana DESC, lp.District_Name
+"""
+
+SEARCH_EVENTS_LIKE = """
+    SELECT
+        e.Event_ID,
+        e.Event_Name,
+        e.Start_Timestamp,
+        e.End_Timestamp,
+        e.Organizer_Address,
+        u.Username as organizer_name,
+        lp.X_Coordinate,
+        lp.Y_Coordinate,
+        lp.District_Name
+    FROM Event e
+    LEFT JOIN User_Profile u ON e.Organizer_Address = u.Wallet_Address
+    LEFT JOIN LAND_Parcel lp ON e.Scene_Parcel_ID = lp.Asset_ID
+    WHERE e.Event_Name LIKE %s
+    ORDER BY e.Start_Timestamp DESC
+"""
+
+# Relevance-ranked search over the FULLTEXT indexes on Event.Event_Name and
+# Event_Tags.Tag (migration 3). Params: boolean query x4, result limit.
+SEARCH_EVENTS_FULLTEXT = """
+    SELECT
+        e.Event_ID,
+        e.Event_Name,
+        e.Start_Timestamp,
+        e.End_Timestamp,
+        e.Organizer_Address,
+        u.Username as organizer_name,
+        lp.X_Coordinate,
+        lp.Y_Coordinate,
+        lp.District_Name,
+        m.relevance
+    FROM (
+        SELECT Event_ID, SUM(score) AS relevance
+        FROM (
+            SELECT Event_ID, MATCH(Event_Name) AGAINST (%s IN BOOLEAN MODE) AS score
+            FROM Event
+            WHERE MATCH(Event_Name) AGAINST (%s IN BOOLEAN MODE)
+            UNION ALL
+            SELECT Event_ID, MATCH(Tag) AGAINST (%s IN BOOLEAN MODE) AS score
+            FROM Event_Tags
+            WHERE MATCH(Tag) AGAINST (%s IN BOOLEAN MODE)
+        ) hits
+        GROUP BY Event_ID
+        ORDER BY relevance DESC
+        LIMIT %s
+    ) m
+    JOIN Event e ON e.Event_ID = m.Event_ID
+    LEFT JOIN User_Profile u ON e.Organizer_Address = u.Wallet_Address
+    LEFT JOIN LAND_Parcel lp ON e.Scene_Parcel_ID = lp.Asset_ID
+    ORDER BY m.relevance DESC, e.Start_Timestamp DESC
+"""
+
+# Assets and votes are aggregated per wallet before joining, so each user
+# contributes one row instead of assets x votes rows.
+VOTER_INFLUENCE = """
+    SELECT
+        u.Wallet_Address,
+        u.Username,
+        COALESCE(a.assets_owned, 0) as land_parcels_owned,
+        COALESCE(v.votes_cast, 0) as votes_cast,
+        COALESCE(v.total_weight, 0) as total_voting_weight,
+        (COALESCE(a.assets_owned, 0) * 10 + COALESCE(v.votes_cast, 0)) as influence_score
+    FROM User_Profile u
+    LEFT JOIN (
+        SELECT Owner_Address, COUNT(*) as assets_owned
+        FROM Digital_Asset
+        GROUP BY Owner_Address
+    ) a ON a.Owner_Address = u.Wallet_Address
+    LEFT JOIN (
+        SELECT Voter_Address, COUNT(*) as votes_cast, SUM(Voting_Weight) as total_weight
+        FROM Vote
+        GROUP BY Voter_Address
+    ) v ON v.Voter_Address = u.Wallet_Address
+    WHERE a.Owner_Address IS NOT NULL OR v.Voter_Address IS NOT NULL
+    ORDER BY influence_score DESC, u.Wallet_Address DESC
+    LIMIT 20
+"""
+
+# Same report served from the trigger-maintained User_Influence table
+# (migration 2): an index-ordered read of the first 20 entries.
+INFLUENCE_LEADERBOARD = """
+    SELECT
+        ui.Wallet_Address,
+        u.Username,
+        ui.Parcels_Owned as land_parcels_owned,
+        ui.Votes_Cast as votes_cast,
+        ui.Total_Weight as total_voting_weight,
+        ui.Score as influence_score
+    FROM User_Influence ui
+    JOIN User_Profile u ON u.Wallet_Address = ui.Wallet_Address
+    WHERE ui.Score > 0
+    ORDER BY ui.Score DESC, ui.Wallet_Address DESC
+    LIMIT 20
+"""
+
+# Tables each cached read depends on; writes to any of them invalidate it
+READ_TABLES = {
+    'dao_proposals': ('DAO_Proposal',),
+    'businesses_after': ('Business', 'User_Profile'),
+    'land_sales': ('Transaction', 'LAND_Parcel', 'Land_Sales_Daily'),
+    'land_sales_by_district': ('Transaction', 'LAND_Parcel', 'Land_Sales_Daily'),
+    'search_events': ('Event', 'Event_Tags', 'User_Profile', 'LAND_Parcel'),
+    'voter_influence': ('User_Influence', 'User_Profile', 'Digital_Asset', 'LAND_Parcel', 'Vote'),
+}
+
+# Per-wallet influence recomputed from the source tables (rebuild/verify)
+INFLUENCE_FROM_SOURCE = """
+    SELECT
+        w.Wallet_Address,
+        COALESCE(a.assets_owned, 0) AS Parcels_Owned,
+        COALESCE(v.votes_cast, 0) AS Votes_Cast,
+        COALESCE(v.total_weight, 0) AS Total_Weight
+    FROM (
+        SELECT Owner_Address AS Wallet_Address FROM Digital_Asset
+        UNION
+        SELECT Voter_Address FROM Vote
+    ) w
+    LEFT JOIN (
+        SELECT Owner_Address, COUNT(*) AS assets_owned
+        FROM Digital_Asset
+        GROUP BY Owner_Address
+    ) a ON a.Owner_Address = w.Wallet_Address
+    LEFT JOIN (
+        SELECT Voter_Address, COUNT(*) AS votes_cast, SUM(Voting_Weight) AS total_weight
+        FROM Vote
+        GROUP BY Voter_Address
+    ) v ON v.Voter_Address = w.Wallet_Address
+"""
+
+
+# ----------------------------------------------------------------------------
+# Write operations 6-9
+# ----------------------------------------------------------------------------
+
+USER_EXISTS = "SELECT Wallet_Address FROM User_Profile WHERE Wallet_Address = %s"
+
+PARCELS_OWNED_BY = """
+    SELECT lp.Asset_ID, lp.X_Coordinate, lp.Y_Coordinate, lp.District_Name
+    FROM LAND_Parcel lp
+    JOIN Digital_Asset da ON lp.Asset_ID = da.Asset_ID
+    WHERE da.Owner_Address = %s
+    ORDER BY lp.Asset_ID
+"""
+
+INSERT_BUSINESS = """
+    INSERT INTO Business (Business_Name, Business_Type, Owner_Address, Date_Established, Parcel_ID)
+    VALUES (%s, %s, %s, CURDATE(), %s)
+"""
+
+ASSET_OWNER = """
+    SELECT Owner_Address FROM Digital_Asset
+    WHERE Asset_ID = %s
+"""
+
+INSERT_SALE = """
+    INSERT INTO Transaction (Transaction_ID, Asset_ID, Seller_Address, Buyer_Address, Price, Currency, Timestamp)
+    VALUES (%s, %s, %s, %s, %s, 'MANA', NOW())
+"""
+
+# Locks the asset row until commit so concurrent sales of it serialize
+ASSET_OWNER_FOR_UPDATE = """
+    SELECT Owner_Address FROM Digital_Asset
+    WHERE Asset_ID = %s
+    FOR UPDATE
+"""
+
+# Compare-and-swap: only moves the asset if the seller still owns it
+TRANSFER_ASSET_OWNER = """
+    UPDATE Digital_Asset
+    SET Owner_Address = %s
+    WHERE Asset_ID = %s AND Owner_Address = %s
+"""
+
+UPCOMING_EVENTS = """
+    SELECT
+        e.Event_ID,
+        e.Event_Name,
+        e.Start_Timestamp,
+        e.End_Timestamp,
+        e.Organizer_Address,
+        u.Username as organizer_name
+    FROM Event e
+    LEFT JOIN User_Profile u ON e.Organizer_Address = u.Wallet_Address
+    WHERE e.Start_Timestamp > NOW()
+    ORDER BY e.Start_Timestamp ASC
+"""
+
+UPDATE_EVENT_TIMES = """
+    UPDATE Event
+    SET Start_Timestamp = %s, End_Timestamp = %s
+    WHERE Event_ID = %s
+"""
+
+# Everything the scheduling index needs, for events that have not ended yet
+SCHEDULED_EVENTS = """
+    SELECT e.Event_ID, e.Start_Timestamp, e.End_Timestamp, e.Scene_Parcel_ID, e.Organizer_Address,
+           lp.District_Name
+    FROM Event e
+    LEFT JOIN LAND_Parcel lp ON lp.Asset_ID = e.Scene_Parcel_ID
+    WHERE e.End_Timestamp > NOW()
+"""
+EVENT_SLOT = """
+    SELECT e.Event_ID, e.Start_Timestamp, e.End_Timestamp, e.Scene_Parcel_ID, e.Organizer_Address,
+           lp.District_Name
+    FROM Event e
+    LEFT JOIN LAND_Parcel lp ON lp.Asset_ID = e.Scene_Parcel_ID
+    WHERE e.Event_ID = %s
+"""
+# Event first: it is the table the scheduling index writes through
+SCHEDULE_TABLES = ('Event', 'LAND_Parcel')
+
+# One set-based statement for a district-wide shift (already validated in full)
+SHIFT_DISTRICT_EVENTS = """
+    UPDATE Event e
+    JOIN LAND_Parcel lp ON lp.Asset_ID = e.Scene_Parcel_ID
+    SET e.Start_Timestamp = e.Start_Timestamp + INTERVAL %s SECOND,
+        e.End_Timestamp = e.End_Timestamp + INTERVAL %s SECOND
+    WHERE lp.District_Name = %s AND e.Start_Timestamp > %s
+"""
+
+USERNAME_OF = "SELECT Username FROM User_Profile WHERE Wallet_Address = %s"
+
+# (label, statement) in the order delete_user() runs them
+DELETE_USER_STEPS = [
+    ('votes_deleted', "DELETE FROM Vote WHERE Voter_Address = %s"),
+    # Votes on the user's proposals are deleted explicitly rather than through
+    # the FK cascade, because cascaded deletes do not fire the Vote triggers.
+    ('proposal_votes_deleted', """
+        DELETE v FROM Vote v
+        JOIN DAO_Proposal p ON v.Proposal_ID = p.Proposal_ID
+        WHERE p.Creator_Address = %s
+    """),
+    ('attends_deleted', "DELETE FROM ATTENDS WHERE Wallet_Address = %s"),
+    ('proposals_deleted', "DELETE FROM DAO_Proposal WHERE Creator_Address = %s"),
+    ('businesses_updated', "UPDATE Business SET Owner_Address = NULL WHERE Owner_Address = %s"),
+    ('events_updated', "UPDATE Event SET Organizer_Address = NULL WHERE Organizer_Address = %s"),
+    ('scenes_updated', "UPDATE Scene_Content SET Creator_Address = NULL WHERE Creator_Address = %s"),
+    ('sales_cleared', "UPDATE Transaction SET Seller_Address = NULL WHERE Seller_Address = %s"),
+    ('purchases_cleared', "UPDATE Transaction SET Buyer_Address = NULL WHERE Buyer_Address = %s"),
+    ('user_deleted', "DELETE FROM User_Profile WHERE Wallet_Address = %s"),
+]
+# Set-based form of DELETE_USER_STEPS for bulk purges: each step joins the
+# Purge_Wallet temporary table instead of binding one wallet.
+PURGE_WALLET_TABLE = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS Purge_Wallet
+    (
+        Wallet_Address CHAR(42) PRIMARY KEY
+    )
+"""
+PURGE_DROP_UNKNOWN = """
+    DELETE w FROM Purge_Wallet w
+    LEFT JOIN User_Profile u ON u.Wallet_Address = w.Wallet_Address
+    WHERE u.Wallet_Address IS NULL
+"""
+# Digital_Asset.Owner_Address is ON DELETE RESTRICT, so asset owners cannot be purged
+PURGE_ASSET_OWNERS = """
+    SELECT DISTINCT w.Wallet_Address
+    FROM Purge_Wallet w
+    JOIN Digital_Asset da ON da.Owner_Address = w.Wallet_Address
+"""
+PURGE_WALLET_STEPS = [
+    ('votes_deleted', """
+        DELETE v FROM Vote v
+        JOIN Purge_Wallet w ON v.Voter_Address = w.Wallet_Address
+    """),
+    ('proposal_votes_deleted', """
+        DELETE v FROM Vote v
+        JOIN DAO_Proposal p ON v.Proposal_ID = p.Proposal_ID
+        JOIN Purge_Wallet w ON p.Creator_Address = w.Wallet_Address
+    """),
+    ('attends_deleted', """
+        DELETE a FROM ATTENDS a
+        JOIN Purge_Wallet w ON a.Wallet_Address = w.Wallet_Address
+    """),
+    ('proposals_deleted', """
+        DELETE p FROM DAO_Proposal p
+        JOIN Purge_Wallet w ON p.Creator_Address = w.Wallet_Address
+    """),
+    ('businesses_updated', """
+        UPDATE Business b
+        JOIN Purge_Wallet w ON b.Owner_Address = w.Wallet_Address
+        SET b.Owner_Address = NULL
+    """),
+    ('events_updated', """
+        UPDATE Event e
+        JOIN Purge_Wallet w ON e.Organizer_Address = w.Wallet_Address
+        SET e.Organizer_Address = NULL
+    """),
+    ('scenes_updated', """
+        UPDATE Scene_Content sc
+        JOIN Purge_Wallet w ON sc.Creator_Address = w.Wallet_Address
+        SET sc.Creator_Address = NULL
+    """),
+    ('sales_cleared', """
+        UPDATE Transaction t
+        JOIN Purge_Wallet w ON t.Seller_Address = w.Wallet_Address
+        SET t.Seller_Address = NULL
+    """),
+    ('purchases_cleared', """
+        UPDATE Transaction t
+        JOIN Purge_Wallet w ON t.Buyer_Address = w.Wallet_Address
+        SET t.Buyer_Address = NULL
+    """),
+    ('user_deleted', """
+        DELETE u FROM User_Profile u
+        JOIN Purge_Wallet w ON u.Wallet_Address = w.Wallet_Address
+    """),
+]
+# Sales moved to Transaction_Archive by partitions.py (migration 6). Run after
+# the steps above; on a database without the archive table they are skipped.
+ARCHIVE_DELETE_USER_STEPS = [
+    ('archived_sales_cleared', "UPDATE Transaction_Archive SET Seller_Address = NULL WHERE Seller_Address = %s"),
+    ('archived_purchases_cleared', "UPDATE Transaction_Archive SET Buyer_Address = NULL WHERE Buyer_Address = %s"),
+]
+ARCHIVE_PURGE_WALLET_STEPS = [
+    ('archived_sales_cleared', """
+        UPDATE Transaction_Archive t
+        JOIN Purge_Wallet w ON t.Seller_Address = w.Wallet_Address
+        SET t.Seller_Address = NULL
+    """),
+    ('archived_purchases_cleared', """
+        UPDATE Transaction_Archive t
+        JOIN Purge_Wallet w ON t.Buyer_Address = w.Wallet_Address
+        SET t.Buyer_Address = NULL
+    """),
+]
+DELETE_USER_TABLES = (
+    'Vote', 'ATTENDS', 'DAO_Proposal', 'Business', 'Event', 'Scene_Content',
+    'Transaction', 'User_Profile', 'User_Influence'
+)
+
+
+# ----------------------------------------------------------------------------
+# Exports (full history, streamed by export.py)
+# ----------------------------------------------------------------------------
+
+EXPORT_TRANSACTIONS = """
+    SELECT Transaction_ID, Timestamp, Price, Currency, Asset_ID, Seller_Address, Buyer_Address
+    FROM Transaction
+    ORDER BY Timestamp, Transaction_ID
+"""
+
+# Half-open window on the bare column, so a partitioned Transaction only
+# reads the months it covers (a function around Timestamp would read them all)
+EXPORT_TRANSACTIONS_BETWEEN = """
+    SELECT Transaction_ID, Timestamp, Price, Currency, Asset_ID, Seller_Address, Buyer_Address
+    FROM Transaction
+    WHERE Timestamp >= %s AND Timestamp < %s
+    ORDER BY Timestamp, Transaction_ID
+"""
+
+EXPORT_VOTES = """
+    SELECT Proposal_ID, Voter_Address, Vote_Choice, Voting_Weight, Timestamp
+    FROM Vote
+    ORDER BY Timestamp, Proposal_ID, Voter_Address
+"""
+
+
+# ----------------------------------------------------------------------------
+# Spatial index (loaded whole by spatial.py)
+# ----------------------------------------------------------------------------
+
+PARCEL_LOCATIONS = """
+    SELECT lp.Asset_ID, lp.X_Coordinate, lp.Y_Coordinate, lp.District_Name, da.Owner_Address
+    FROM LAND_Parcel lp
+    JOIN Digital_Asset da ON da.Asset_ID = lp.Asset_ID
+"""
+PARCEL_LOCATION_TABLES = ('LAND_Parcel', 'Digital_Asset')
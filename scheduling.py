@@ -0,0 +1,235 @@
+"""
+MINI WORLD - GENESIS CITY
+Event Scheduling Index
+
+Two events clash when their [start, end) windows overlap and they share a
+scene parcel or an organizer. EventSchedule keeps the events that have not
+ended yet in one IntervalIndex per parcel and one per organizer. Checking a
+proposed slot is then a bisect per group instead of a query, and a batch of
+moves (a district-wide shift) is validated as a whole before anything is
+written.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+
+
+class IntervalIndex:
+    """Half-open [start, end) intervals sorted by start, with a running maximum of ends.
+
+    Every interval that starts before `end` sits left of one bisect point, and
+    the running maximum tells how far back any of them can still reach past
+    `start`. That makes "is anything in the way?" O(log n), and listing the
+    clashes O(log n) plus one step per interval walked.
+    """
+
+    def __init__(self):
+        self._entries = []            # (start, end, key), sorted
+        self._max_end = []            # max end over _entries[:i + 1]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _recompute(self, i):
+        del self._max_end[i:]
+        running = self._max_end[i - 1] if i else None
+        for _, end, _ in self._entries[i:]:
+            if running is None or end > running:
+                running = end
+            self._max_end.append(running)
+
+    def add(self, start, end, key):
+        i = bisect_right(self._entries, (start, end, key))
+        self._entries.insert(i, (start, end, key))
+        self._recompute(i)
+
+    def remove(self, start, end, key):
+        i = bisect_left(self._entries, (start, end, key))
+        if i < len(self._entries) and self._entries[i] == (start, end, key):
+            del self._entries[i]
+            self._recompute(i)
+
+    def any_overlap(self, start, end):
+        i = bisect_left(self._entries, (end,))
+        return i > 0 and self._max_end[i - 1] > start
+
+    def overlapping(self, start, end):
+        """Keys of the intervals that intersect [start, end)."""
+        # Entries left of i start before `end`; walk back while one could still end after `start`
+        i = bisect_left(self._entries, (end,)) - 1
+        found = []
+        while i >= 0 and self._max_end[i] > start:
+            _, other_end, key = self._entries[i]
+            if other_end > start:
+                found.append(key)
+            i -= 1
+        return found
+
+
+class ScheduledEvent:
+    __slots__ = ('event_id', 'start', 'end', 'parcel', 'organizer', 'district')
+
+    def __init__(self, event_id, start, end, parcel=None, organizer=None, district=None):
+        self.event_id = event_id
+        self.start = start
+        self.end = end
+        self.parcel = parcel
+        self.organizer = organizer
+        self.district = district
+
+    def groups(self):
+        """(scope, key) of every group this event must not overlap within."""
+        if self.parcel is not None:
+            yield 'parcel', self.parcel
+        if self.organizer is not None:
+            yield 'organizer', self.organizer
+
+
+class EventSchedule:
+    """Interval indexes over the events that have not ended, grouped by parcel and organizer.
+
+    `versions` returns the query cache's version snapshot of the tables the
+    schedule mirrors. Writers that go through apply() account for their own
+    bump of those versions; any other change, or an age over `max_age`
+    seconds (writes from other processes), reloads the schedule via `loader`.
+    """
+
+    def __init__(self, loader, versions, max_age=30.0, clock=time.monotonic):
+        self._loader = loader         # loader(conn) -> iterable of ScheduledEvent
+        self._versions_of = versions
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._events = None
+        self._groups = {}             # (scope, key) -> IntervalIndex
+        self._by_district = {}        # district -> set of event ids
+        self._versions = None
+        self._applied = 0
+        self._loaded_at = 0.0
+        self.loads = 0
+
+    def __contains__(self, event_id):
+        return self._events is not None and event_id in self._events
+
+    def _is_current(self, versions):
+        if self._events is None or self._clock() - self._loaded_at >= self.max_age:
+            return False
+        epoch, *tables = versions
+        loaded_epoch, *loaded_tables = self._versions
+        # Only the first table (Event) is written through apply()
+        return (epoch == loaded_epoch and tables[1:] == loaded_tables[1:]
+                and tables[0] - loaded_tables[0] == self._applied)
+
+    def _reset(self):
+        self._events = {}
+        self._groups = {}
+        self._by_district = {}
+
+    @contextmanager
+    def locked(self, conn):
+        """Yield the up-to-date schedule; the lock is held so check-then-write is atomic in-process."""
+        with self._lock:
+            versions = self._versions_of()
+            if not self._is_current(versions):
+                self._reset()
+                for event in self._loader(conn):
+                    self.add(event)
+                self._versions = versions
+                self._applied = 0
+                self._loaded_at = self._clock()
+                self.loads += 1
+            yield self
+
+    def add(self, event):
+        self._events[event.event_id] = event
+        for group in event.groups():
+            self._groups.setdefault(group, IntervalIndex()).add(event.start, event.end, event.event_id)
+        if event.district is not None:
+            self._by_district.setdefault(event.district, set()).add(event.event_id)
+
+    def _move(self, event, start, end):
+        for group in event.groups():
+            index = self._groups[group]
+            index.remove(event.start, event.end, event.event_id)
+            index.add(start, end, event.event_id)
+        event.start = start
+        event.end = end
+
+    def district_slots(self, district, after):
+        """{event_id: (start, end)} for events in `district` starting after `after`."""
+        slots = {}
+        for event_id in self._by_district.get(district, ()):
+            event = self._events[event_id]
+            if event.start > after:
+                slots[event_id] = (event.start, event.end)
+        return slots
+
+    def conflicts(self, moves):
+        """Clashes the `moves` ({event_id: (start, end)}) would create, as dict rows.
+
+        Moving events are checked against the events that stay put and
+        against each other's new slots; their old slots are ignored.
+        """
+        found = []
+        moved_groups = {}
+        for event_id, (start, end) in moves.items():
+            event = self._events[event_id]
+            for group in event.groups():
+                moved_groups.setdefault(group, []).append((start, end, event_id))
+                index = self._groups.get(group)
+                if index is None or not index.any_overlap(start, end):
+                    continue
+                for other_id in index.overlapping(start, end):
+                    if other_id not in moves:
+                        other = self._events[other_id]
+                        found.append(self._conflict(event_id, start, end, group, other_id, other.start, other.end))
+
+        for group, slots in moved_groups.items():
+            # Sweep the moved slots in start order against the furthest-reaching one so far
+            slots.sort()
+            reach = None
+            for start, end, event_id in slots:
+                if reach is not None and start < reach[0]:
+                    other_start, other_id = reach[1], reach[2]
+                    found.append(self._conflict(event_id, start, end, group, other_id, other_start, reach[0]))
+                if reach is None or end > reach[0]:
+                    reach = (end, start, event_id)
+        found.sort(key=lambda row: (row['Event_ID'], row['Conflicts_With']))
+        return found
+
+    @staticmethod
+    def _conflict(event_id, start, end, group, other_id, other_start, other_end):
+        scope, key = group
+        return {
+            'Event_ID': event_id,
+            'Start_Timestamp': start,
+            'End_Timestamp': end,
+            'Scope': scope,
+            'Shared': key,
+            'Conflicts_With': other_id,
+            'Other_Start': other_start,
+            'Other_End': other_end,
+        }
+
+    def apply(self, moves):
+        """Record committed moves; call once per write, after its notify_tables_written()."""
+        for event_id, (start, end) in moves.items():
+            self._move(self._events[event_id], start, end)
+        self._applied += 1
+
+    def invalidate(self):
+        """Force a reload on next use (the database no longer matches the index)."""
+        with self._lock:
+            self._events = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'events': len(self._events or {}),
+                'groups': len(self._groups),
+                'districts': len(self._by_district),
+                'loads': self.loads,
+                'age_s': round(self._clock() - self._loaded_at, 1) if self._events is not None else None,
+            }
@@ -0,0 +1,361 @@
+"""
+MINI WORLD - GENESIS CITY
+Spatial Parcel Index
+
+LAND_Parcel only has a UNIQUE(X, Y) key, so "parcels within R of (x, y)",
+map-tile bounding boxes and "adjacent parcels with the same owner" all end up
+scanning the table. This module keeps every parcel's location and owner in an
+in-process grid of square tiles (about 90k parcels for the full Genesis City
+map) and answers those questions from memory:
+
+    parcels_in_box     bounding box / map tile
+    parcels_near       radius or k-nearest, optionally for one owner
+    estates            contiguous same-owner groups (4-neighbour adjacency)
+
+The grid follows ownership changes two ways: transfer_asset() reports each
+sale through main_app.OWNERSHIP_LISTENERS and the parcel is updated in place,
+while any other write to LAND_Parcel or Digital_Asset (seen through the query
+cache's table versions) or an age over `max_age` triggers a full reload.
+"""
+
+import heapq
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from pymysql.cursors import Cursor
+
+import queries
+from main_app import OWNERSHIP_LISTENERS, QUERY_CACHE, InvalidRequest, borrowed_connection
+
+
+TILE_SIZE = 16
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class Parcel:
+    __slots__ = ('asset_id', 'x', 'y', 'district', 'owner')
+
+    def __init__(self, asset_id, x, y, district=None, owner=None):
+        self.asset_id = asset_id
+        self.x = x
+        self.y = y
+        self.district = district
+        self.owner = owner
+
+    def as_row(self):
+        return {
+            'Asset_ID': self.asset_id,
+            'X_Coordinate': self.x,
+            'Y_Coordinate': self.y,
+            'District_Name': self.district,
+            'Owner_Address': self.owner,
+        }
+
+
+def _ring(cx, cy, radius):
+    """Tiles at Chebyshev distance exactly `radius` from tile (cx, cy)."""
+    if radius == 0:
+        yield (cx, cy)
+        return
+    for tx in range(cx - radius, cx + radius + 1):
+        yield (tx, cy - radius)
+        yield (tx, cy + radius)
+    for ty in range(cy - radius + 1, cy + radius):
+        yield (cx - radius, ty)
+        yield (cx + radius, ty)
+
+
+# ============================================================================
+# GRID
+# ============================================================================
+
+class ParcelGrid:
+    """Parcels bucketed into `tile` x `tile` squares, with owner and coordinate lookups."""
+
+    def __init__(self, parcels=(), tile=TILE_SIZE):
+        self.tile = tile
+        self._tiles = {}       # (tx, ty) -> [Parcel]
+        self._by_id = {}       # asset id -> Parcel
+        self._by_xy = {}       # (x, y) -> Parcel
+        self._by_owner = {}    # owner -> set of asset ids
+        self._bounds = None    # (min tx, min ty, max tx, max ty)
+        for parcel in parcels:
+            self.add(parcel)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def add(self, parcel):
+        key = (parcel.x // self.tile, parcel.y // self.tile)
+        self._tiles.setdefault(key, []).append(parcel)
+        self._by_id[parcel.asset_id] = parcel
+        self._by_xy[(parcel.x, parcel.y)] = parcel
+        self._by_owner.setdefault(parcel.owner, set()).add(parcel.asset_id)
+        if self._bounds is None:
+            self._bounds = key + key
+        else:
+            x0, y0, x1, y1 = self._bounds
+            self._bounds = (min(x0, key[0]), min(y0, key[1]), max(x1, key[0]), max(y1, key[1]))
+
+    def set_owner(self, asset_id, owner):
+        """Move one parcel to a new owner; returns False if `asset_id` is not a parcel."""
+        parcel = self._by_id.get(asset_id)
+        if parcel is None:
+            return False
+        owned = self._by_owner.get(parcel.owner)
+        if owned is not None:
+            owned.discard(asset_id)
+            if not owned:
+                del self._by_owner[parcel.owner]
+        parcel.owner = owner
+        self._by_owner.setdefault(owner, set()).add(asset_id)
+        return True
+
+    def at(self, x, y):
+        return self._by_xy.get((x, y))
+
+    def in_box(self, x0, y0, x1, y1):
+        """Parcels with x0 <= X <= x1 and y0 <= Y <= y1, in row order."""
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        if self._bounds is None:
+            return []
+        t = self.tile
+        bx0, by0, bx1, by1 = self._bounds
+        found = []
+        for tx in range(max(x0 // t, bx0), min(x1 // t, bx1) + 1):
+            for ty in range(max(y0 // t, by0), min(y1 // t, by1) + 1):
+                for parcel in self._tiles.get((tx, ty), ()):
+                    if x0 <= parcel.x <= x1 and y0 <= parcel.y <= y1:
+                        found.append(parcel)
+        found.sort(key=lambda parcel: (parcel.y, parcel.x))
+        return found
+
+    def within(self, x, y, radius):
+        """Parcels whose centre is at most `radius` from (x, y), nearest first."""
+        limit = radius * radius
+        found = [
+            parcel for parcel in self.in_box(x - math.floor(radius), y - math.floor(radius),
+                                             x + math.floor(radius), y + math.floor(radius))
+            if (parcel.x - x) ** 2 + (parcel.y - y) ** 2 <= limit
+        ]
+        found.sort(key=lambda parcel: ((parcel.x - x) ** 2 + (parcel.y - y) ** 2, parcel.y, parcel.x))
+        return found
+
+    def nearest(self, x, y, k=10, owner=None):
+        """The `k` parcels closest to (x, y), optionally only those owned by `owner`."""
+        def key(parcel):
+            return ((parcel.x - x) ** 2 + (parcel.y - y) ** 2, parcel.y, parcel.x)
+
+        if k <= 0 or not self._by_id:
+            return []
+        if owner is not None:
+            owned = (self._by_id[asset_id] for asset_id in self._by_owner.get(owner, ()))
+            return heapq.nsmallest(k, owned, key=key)
+
+        # Scan rings of tiles outwards until nothing unscanned can beat the k-th best
+        t = self.tile
+        cx, cy = x // t, y // t
+        bx0, by0, bx1, by1 = self._bounds
+        last_ring = max(cx - bx0, bx1 - cx, cy - by0, by1 - cy, 0)
+        candidates = []
+        for radius in range(last_ring + 1):
+            for tile in _ring(cx, cy, radius):
+                candidates.extend(self._tiles.get(tile, ()))
+            if len(candidates) < k:
+                continue
+            best = heapq.nsmallest(k, candidates, key=key)
+            margin = 1 + min(x - (cx - radius) * t, (cx + radius + 1) * t - 1 - x,
+                             y - (cy - radius) * t, (cy + radius + 1) * t - 1 - y)
+            if key(best[-1])[0] <= margin * margin:
+                return best
+            candidates = best
+        return heapq.nsmallest(k, candidates, key=key)
+
+    def _flood(self, start, seen):
+        members = [start]
+        seen.add(start.asset_id)
+        index = 0
+        while index < len(members):
+            parcel = members[index]
+            index += 1
+            for dx, dy in NEIGHBOURS:
+                other = self._by_xy.get((parcel.x + dx, parcel.y + dy))
+                if other is not None and other.owner == start.owner and other.asset_id not in seen:
+                    seen.add(other.asset_id)
+                    members.append(other)
+        return members
+
+    def estate_at(self, x, y):
+        """Every parcel connected to (x, y) through edge-adjacent parcels with its owner."""
+        start = self._by_xy.get((x, y))
+        if start is None:
+            return []
+        return self._flood(start, set())
+
+    def estates(self, owner=None, min_size=2):
+        """Contiguous same-owner groups of at least `min_size` parcels, largest first."""
+        owners = [owner] if owner is not None else list(self._by_owner)
+        groups = []
+        for wallet in owners:
+            owned = self._by_owner.get(wallet)
+            if not owned or wallet is None or len(owned) < min_size:
+                continue
+            seen = set()
+            for asset_id in sorted(owned):
+                if asset_id not in seen:
+                    members = self._flood(self._by_id[asset_id], seen)
+                    if len(members) >= min_size:
+                        groups.append(members)
+        groups.sort(key=lambda members: (-len(members), members[0].owner, members[0].asset_id))
+        return groups
+
+    def stats(self):
+        return {
+            'parcels': len(self._by_id),
+            'tiles': len(self._tiles),
+            'owners': len(self._by_owner),
+            'tile_size': self.tile,
+        }
+
+
+# ============================================================================
+# LIVE INDEX
+# ============================================================================
+
+class SpatialIndex:
+    """A ParcelGrid over the database, reloaded when the tables it mirrors change.
+
+    Sales made through transfer_asset() arrive via owner_changed() and are
+    applied in place; each one accounts for one Digital_Asset version bump.
+    Any bump that was not accounted for (bulk imports, deletes, raw SQL) or
+    a grid older than `max_age` seconds causes a reload on next use.
+    """
+
+    def __init__(self, tile=TILE_SIZE, max_age=300.0, clock=time.monotonic):
+        self.tile = tile
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._grid = None
+        self._versions = None
+        self._applied = 0
+        self._loaded_at = 0.0
+        self.loads = 0
+        self.updates = 0
+
+    def _is_current(self, versions):
+        if self._grid is None or self._clock() - self._loaded_at >= self.max_age:
+            return False
+        epoch, parcels, assets = versions
+        loaded_epoch, loaded_parcels, loaded_assets = self._versions
+        return (epoch, parcels) == (loaded_epoch, loaded_parcels) and assets - loaded_assets == self._applied
+
+    def _load(self, conn):
+        grid = ParcelGrid(tile=self.tile)
+        with borrowed_connection(conn) as conn, conn.cursor(Cursor) as cursor:
+            cursor.execute(queries.PARCEL_LOCATIONS)
+            for asset_id, x, y, district, owner in cursor.fetchall():
+                grid.add(Parcel(asset_id, x, y, district, owner))
+        return grid
+
+    @contextmanager
+    def locked(self, conn=None):
+        """Yield an up-to-date grid, holding the lock so sales cannot change it mid-query."""
+        with self._lock:
+            # Snapshot before loading: a write racing the load leaves the grid stale
+            versions = QUERY_CACHE.versions(*queries.PARCEL_LOCATION_TABLES)
+            if not self._is_current(versions):
+                self._grid = self._load(conn)
+                self._versions = versions
+                self._applied = 0
+                self._loaded_at = self._clock()
+                self.loads += 1
+            yield self._grid
+
+    def owner_changed(self, asset_id, owner):
+        """OWNERSHIP_LISTENERS hook: apply one committed sale to the loaded grid."""
+        with self._lock:
+            if self._grid is None:
+                return
+            self._applied += 1
+            if self._grid.set_owner(asset_id, owner):
+                self.updates += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._grid = None
+
+    def stats(self):
+        with self._lock:
+            stats = self._grid.stats() if self._grid is not None else {'parcels': 0}
+            stats.update(
+                loads=self.loads,
+                updates=self.updates,
+                age_s=round(self._clock() - self._loaded_at, 1) if self._grid is not None else None,
+            )
+            return stats
+
+
+PARCEL_INDEX = SpatialIndex()
+OWNERSHIP_LISTENERS.append(PARCEL_INDEX.owner_changed)
+
+
+# ============================================================================
+# QUERIES (dict rows, like the main_app fetch_* functions)
+# ============================================================================
+
+def _distance_row(parcel, x, y):
+    return {**parcel.as_row(), 'Distance': round(math.hypot(parcel.x - x, parcel.y - y), 2)}
+
+
+def parcels_in_box(x0, y0, x1, y1, conn=None):
+    """Parcels inside the inclusive rectangle (x0, y0)-(x1, y1), in row order."""
+    with PARCEL_INDEX.locked(conn) as grid:
+        return [parcel.as_row() for parcel in grid.in_box(x0, y0, x1, y1)]
+
+
+def parcels_near(x, y, radius=None, k=None, owner=None, conn=None):
+    """Parcels within `radius` of (x, y), or the `k` nearest (default 10), nearest first."""
+    if radius is not None and radius < 0:
+        raise InvalidRequest("Radius cannot be negative.")
+    if k is not None and k <= 0:
+        raise InvalidRequest("k must be positive.")
+    with PARCEL_INDEX.locked(conn) as grid:
+        if radius is None:
+            found = grid.nearest(x, y, k or 10, owner=owner)
+        else:
+            found = [parcel for parcel in grid.within(x, y, radius)
+                     if owner is None or parcel.owner == owner]
+            if k is not None:
+                found = found[:k]
+        return [_distance_row(parcel, x, y) for parcel in found]
+
+
+def _estate_row(members):
+    xs = [parcel.x for parcel in members]
+    ys = [parcel.y for parcel in members]
+    return {
+        'Owner_Address': members[0].owner,
+        'Parcels': len(members),
+        'X_Min': min(xs), 'Y_Min': min(ys), 'X_Max': max(xs), 'Y_Max': max(ys),
+        'Asset_IDs': sorted(parcel.asset_id for parcel in members),
+    }
+
+
+def estates(owner=None, min_size=2, limit=20, conn=None):
+    """The `limit` largest contiguous estates, optionally for a single owner."""
+    if min_size < 1:
+        raise InvalidRequest("Minimum estate size must be at least 1.")
+    with PARCEL_INDEX.locked(conn) as grid:
+        groups = grid.estates(owner=owner, min_size=min_size)
+        return [_estate_row(members) for members in groups[:limit]]
+
+
+def estate_at(x, y, conn=None):
+    """The estate containing parcel (x, y), or None if there is no parcel there."""
+    with PARCEL_INDEX.locked(conn) as grid:
+        members = grid.estate_at(x, y)
+        return _estate_row(members) if members else None
@@ -0,0 +1,143 @@
+"""bulk_sales row parsing and the in-memory ownership chain walk of _validate_chunk."""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from bulk_sales import IngestReport, _validate_chunk, parse_sale
+
+
+ALICE = '0x' + 'a' * 40
+BOB = '0x' + 'b' * 40
+CAROL = '0x' + 'c' * 40
+DAVE = '0x' + 'd' * 40
+
+
+def record(**overrides):
+    row = {'asset_id': 'LAND-1', 'seller': ALICE, 'buyer': BOB, 'price': '12.5'}
+    row.update(overrides)
+    return row
+
+
+# ============================================================================
+# parse_sale
+# ============================================================================
+
+def test_defaults_and_normalisation():
+    sale = parse_sale(record(currency='eth', timestamp='2025-03-01T10:00:00'))
+    assert sale['currency'] == 'ETH'
+    assert sale['price'] == Decimal('12.5')
+    assert sale['timestamp'].isoformat() == '2025-03-01T10:00:00'
+    assert sale['transaction_id'].startswith('0x') and len(sale['transaction_id']) == 66
+    assert parse_sale(record())['currency'] == 'MANA'
+
+
+def test_json_lines_are_decoded():
+    assert parse_sale(json.dumps(record(price=3)))['price'] == Decimal('3')
+
+
+@pytest.mark.parametrize('raw, reason', [
+    ('{"asset_id": ', "not valid JSON"),
+    ('[1, 2]', "not a JSON object"),
+    (record(buyer=''), "are required"),
+    (record(seller='0x123'), "seller is not a 42-character"),
+    (record(buyer=ALICE), "same wallet"),
+    (record(currency='BTC'), "currency must be one of"),
+    (record(transaction_id='0xabc'), "66-character"),
+    (record(price='ten'), "not a number"),
+    (record(price='NaN'), "not a finite number"),
+    (record(price='Infinity'), "not a finite number"),
+    (record(price='0'), "must be positive"),
+    (record(price='-1'), "must be positive"),
+    (record(price='1e10'), "must be below"),
+    (record(timestamp='yesterday'), "not ISO 8601"),
+])
+def test_rejections(raw, reason):
+    with pytest.raises(ValueError, match=reason):
+        parse_sale(raw)
+
+
+def test_price_just_below_the_column_limit_is_accepted():
+    assert parse_sale(record(price='9999999999.9999999999'))['price'] < Decimal('1e10')
+
+
+# ============================================================================
+# _validate_chunk
+# ============================================================================
+
+class FakeCursor:
+    """Answers the three lookups _validate_chunk makes, from in-memory tables."""
+
+    def __init__(self, owners, wallets, used_ids=()):
+        self.owners = owners
+        self.wallets = set(wallets)
+        self.used_ids = set(used_ids)
+        self.rows = []
+
+    def execute(self, sql, params):
+        if 'FROM Digital_Asset' in sql:
+            self.rows = [{'Asset_ID': a, 'Owner_Address': self.owners[a]} for a in params if a in self.owners]
+        elif 'FROM User_Profile' in sql:
+            self.rows = [{'Wallet_Address': w} for w in params if w in self.wallets]
+        else:
+            self.rows = [{'Transaction_ID': t} for t in params if t in self.used_ids]
+
+    def fetchall(self):
+        return self.rows
+
+
+def tx(n):
+    return '0x' + f"{n:064x}"
+
+
+def chunk_of(*sales):
+    return [(line, parse_sale(record(transaction_id=tx(line), **sale))) for line, sale in enumerate(sales, 1)]
+
+
+def validate(cursor, chunk):
+    report = IngestReport()
+    accepted = _validate_chunk(cursor, chunk, report)
+    return accepted, [(line, reason) for line, reason, _ in report.rejected]
+
+
+def test_resales_within_a_chunk_follow_the_chain():
+    cursor = FakeCursor({'LAND-1': ALICE}, [ALICE, BOB, CAROL])
+    accepted, rejected = validate(cursor, chunk_of(
+        {'seller': ALICE, 'buyer': BOB},
+        {'seller': BOB, 'buyer': CAROL},
+        {'seller': CAROL, 'buyer': ALICE},
+    ))
+    assert [(s['seller'], s['buyer']) for s in accepted] == [(ALICE, BOB), (BOB, CAROL), (CAROL, ALICE)]
+    assert rejected == []
+
+
+def test_a_broken_link_is_rejected_and_the_chain_continues_from_the_real_owner():
+    cursor = FakeCursor({'LAND-1': ALICE}, [ALICE, BOB, CAROL, DAVE])
+    accepted, rejected = validate(cursor, chunk_of(
+        {'seller': ALICE, 'buyer': BOB},
+        {'seller': CAROL, 'buyer': DAVE},      # CAROL never owned it
+        {'seller': BOB, 'buyer': DAVE},
+    ))
+    assert [s['buyer'] for s in accepted] == [BOB, DAVE]
+    assert rejected == [(2, f"seller does not own LAND-1 (owner {BOB})")]
+
+
+def test_unknown_asset_and_buyer_are_rejected():
+    cursor = FakeCursor({'LAND-1': ALICE}, [ALICE])
+    accepted, rejected = validate(cursor, chunk_of(
+        {'asset_id': 'LAND-404'},
+        {'buyer': CAROL},
+    ))
+    assert accepted == []
+    assert rejected == [(1, "asset LAND-404 does not exist"), (2, f"buyer {CAROL} does not exist")]
+
+
+def test_duplicate_ids_already_recorded_or_repeated_in_the_chunk():
+    cursor = FakeCursor({'LAND-1': ALICE, 'LAND-2': ALICE}, [ALICE, BOB], used_ids=[tx(1)])
+    chunk = chunk_of({}, {'asset_id': 'LAND-2'})
+    # Line 1 was rejected, so this is a valid LAND-1 sale except for reusing line 2's ID
+    repeat = (3, dict(chunk[1][1], asset_id='LAND-1'))
+    accepted, rejected = validate(cursor, chunk + [repeat])
+    assert [s['asset_id'] for s in accepted] == ['LAND-2']
+    assert rejected == [(1, f"duplicate transaction_id {tx(1)}"), (3, f"duplicate transaction_id {tx(2)}")]
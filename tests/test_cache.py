@@ -0,0 +1,128 @@
+"""QueryCache table-version invalidation, TTL and LRU eviction, and TTLCache expiry."""
+
+from cache import MISSING, QueryCache, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def load_counter():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return len(calls)
+    return loader, calls
+
+
+def test_hit_after_load():
+    cache = QueryCache()
+    loader, calls = load_counter()
+    assert cache.get_or_load('q', (1,), ('A',), loader) == (1, False)
+    assert cache.get_or_load('q', (1,), ('A',), loader) == (1, True)
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_params_are_part_of_the_key():
+    cache = QueryCache()
+    loader, calls = load_counter()
+    cache.get_or_load('q', (1,), ('A',), loader)
+    assert cache.get_or_load('q', (2,), ('A',), loader) == (2, False)
+    assert cache.get_or_load('other', (1,), ('A',), loader) == (3, False)
+
+
+def test_bumping_a_read_table_makes_the_entry_stale():
+    cache = QueryCache()
+    loader, _ = load_counter()
+    cache.get_or_load('q', (), ('A', 'B'), loader)
+    cache.bump('B')
+    assert cache.get_or_load('q', (), ('A', 'B'), loader) == (2, False)
+    assert cache.stats()['stale'] == 1
+
+
+def test_bumping_an_unrelated_table_keeps_the_entry():
+    cache = QueryCache()
+    loader, _ = load_counter()
+    cache.get_or_load('q', (), ('A',), loader)
+    cache.bump('C')
+    assert cache.get_or_load('q', (), ('A',), loader) == (1, True)
+
+
+def test_bump_without_tables_invalidates_everything():
+    cache = QueryCache()
+    loader, _ = load_counter()
+    cache.get_or_load('q', (), ('A',), loader)
+    cache.get_or_load('r', (), (), loader)
+    cache.bump()
+    assert cache.get_or_load('q', (), ('A',), loader)[1] is False
+    assert cache.get_or_load('r', (), (), loader)[1] is False
+
+
+def test_write_during_load_leaves_the_stored_entry_stale():
+    cache = QueryCache()
+    value, versions = cache.lookup('q', (), ('A',))
+    assert value is MISSING
+    cache.bump('A')                    # a writer commits while the result is being loaded
+    cache.store('q', (), versions, 'old')
+    assert cache.lookup('q', (), ('A',))[0] is MISSING
+
+
+def test_versions_snapshot_tracks_bumps():
+    cache = QueryCache()
+    before = cache.versions('A', 'B')
+    cache.bump('B')
+    cache.bump('B')
+    after = cache.versions('A', 'B')
+    assert after[1] == before[1] and after[2] == before[2] + 2
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = QueryCache(ttl=10, clock=clock)
+    loader, _ = load_counter()
+    cache.get_or_load('q', (), ('A',), loader)
+    clock.now = 9.9
+    assert cache.get_or_load('q', (), ('A',), loader) == (1, True)
+    clock.now = 10.0
+    assert cache.get_or_load('q', (), ('A',), loader) == (2, False)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(max_entries=2)
+    for name in ('a', 'b'):
+        cache.store(name, (), cache.lookup(name, (), ())[1], name)
+    cache.lookup('a', (), ())          # 'a' is now more recent than 'b'
+    cache.store('c', (), cache.lookup('c', (), ())[1], 'c')
+    assert cache.lookup('b', (), ())[0] is MISSING
+    assert cache.lookup('a', (), ())[0] == 'a'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_clear_keeps_versions():
+    cache = QueryCache()
+    cache.bump('A')
+    versions = cache.versions('A')
+    cache.store('q', (), versions, 1)
+    cache.clear()
+    assert cache.lookup('q', (), ('A',))[0] is MISSING
+    assert cache.versions('A') == versions
+
+
+def test_ttl_cache_expiry_and_invalidate():
+    clock = Clock()
+    cache = TTLCache(ttl=5, clock=clock)
+    cache.put('k', 1)
+    assert cache.get('k') == 1 and cache.age('k') == 0
+    clock.now = 5
+    assert cache.get('k') is None
+    assert cache.age('k') is None
+    cache.put('k', 2)
+    cache.invalidate('k')
+    assert cache.get_or_load('k', lambda: 3) == (3, False)
+    assert cache.get_or_load('k', lambda: 4) == (3, True)
@@ -0,0 +1,67 @@
+"""Statement fingerprints, parameter hashes and QueryStats aggregation."""
+
+import json
+
+import pytest
+
+from instrument import DEFAULT_OPERATION, QueryStats, fingerprint, operation, params_hash
+
+
+@pytest.mark.parametrize('sql, expected', [
+    ("SELECT * FROM t WHERE a = 1 AND b = 'x'", "SELECT * FROM t WHERE a = ? AND b = ?"),
+    ("SELECT * FROM t WHERE a = %s AND b = %(name)s", "SELECT * FROM t WHERE a = ? AND b = ?"),
+    ("SELECT 'it''s', 'a\\'b', \"q\\\"q\"", "SELECT ?, ?, ?"),
+    ("SELECT * FROM t WHERE x = -1.5e3 OR y = 0xABCDEF", "SELECT * FROM t WHERE x = ? OR y = ?"),
+    ("SELECT  *\n\tFROM t  -- trailing\n WHERE /* inline */ a = 2", "SELECT * FROM t WHERE a = ?"),
+])
+def test_literals_placeholders_comments_and_whitespace(sql, expected):
+    assert fingerprint(sql) == expected
+
+
+def test_identifiers_with_digits_are_kept():
+    sql = "SELECT t1.col2 FROM Transaction PARTITION (p202501) t1 WHERE t1.id = 3"
+    assert fingerprint(sql) == "SELECT t1.col2 FROM Transaction PARTITION (p202501) t1 WHERE t1.id = ?"
+
+
+def test_in_lists_of_any_length_share_a_fingerprint():
+    short = fingerprint("SELECT a FROM t WHERE id IN (1)")
+    assert short == "SELECT a FROM t WHERE id IN (?+)"
+    assert fingerprint("SELECT a FROM t WHERE id IN (%s, %s,%s)") == short
+    assert fingerprint("SELECT a FROM t WHERE id IN ('x', 'y')") == short
+
+
+def test_multi_row_values_collapse():
+    one = fingerprint("INSERT INTO t (a, b) VALUES (%s, %s)")
+    many = fingerprint("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s),\n (%s, %s)")
+    assert one == "INSERT INTO t (a, b) VALUES (?+)"
+    assert many == "INSERT INTO t (a, b) VALUES (?+)..."
+
+
+def test_params_hash_is_stable_and_hides_values():
+    assert params_hash(None) is None
+    digest = params_hash(('0xabc', 5))
+    assert digest == params_hash(('0xabc', 5)) != params_hash(('0xabc', 6))
+    assert len(digest) == 12 and '0xabc' not in digest
+
+
+def test_record_groups_by_fingerprint_and_operation(tmp_path):
+    stats = QueryStats(slow_ms=100, slow_log=str(tmp_path / 'slow.log'), explain=False)
+    with operation('lookup'):
+        assert not stats.record("SELECT * FROM t WHERE id = 1", (), 0.010, 1, 200)
+        assert stats.record("SELECT * FROM t WHERE id = 2", (), 0.150, 1, 300)
+    stats.record("SELECT 1", None, 0.001, -1, 10)
+    by_name = {row['operation']: row for row in stats.operation_rows()}
+    assert by_name['lookup']['statements'] == 2 and by_name['lookup']['slow'] == 1
+    assert by_name['lookup']['rows'] == 2
+    assert by_name[DEFAULT_OPERATION]['rows'] == 0      # rowcount -1 (unknown) is not counted
+
+
+def test_slow_log_records_fingerprint_not_values(tmp_path):
+    path = tmp_path / 'slow.log'
+    stats = QueryStats(slow_ms=1, slow_log=str(path), explain=False)
+    stats.log_slow("SELECT * FROM User_Profile WHERE Wallet_Address = '0xsecret'", ('0xsecret',), 0.5, 1, 64,
+                   plan=[{'type': 'const'}])
+    entry = json.loads(path.read_text().strip())
+    assert entry['fingerprint'] == "SELECT * FROM User_Profile WHERE Wallet_Address = ?"
+    assert entry['ms'] == 500.0 and entry['explain'] == [{'type': 'const'}]
+    assert '0xsecret' not in path.read_text()
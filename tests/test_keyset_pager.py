@@ -0,0 +1,131 @@
+"""KeysetPager SQL generation, and paging run against an in-memory SQLite table."""
+
+import sqlite3
+
+import pytest
+
+from main_app import KeysetPager
+
+
+KEYS = [('Join_Date', 'Join_Date', 'DESC'), ('Wallet_Address', 'Wallet_Address', 'ASC')]
+SELECT = "SELECT Wallet_Address, Join_Date FROM User_Profile"
+
+
+class SQLiteConnection:
+    """Just enough of a pymysql connection for KeysetPager._fetch."""
+
+    def __init__(self, db):
+        self.db = db
+        self.statements = []
+
+    def cursor(self):
+        return SQLiteCursor(self)
+
+    def close(self):
+        pass
+
+
+class SQLiteCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.conn.statements.append((sql, list(params)))
+        cursor = self.conn.db.execute(sql.replace('%s', '?'), params)
+        names = [column[0] for column in cursor.description]
+        self.rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def fetchall(self):
+        return self.rows
+
+
+@pytest.fixture
+def users():
+    db = sqlite3.connect(':memory:')
+    db.execute("CREATE TABLE User_Profile (Wallet_Address TEXT PRIMARY KEY, Join_Date TEXT NOT NULL)")
+    # Several wallets share a join date, so the second key decides the order within a day
+    rows = [(f"0x{i:040x}", f"2025-01-{1 + i % 4:02d}") for i in range(11)]
+    db.executemany("INSERT INTO User_Profile VALUES (?, ?)", rows)
+    expected = sorted(rows, key=lambda row: row[0])
+    expected.sort(key=lambda row: row[1], reverse=True)
+    return SQLiteConnection(db), [{'Wallet_Address': w, 'Join_Date': d} for w, d in expected]
+
+
+def make_pager(conn, page_size=3, **kwargs):
+    return KeysetPager(SELECT, keys=KEYS, page_size=page_size, connect=lambda: conn, **kwargs)
+
+
+def test_first_page_sql_has_no_seek_clause():
+    sql, params = KeysetPager(SELECT, keys=KEYS, page_size=5).page_sql()
+    assert sql == SELECT + "\nORDER BY Join_Date DESC, Wallet_Address ASC\nLIMIT 5"
+    assert params == []
+
+
+def test_seek_clause_expands_the_row_comparison_per_key_direction():
+    pager = KeysetPager(SELECT, keys=KEYS, page_size=5, where="Join_Date >= %s", params=['2025-01-01'])
+    sql, params = pager.page_sql(key=('2025-01-03', '0xab'))
+    assert "WHERE (Join_Date >= %s) AND ((Join_Date < %s) OR (Join_Date = %s AND Wallet_Address > %s))" in sql
+    # Filter params first, then the seek values key by key
+    assert params == ['2025-01-01', '2025-01-03', '2025-01-03', '0xab']
+
+
+def test_backward_page_flips_comparisons_and_order():
+    sql, _ = KeysetPager(SELECT, keys=KEYS).page_sql(key=('2025-01-03', '0xab'), backward=True)
+    assert "((Join_Date > %s) OR (Join_Date = %s AND Wallet_Address < %s))" in sql
+    assert "ORDER BY Join_Date ASC, Wallet_Address DESC" in sql
+
+
+def test_forward_pages_cover_every_row_once_in_order(users):
+    conn, expected = users
+    pages = list(make_pager(conn))
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+    assert [row for page in pages for row in page] == expected
+
+
+def test_next_page_past_the_end_keeps_the_current_page(users):
+    conn, expected = users
+    pager = make_pager(conn, page_size=6)
+    pager.first_page()
+    assert pager.next_page() == expected[6:]
+    assert pager.next_page() == []
+    assert pager.page_num == 2
+    assert pager.prev_page() == expected[:6]
+
+
+def test_prev_page_returns_the_same_rows_in_forward_order(users):
+    conn, expected = users
+    pager = make_pager(conn)
+    seen = [pager.first_page(), pager.next_page(), pager.next_page()]
+    assert pager.prev_page() == seen[1]
+    assert pager.page_num == 2
+    assert pager.prev_page() == seen[0] == expected[:3]
+    assert pager.prev_page() == []
+    assert pager.page_num == 1
+
+
+def test_pages_from_leaves_the_pager_in_place(users):
+    conn, expected = users
+    pager = make_pager(conn, page_size=4)
+    first = pager.first_page()
+    ahead = pager.pages_from(pager.last_key)
+    following = next(ahead)
+    assert following == expected[4:8]
+    assert pager.page_num == 1 and pager.last_key == (first[-1]['Join_Date'], first[-1]['Wallet_Address'])
+    pager.advance(following)
+    assert pager.page_num == 2
+    assert pager.next_page() == expected[8:]
+
+
+def test_empty_table_yields_no_pages(users):
+    conn, _ = users
+    conn.db.execute("DELETE FROM User_Profile")
+    pager = make_pager(conn)
+    assert list(pager) == []
+    assert pager.page_num == 0
@@ -0,0 +1,144 @@
+"""IntervalIndex against brute force, and EventSchedule conflict detection and reloads."""
+
+import random
+
+import pytest
+
+from cache import QueryCache
+from scheduling import EventSchedule, IntervalIndex, ScheduledEvent
+
+
+def brute_overlapping(intervals, start, end):
+    return sorted(key for s, e, key in intervals if s < end and e > start)
+
+
+def test_half_open_bounds():
+    index = IntervalIndex()
+    index.add(10, 20, 'a')
+    assert not index.any_overlap(20, 30) and index.overlapping(20, 30) == []
+    assert not index.any_overlap(0, 10) and index.overlapping(0, 10) == []
+    assert index.any_overlap(19, 21) and index.overlapping(19, 21) == ['a']
+    assert index.overlapping(12, 13) == ['a']       # fully inside
+    assert index.overlapping(0, 100) == ['a']       # fully covering
+
+
+def test_empty_index():
+    index = IntervalIndex()
+    assert len(index) == 0
+    assert not index.any_overlap(0, 10)
+    assert index.overlapping(0, 10) == []
+
+
+def test_long_interval_far_back_is_still_found():
+    # The running maximum must carry a long early interval past short later ones
+    index = IntervalIndex()
+    index.add(0, 1000, 'long')
+    for i in range(1, 50):
+        index.add(i * 10, i * 10 + 1, f"short{i}")
+    assert sorted(index.overlapping(995, 999)) == ['long']
+    index.remove(0, 1000, 'long')
+    assert not index.any_overlap(995, 999)
+
+
+def test_random_operations_match_brute_force():
+    rng = random.Random(11)
+    index = IntervalIndex()
+    live = []
+    for step in range(2000):
+        if live and rng.random() < 0.3:
+            interval = live.pop(rng.randrange(len(live)))
+            index.remove(*interval)
+        else:
+            start = rng.randrange(0, 500)
+            interval = (start, start + rng.randrange(1, 60), step)
+            live.append(interval)
+            index.add(*interval)
+        start = rng.randrange(-10, 510)
+        end = start + rng.randrange(1, 40)
+        expected = brute_overlapping(live, start, end)
+        assert sorted(index.overlapping(start, end)) == expected
+        assert index.any_overlap(start, end) == bool(expected)
+    assert len(index) == len(live)
+
+
+def test_removing_an_absent_interval_is_a_no_op():
+    index = IntervalIndex()
+    index.add(0, 10, 'a')
+    index.remove(0, 11, 'a')
+    index.remove(5, 6, 'b')
+    assert index.overlapping(0, 10) == ['a']
+
+
+def make_schedule(events, versions):
+    return EventSchedule(loader=lambda conn: [ScheduledEvent(*event) for event in events], versions=versions)
+
+
+EVENTS = [
+    # id, start, end, parcel, organizer, district
+    (1, 10, 20, 'P1', 'alice', 'Plaza'),
+    (2, 30, 40, 'P1', 'bob', 'Plaza'),
+    (3, 10, 20, 'P2', 'bob', 'Plaza'),
+    (4, 50, 60, 'P3', 'carol', 'Vegas'),
+]
+
+
+@pytest.fixture
+def cache():
+    return QueryCache()
+
+
+@pytest.fixture
+def schedule(cache):
+    return make_schedule(EVENTS, lambda: cache.versions('Event', 'LAND_Parcel'))
+
+
+def conflict_pairs(rows):
+    return [(row['Event_ID'], row['Scope'], row['Conflicts_With']) for row in rows]
+
+
+def test_conflicts_on_parcel_and_organizer(schedule):
+    with schedule.locked(None) as events:
+        # Event 3 moved onto 30-40 clashes with 2 on bob; event 1 onto 35-45 with 2 on P1
+        assert conflict_pairs(events.conflicts({3: (30, 40)})) == [(3, 'organizer', 2)]
+        assert conflict_pairs(events.conflicts({1: (35, 45)})) == [(1, 'parcel', 2)]
+        assert events.conflicts({4: (10, 20)}) == []
+
+
+def test_moving_events_ignore_their_old_slots_and_check_each_other(schedule):
+    with schedule.locked(None) as events:
+        # Swapping 1 and 2 on P1 does not clash on the parcel; 2 still meets bob's event 3
+        assert conflict_pairs(events.conflicts({1: (30, 40), 2: (10, 20)})) == [(2, 'organizer', 3)]
+        # Both moved onto the same window clash with each other
+        assert conflict_pairs(events.conflicts({1: (70, 80), 2: (75, 85)})) == [(2, 'parcel', 1)]
+
+
+def test_district_slots_only_lists_later_events(schedule):
+    with schedule.locked(None) as events:
+        assert events.district_slots('Plaza', after=15) == {2: (30, 40)}
+        assert events.district_slots('Nowhere', after=0) == {}
+
+
+def test_applied_moves_count_against_their_own_version_bump(schedule, cache):
+    with schedule.locked(None) as events:
+        events.apply({4: (100, 110)})
+    cache.bump('Event')
+    with schedule.locked(None) as events:
+        assert schedule.loads == 1
+        assert events.district_slots('Vegas', after=0) == {4: (100, 110)}
+
+
+def test_unaccounted_writes_reload(schedule, cache):
+    with schedule.locked(None):
+        pass
+    cache.bump('Event')
+    with schedule.locked(None):
+        pass
+    assert schedule.loads == 2
+    cache.bump('LAND_Parcel')
+    with schedule.locked(None):
+        pass
+    assert schedule.loads == 3
+    schedule.invalidate()
+    with schedule.locked(None):
+        pass
+    assert schedule.loads == 4
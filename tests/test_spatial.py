@@ -0,0 +1,163 @@
+"""ParcelGrid lookups checked against brute force, and SpatialIndex staleness accounting."""
+
+import random
+
+import pytest
+
+from main_app import QUERY_CACHE
+from spatial import Parcel, ParcelGrid, SpatialIndex, _ring
+
+
+def distance_key(parcel, x, y):
+    return ((parcel.x - x) ** 2 + (parcel.y - y) ** 2, parcel.y, parcel.x)
+
+
+@pytest.fixture(scope='module')
+def scattered():
+    # Sparse parcels over a Genesis City-sized map, negative coordinates included
+    rng = random.Random(3)
+    cells = rng.sample([(x, y) for x in range(-150, 151, 3) for y in range(-150, 151, 3)], 600)
+    parcels = [Parcel(f"LAND-{i}", x, y, owner=f"0x{i % 7}") for i, (x, y) in enumerate(cells)]
+    return parcels, ParcelGrid(parcels, tile=16)
+
+
+def test_ring_walks_each_tile_at_that_distance_once():
+    assert list(_ring(0, 0, 0)) == [(0, 0)]
+    tiles = list(_ring(2, -1, 2))
+    assert len(tiles) == len(set(tiles)) == 16
+    assert all(max(abs(tx - 2), abs(ty + 1)) == 2 for tx, ty in tiles)
+
+
+@pytest.mark.parametrize('x, y, k', [
+    (0, 0, 1), (0, 0, 10), (-149, 150, 5), (7, -33, 25),
+    (400, 400, 3),                      # far outside the grid: rings run to the far edge
+    (-1000, 0, 600),                    # every parcel
+])
+def test_nearest_matches_brute_force(scattered, x, y, k):
+    parcels, grid = scattered
+    expected = sorted(parcels, key=lambda parcel: distance_key(parcel, x, y))[:k]
+    assert grid.nearest(x, y, k) == expected
+
+
+def test_nearest_with_more_k_than_parcels_returns_all():
+    grid = ParcelGrid([Parcel('a', 0, 0), Parcel('b', 40, 40)], tile=4)
+    assert [parcel.asset_id for parcel in grid.nearest(100, 100, 10)] == ['b', 'a']
+
+
+def test_nearest_for_one_owner(scattered):
+    parcels, grid = scattered
+    owned = [parcel for parcel in parcels if parcel.owner == '0x3']
+    assert grid.nearest(10, 10, 4, owner='0x3') == sorted(owned, key=lambda p: distance_key(p, 10, 10))[:4]
+    assert grid.nearest(10, 10, 4, owner='nobody') == []
+
+
+def test_nearest_edge_cases():
+    assert ParcelGrid().nearest(0, 0, 3) == []
+    assert ParcelGrid([Parcel('a', 0, 0)]).nearest(0, 0, 0) == []
+
+
+def test_within_and_in_box_match_brute_force(scattered):
+    parcels, grid = scattered
+    expected = sorted((p for p in parcels if (p.x - 5) ** 2 + (p.y + 20) ** 2 <= 30.5 ** 2),
+                      key=lambda p: distance_key(p, 5, -20))
+    assert grid.within(5, -20, 30.5) == expected
+    box = sorted((p for p in parcels if -40 <= p.x <= 17 and -3 <= p.y <= 60), key=lambda p: (p.y, p.x))
+    assert grid.in_box(17, 60, -40, -3) == box
+
+
+def estate_grid():
+    # A: an L of four plus a separate pair; the diagonal neighbour of the L is its own group
+    layout = {
+        (0, 0): 'A', (1, 0): 'A', (2, 0): 'A', (2, 1): 'A',
+        (3, 2): 'A',
+        (5, 5): 'A', (5, 6): 'A',
+        (1, 1): 'B', (0, 1): 'B',
+        (9, 9): None, (9, 10): None,
+    }
+    return ParcelGrid([Parcel(f"{x},{y}", x, y, owner=owner) for (x, y), owner in layout.items()], tile=4)
+
+
+def test_estates_use_edge_adjacency_only():
+    groups = estate_grid().estates()
+    summary = [(members[0].owner, sorted(p.asset_id for p in members)) for members in groups]
+    assert summary == [
+        ('A', ['0,0', '1,0', '2,0', '2,1']),
+        ('A', ['5,5', '5,6']),
+        ('B', ['0,1', '1,1']),
+    ]
+
+
+def test_estates_filters():
+    grid = estate_grid()
+    assert [len(members) for members in grid.estates(owner='A', min_size=1)] == [4, 2, 1]
+    assert grid.estates(owner='A', min_size=5) == []
+    assert grid.estates(owner=None, min_size=3)[0][0].owner == 'A'
+
+
+def test_estate_follows_owner_changes():
+    grid = estate_grid()
+    assert grid.set_owner('2,1', 'B')
+    assert not grid.set_owner('missing', 'B')
+    assert sorted(p.asset_id for p in grid.estate_at(1, 1)) == ['0,1', '1,1', '2,1']
+    assert len(grid.estate_at(0, 0)) == 3
+    assert grid.estate_at(50, 50) == []
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def index():
+    clock = Clock()
+    index = SpatialIndex(max_age=60, clock=clock)
+    index._load = lambda conn: estate_grid()
+    index.clock = clock
+    return index
+
+
+def use(index):
+    with index.locked() as grid:
+        return grid
+
+
+def test_index_reloads_only_when_needed(index):
+    first = use(index)
+    assert use(index) is first and index.loads == 1
+    index.clock.now = 60
+    assert use(index) is not first and index.loads == 2
+
+
+def test_sales_applied_in_place_account_for_their_version_bump(index):
+    grid = use(index)
+    QUERY_CACHE.bump('Digital_Asset')   # what notify_tables_written does for a sale
+    index.owner_changed('0,0', 'C')
+    assert use(index) is grid and grid.at(0, 0).owner == 'C'
+    assert index.updates == 1 and index.loads == 1
+
+
+def test_unaccounted_writes_force_a_reload(index):
+    grid = use(index)
+    QUERY_CACHE.bump('Digital_Asset')   # a bulk import: bumped, but no owner_changed()
+    assert use(index) is not grid
+    grid = use(index)
+    QUERY_CACHE.bump('Digital_Asset')
+    QUERY_CACHE.bump('Digital_Asset')
+    index.owner_changed('0,0', 'C')     # one sale accounted for, one bump left over
+    assert use(index) is not grid
+
+
+def test_parcel_table_writes_force_a_reload(index):
+    grid = use(index)
+    QUERY_CACHE.bump('LAND_Parcel')
+    assert use(index) is not grid
+
+
+def test_sale_before_first_load_is_ignored(index):
+    index.owner_changed('0,0', 'C')
+    assert use(index).at(0, 0).owner == 'A'
+    assert index.updates == 0